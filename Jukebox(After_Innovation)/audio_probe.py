@@ -0,0 +1,145 @@
+import os  # Import OS module for file sizes and modification times
+import struct  # Import struct to decode the binary headers
+from typing import Optional, Tuple  # Import necessary types for type hinting
+
+class AudioInfo:
+    """Duration and format of an audio file, stamped with the file version it was read from"""
+    __slots__ = ('duration', 'sample_rate', 'bitrate', 'channels', 'file_size', 'mtime_ns')
+
+    def __init__(self, duration: float, sample_rate: int = 0, bitrate: int = 0, channels: int = 0,
+                 file_size: int = 0, mtime_ns: int = 0):
+        self.duration = duration  # Seconds
+        self.sample_rate = sample_rate  # Hz, 0 if unknown
+        self.bitrate = bitrate  # Average kbit/s, 0 if unknown
+        self.channels = channels  # 0 if unknown
+        self.file_size = file_size  # Bytes
+        self.mtime_ns = mtime_ns  # Modification time of the file that was probed
+
+    def matches(self, stat: os.stat_result) -> bool:
+        """Check whether this info still describes a file with the given stat"""
+        return self.file_size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+    def __repr__(self) -> str:
+        return (f"AudioInfo(duration={self.duration:.2f}, sample_rate={self.sample_rate}, "
+                f"bitrate={self.bitrate}, channels={self.channels}, file_size={self.file_size})")
+
+_HEAD_BYTES = 64 * 1024  # How far into the audio data to look for the first MP3 frame
+
+# Kbit/s for bitrate indexes 1-14, by (MPEG-1?, layer)
+_MP3_BITRATES = {
+    (True, 1): (32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}  # By version bits
+
+def probe_audio(path: str) -> Optional[AudioInfo]:
+    """
+    Read the duration and format of an MP3 or WAV file from its headers
+
+    Only the first few KB are read, instead of decoding the whole file the way
+    pygame.mixer.Sound does. Returns None for files that cannot be parsed.
+    """
+    try:
+        stat = os.stat(path)
+        with open(path, 'rb') as file:
+            head = file.read(12)
+            if head[:4] == b'RIFF' and head[8:12] == b'WAVE':
+                info = _probe_wav(file)
+            else:
+                info = _probe_mp3(file, head, stat.st_size)
+        if info is not None:
+            info.file_size, info.mtime_ns = stat.st_size, stat.st_mtime_ns
+        return info
+    except Exception as e:
+        print(f"Error probing audio file {path}: {e}")
+        return None
+
+def _probe_wav(file) -> Optional[AudioInfo]:
+    """Walk the RIFF chunks after the 12 byte WAVE header for the format and the data size"""
+    channels = sample_rate = byte_rate = 0
+    while True:
+        chunk = file.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, size = struct.unpack('<4sI', chunk)
+        if chunk_id == b'fmt ':
+            _, channels, sample_rate, byte_rate = struct.unpack('<HHII', file.read(12))
+            file.seek(size - 12 + (size & 1), os.SEEK_CUR)
+        elif chunk_id == b'data':
+            if not byte_rate:
+                return None  # Data before format: not a WAV we can time
+            return AudioInfo(size / byte_rate, sample_rate, byte_rate * 8 // 1000, channels)
+        else:
+            file.seek(size + (size & 1), os.SEEK_CUR)  # Chunks are padded to an even size
+
+def _parse_mp3_header(data: bytes, offset: int) -> Optional[Tuple[int, int, int, int, int, bool]]:
+    """(bitrate kbit/s, sample rate, channels, frame length, samples per frame, MPEG-1?) of the frame at offset"""
+    if offset + 4 > len(data):
+        return None
+    (header,) = struct.unpack_from('>I', data, offset)
+    if header >> 21 != 0x7FF:
+        return None  # No frame sync
+    version, layer_bits = (header >> 19) & 3, (header >> 17) & 3
+    bitrate_index, rate_index = (header >> 12) & 15, (header >> 10) & 3
+    if version == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None  # Reserved or free format values
+    mpeg1, layer = version == 3, 4 - layer_bits
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index - 1]
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (header >> 9) & 1
+    channels = 1 if (header >> 6) & 3 == 3 else 2
+    if layer == 1:
+        samples, length = 384, (12 * bitrate * 1000 // sample_rate + padding) * 4
+    elif layer == 3 and not mpeg1:
+        samples, length = 576, 72 * bitrate * 1000 // sample_rate + padding
+    else:
+        samples, length = 1152, 144 * bitrate * 1000 // sample_rate + padding
+    return bitrate, sample_rate, channels, length, samples, mpeg1
+
+def _probe_mp3(file, head: bytes, file_size: int) -> Optional[AudioInfo]:
+    """Find the first MPEG audio frame and time the file from a Xing/VBRI header or the bitrate"""
+    audio_start = 0
+    if head[:3] == b'ID3':  # Skip an ID3v2 tag; its size is stored 7 bits per byte
+        flags, size_bytes = head[5], head[6:10]
+        audio_start = 10 + ((size_bytes[0] << 21) | (size_bytes[1] << 14) | (size_bytes[2] << 7) | size_bytes[3])
+        if flags & 0x10:
+            audio_start += 10  # Footer
+    file.seek(audio_start)
+    data = file.read(_HEAD_BYTES)
+
+    offset = data.find(b'\xff')
+    while offset != -1:
+        frame = _parse_mp3_header(data, offset)
+        # A second frame right after the first rules out stray sync bytes
+        if frame and (offset + frame[3] + 4 > len(data) or _parse_mp3_header(data, offset + frame[3])):
+            break
+        offset = data.find(b'\xff', offset + 1)
+    else:
+        return None
+
+    bitrate, sample_rate, channels, _, samples, mpeg1 = frame
+    audio_bytes = file_size - audio_start - offset
+    file.seek(-128, os.SEEK_END)
+    if file.read(3) == b'TAG':
+        audio_bytes -= 128  # ID3v1 tag at the end
+
+    frames = None
+    side_info = (17 if channels == 1 else 32) if mpeg1 else (9 if channels == 1 else 17)
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b'Xing', b'Info') and len(data) >= xing + 12:
+        (flags,) = struct.unpack_from('>I', data, xing + 4)
+        if flags & 1:
+            (frames,) = struct.unpack_from('>I', data, xing + 8)
+    elif data[offset + 36:offset + 40] == b'VBRI' and len(data) >= offset + 54:
+        (frames,) = struct.unpack_from('>I', data, offset + 50)
+
+    if frames:
+        duration = frames * samples / sample_rate  # Exact, also for variable bitrate files
+        bitrate = round(audio_bytes * 8 / duration / 1000) if duration else bitrate
+    else:
+        duration = audio_bytes * 8 / (bitrate * 1000)  # Constant bitrate estimate
+    return AudioInfo(duration, sample_rate, bitrate, channels)
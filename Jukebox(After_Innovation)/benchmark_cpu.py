@@ -0,0 +1,112 @@
+"""Measure the CPU time the player spends watching playback: 100 ms polling threads vs. deadlines.
+
+Usage: python benchmark_cpu.py [seconds]   (default: 10 per scenario)
+Set SDL_AUDIODRIVER=dummy to run without a sound card.
+"""
+import os  # Import os for temporary file paths
+import sys  # Import sys for command line arguments
+import tempfile  # Import tempfile for the generated test tone
+import threading  # Import threading to run the old polling loops
+import time  # Import time for CPU and wall clock readings
+import wave  # Import wave to write the test track
+import pygame  # Import pygame for the mixer being watched
+from library_item import MusicPlayer  # Import the player whose deadlines are measured
+from playback_scheduler import DeadlineScheduler  # Import the scheduler that drives the UI ticks
+
+POLL_INTERVAL = 0.1  # How often each old loop checked the mixer
+UI_TICK = 1.0  # Seconds between progress bar ticks with the deadline scheduler
+
+def write_track(path: str, seconds: float) -> None:
+    """Write a mono WAV file"""
+    with wave.open(path, 'wb') as track:
+        track.setnchannels(1)
+        track.setsampwidth(2)
+        track.setframerate(22050)
+        track.writeframes(b'\x00\x01' * int(22050 * seconds))
+
+def cpu_during(seconds: float) -> float:
+    """CPU seconds this process used while waiting for seconds of wall time"""
+    start = time.process_time()
+    time.sleep(seconds)
+    return time.process_time() - start
+
+def polling_loops(stop: threading.Event, playing: bool) -> list:
+    """The old playlist worker, play count monitor and progress bar loops, each waking every 100 ms"""
+    wakeups = [0]
+    def worker():  # playlist_worker: get_busy() and get_pos() every poll
+        while not stop.is_set():
+            if playing:
+                pygame.mixer.music.get_busy()
+                pygame.mixer.music.get_pos()
+            wakeups[0] += 1
+            time.sleep(POLL_INTERVAL)
+    def monitor():  # _monitor_play_duration: elapsed time bookkeeping every poll
+        played, last = 0.0, time.time()
+        while not stop.is_set():
+            now = time.time()
+            played, last = played + now - last, now
+            pygame.mixer.music.get_busy()
+            wakeups[0] += 1
+            time.sleep(POLL_INTERVAL)
+    def progress():  # _start_progress_update: ran every 100 ms even when idle
+        while not stop.is_set():
+            if pygame.mixer.music.get_busy():
+                pygame.mixer.music.get_pos()
+            wakeups[0] += 1
+            time.sleep(POLL_INTERVAL)
+    loops = [progress] + ([worker, monitor] if playing else [])
+    for loop in loops:
+        threading.Thread(target=loop, daemon=True).start()
+    return wakeups
+
+def main(seconds: float) -> None:
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'long.wav')
+    write_track(path, seconds * 4 + 5)
+    player = MusicPlayer()
+    player.load_track = lambda track_id: path
+    player._track_duration = lambda track_id, track_path: seconds * 4 + 5
+    player._count_play = lambda: None  # Leave the real library's play counts alone
+
+    results = []
+    # Idle: no music
+    results.append(("idle, nothing", cpu_during(seconds), 0))
+    stop = threading.Event()
+    wakeups = polling_loops(stop, playing=False)
+    results.append(("idle, polling", cpu_during(seconds), wakeups[0]))
+    stop.set()
+    time.sleep(POLL_INTERVAL * 2)
+
+    # Playing: the mixer alone, then each way of watching it
+    pygame.mixer.music.load(path)
+    pygame.mixer.music.play()
+    results.append(("playing, mixer only", cpu_during(seconds), 0))
+    stop = threading.Event()
+    wakeups = polling_loops(stop, playing=True)
+    results.append(("playing, polling", cpu_during(seconds), wakeups[0]))
+    stop.set()
+    time.sleep(POLL_INTERVAL * 2)
+    pygame.mixer.music.stop()
+
+    player.play_playlist([("01", "Long track")])
+    player.wait_idle()
+    time.sleep(1.0)  # Past loading and queueing, which are not part of watching playback
+    ui = DeadlineScheduler("ui-ticks")
+    ticks = [0]
+    def tick():
+        pygame.mixer.music.get_pos()
+        ticks[0] += 1
+        ui.call_later(UI_TICK, tick)
+    ui.call_later(UI_TICK, tick)
+    before = player._scheduler.wakeups
+    cpu = cpu_during(seconds)
+    results.append(("playing, deadlines", cpu, player._scheduler.wakeups - before + ticks[0]))
+    ui.close()
+    player.stop()
+    player.wait_idle()
+
+    for label, cpu, woke in results:
+        print(f"{label:>20}: {cpu / seconds * 1000:6.2f} ms CPU per second, {woke / seconds:5.1f} wakeups per second")
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 10)
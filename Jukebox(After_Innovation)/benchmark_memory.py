@@ -0,0 +1,62 @@
+"""Compare the memory used by the dict-of-Track library layout and the compact columnar store.
+
+Usage: python benchmark_memory.py [track_count ...]   (default: 100000 1000000)
+"""
+import gc  # Import gc to collect garbage between measurements
+import sys  # Import sys for command line arguments
+import tracemalloc  # Import tracemalloc to measure allocated memory
+from library_item import Track  # Import the Track class used by the default layout
+from track_store import CompactTrackStore  # Import the compact columnar store
+
+ARTIST_COUNT = 5000  # A venue catalog has far fewer artists than tracks
+
+def _rows(count: int):
+    """Yield rows the way the CSV reader produces them: fresh strings for every field"""
+    for index in range(1, count + 1):
+        yield (
+            str(index).zfill(2),
+            f"Track title number {index}",
+            f"Artist {index % ARTIST_COUNT}",
+            index % 6,
+            index % 1000
+        )
+
+def build_dict_library(count: int) -> dict:
+    """Build the current layout: one Track object per zero-padded string key"""
+    library = {}
+    for track_id, name, artist, rating, play_count in _rows(count):
+        track = Track(name, artist, rating)
+        track.set_play_count(play_count)
+        library[track_id] = track
+    return library
+
+def build_compact_library(count: int) -> CompactTrackStore:
+    """Build the compact layout: int ids, array columns and interned strings"""
+    library = CompactTrackStore()
+    for track_id, name, artist, rating, play_count in _rows(count):
+        track = Track(name, artist, rating)
+        track.set_play_count(play_count)
+        library[track_id] = track  # The store copies the values; the Track is discarded
+    return library
+
+def measure(builder, count: int) -> int:
+    """Return the bytes still allocated after building a library with the given builder"""
+    gc.collect()
+    tracemalloc.start()
+    library = builder(count)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del library
+    return current
+
+def main(counts) -> None:
+    print(f"{'tracks':>10} {'dict layout':>14} {'compact store':>14} {'saving':>8}")
+    for count in counts:
+        dict_bytes = measure(build_dict_library, count)
+        compact_bytes = measure(build_compact_library, count)
+        saving = 1 - compact_bytes / dict_bytes
+        print(f"{count:>10} {dict_bytes / 2**20:>11.1f} MB {compact_bytes / 2**20:>11.1f} MB {saving:>7.0%}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100000, 1000000])
@@ -0,0 +1,71 @@
+"""Measure the silence between two tracks: loading after the first ends vs. queueing it ahead of time.
+
+Usage: python benchmark_playback.py [transitions]   (default: 5)
+Set SDL_AUDIODRIVER=dummy to run without a sound card.
+"""
+import os  # Import os for temporary file paths
+import sys  # Import sys for command line arguments
+import tempfile  # Import tempfile for the generated test tones
+import time  # Import time to timestamp the transitions
+import wave  # Import wave to write short test tracks
+import pygame  # Import pygame for the mixer being measured
+
+TRACK_SECONDS = 1.0  # Length of the shortest generated track
+POLL_INTERVAL = 0.1  # How often the old player loop checked get_busy()
+
+def write_track(path: str, seconds: float) -> None:
+    """Write a short mono WAV file"""
+    with wave.open(path, 'wb') as track:
+        track.setnchannels(1)
+        track.setsampwidth(2)
+        track.setframerate(22050)
+        track.writeframes(b'\x00\x01' * int(22050 * seconds))
+
+def gap_after_end(first: str, second: str, length: float) -> float:
+    """Old loop: poll get_busy() every 100 ms, then load and play the next file"""
+    pygame.mixer.music.load(first)
+    pygame.mixer.music.play()
+    started = time.time()
+    while pygame.mixer.music.get_busy():
+        time.sleep(POLL_INTERVAL)
+    pygame.mixer.music.load(second)
+    pygame.mixer.music.play()
+    gap = time.time() - (started + length)
+    pygame.mixer.music.stop()
+    return gap
+
+def gap_when_queued(first: str, second: str, length: float) -> float:
+    """New loop: queue the next file while the first plays and note when the mixer switches"""
+    pygame.mixer.music.load(first)
+    pygame.mixer.music.play()
+    started = time.time()
+    pygame.mixer.music.queue(second)
+    last_pos = 0
+    while True:
+        pos = pygame.mixer.music.get_pos()
+        if pos < last_pos:  # Position restarted: the queued track is playing
+            break
+        last_pos = pos
+        time.sleep(0.01)
+    gap = (time.time() - pos / 1000.0) - (started + length)
+    pygame.mixer.music.stop()
+    return gap
+
+def main(transitions: int) -> None:
+    pygame.mixer.init()
+    folder = tempfile.mkdtemp()
+    second = os.path.join(folder, 'second.wav')
+    write_track(second, TRACK_SECONDS)
+    # Spread the first track's length over one poll interval, as real track lengths would be
+    firsts = []
+    for index in range(transitions):
+        length = TRACK_SECONDS + POLL_INTERVAL * index / transitions
+        path = os.path.join(folder, f'first_{index}.wav')
+        write_track(path, length)
+        firsts.append((path, length))
+    for label, measure in (("load after end", gap_after_end), ("queued ahead", gap_when_queued)):
+        gaps = [max(measure(first, second, length), 0.0) for first, length in firsts]
+        print(f"{label:>15}: average gap {sum(gaps) / len(gaps) * 1000:6.1f} ms, worst {max(gaps) * 1000:6.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,59 @@
+"""Compare search latency of the old linear scan with the token index behind MusicLibrary.search_tracks.
+
+Usage: python benchmark_search.py [track_count ...]   (default: 10000 100000 1000000)
+"""
+import random  # Import random to generate a synthetic catalog
+import sys  # Import sys for command line arguments
+import time  # Import time for measuring latency
+from library_item import Track  # Import the Track class the library stores
+from library_index import TokenIndex  # Import the token index used by search_tracks
+
+WORDS = ("love night heart dance fire rain summer dream light river song blue city gold wild "
+         "home road sky star moon young time world girl boy baby kiss tears shadow ocean "
+         "qua tang khung hinh em anh yeu mua dem nho").split()
+QUERIES = ["love", "night dance", "ocean", "ive", "artist 42", "no such song"]
+REPEAT = 5
+
+def build_tracks(count: int) -> dict:
+    """Build a synthetic library of count tracks"""
+    rng = random.Random(42)
+    tracks = {}
+    for index in range(1, count + 1):
+        name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4))).title() + f" {index}"
+        tracks[str(index).zfill(2)] = Track(name, f"Artist {rng.randint(1, count // 20 + 1)}")
+    return tracks
+
+def linear_search(tracks: dict, query: str) -> set:
+    """The previous search_tracks("Both") behaviour: lowercase and scan every track"""
+    query = query.lower()
+    return {key for key, track in tracks.items()
+            if query in track.name.lower() or query in track.artist.lower()}
+
+def timed(function) -> float:
+    """Best time in milliseconds over REPEAT runs"""
+    best = float('inf')
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def main(counts) -> None:
+    for count in counts:
+        tracks = build_tracks(count)
+        name_index, artist_index = TokenIndex('name'), TokenIndex('artist')
+        started = time.perf_counter()
+        name_index.ensure(tracks)
+        artist_index.ensure(tracks)
+        print(f"\n{count} tracks (index built in {(time.perf_counter() - started) * 1000:.0f} ms)")
+        print(f"{'query':>14} {'matches':>8} {'scan ms':>9} {'index ms':>9}")
+        for query in QUERIES:
+            expected = linear_search(tracks, query)
+            found = name_index.search(query) | artist_index.search(query)
+            assert found == expected, query
+            scan = timed(lambda: linear_search(tracks, query))
+            indexed = timed(lambda: name_index.search(query) | artist_index.search(query))
+            print(f"{query!r:>14} {len(found):>8} {scan:>9.2f} {indexed:>9.2f}")
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000])
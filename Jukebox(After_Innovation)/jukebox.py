@@ -16,8 +16,10 @@ from tkinter import messagebox  # Import messagebox for displaying message boxes
 from PIL import Image, ImageTk  # Import Image and ImageTk for image processing
 from datetime import timedelta  # Import timedelta for handling time durations
 from abc import ABC, abstractmethod  # Import ABC for creating abstract base classes
-from typing import List, Tuple, Optional, Dict  # Import typing constructs for type hinting
-from track_library import library, LibraryObserver  # Import library and observer classes for track management
+from itertools import islice  # Import islice to read one page of a streamed listing
+from typing import List, Tuple, Optional, Dict, Set, Callable, Iterator  # Import typing constructs for type hinting
+from library_query import compile_query, QuerySyntaxError  # Import the error raised for malformed library queries
+from track_library import library, LibraryObserver, LibraryChangeEvent  # Import library and observer classes for track management
 from library_item import MusicPlayer, PlayerObserver, SequentialPlaybackStrategy, RandomPlaybackStrategy  # Import music player and playback strategies
 import os
 import asyncio
@@ -158,6 +160,15 @@ class YouTubeAPI:  # Define YouTubeAPI class for interacting with YouTube API
 
     async def download_track(self, track_info: Dict):
         try:
+            # Check for the song before spending bandwidth and ffmpeg time on it
+            duplicates = library.find_duplicates(track_info['name'], track_info['artist'])
+            if duplicates and not messagebox.askyesno(
+                "Possible Duplicate",
+                f"'{track_info['name']}' looks like track {duplicates[0]} "
+                f"({library.get_name(duplicates[0])}). Download it anyway?"
+            ):
+                return
+
             # Get the current directory
             current_dir = os.path.dirname(os.path.abspath(__file__))
             
@@ -216,28 +227,18 @@ class YouTubeAPI:  # Define YouTubeAPI class for interacting with YouTube API
                     await asyncio.sleep(1)
                     
                     if info and os.path.exists(audio_path):
-                        # Store observers and clear temporarily
-                        observers = library._observers.copy()
-                        library._observers.clear()
-                        
-                        # Add track to library with normalized fields
-                        success = library.add_track(
-                            track_id=next_id,
-                            name=track_info['name'].strip(),
-                            artist=track_info['artist'].strip(),
-                            rating=0,
-                            play_count=0
-                        )
+                        # Add and save the track in one step; observers get a single added event
+                        result = library.add_tracks([{
+                            'track_id': next_id,
+                            'name': track_info['name'],
+                            'artist': track_info['artist'],
+                        }])
                         
-                        # Restore observers
-                        library._observers = observers
-                        
-                        if success:
+                        if result:
                             messagebox.showinfo(
                                 "Success",
                                 f"Track '{track_info['name']}' downloaded successfully!"
                             )
-                            library.notify_observers()
                         else:
                             for file_path in [audio_path, image_path]:
                                 if os.path.exists(file_path):
@@ -362,6 +363,9 @@ class SearchResultsFrame(ctk.CTkFrame):  # Define SearchResultsFrame class for d
                     f"By: {track['artist']}\n"  # Artist name
                     f"Duration: {track['duration']} • Views: {self._format_views(track['views'])}"  # Duration and views
                 ).encode('utf-8').decode('utf-8')  # Ensure proper encoding
+                duplicates = library.find_duplicates(track['name'], track['artist'])  # Flag songs already in the library
+                if duplicates:
+                    info_text += f"\nAlready in library as track {duplicates[0]}"
                 
                 info_label = ctk.CTkLabel(  # Create label for track info
                     result_frame,
@@ -374,7 +378,7 @@ class SearchResultsFrame(ctk.CTkFrame):  # Define SearchResultsFrame class for d
                 
                 download_btn = ctk.CTkButton(  # Create download button
                     result_frame,
-                    text="⬇ Download",  # Set button text
+                    text="⬇ Download Again" if duplicates else "⬇ Download",  # Set button text
                     command=lambda t=track: self.handle_download(t),  # Set command to handle download
                     width=100  # Set button width
                 )
@@ -745,6 +749,29 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
         self.player.add_observer(self)  # Add observer to player
         self.playlist: List[Tuple[str, str]] = []  # Initialize playlist
         self.current_playlist_name: Optional[str] = None  # Initialize current playlist name
+
+        # Row model of the track list, so library changes can patch single lines
+        self._row_ids: List[str] = []  # Track id shown on each line of list_txt
+        self._row_lookup: Dict[str, int] = {}  # Track id -> line index in list_txt
+        self._row_formatter: Optional[Callable[[str], str]] = None  # Builds the text of one line
+        self._row_depends_on: Set[str] = set()  # Fields that decide which rows are shown and their order
+        self._detail_track_id: Optional[str] = None  # Track shown in the details panel
+
+        # Paging of the track list: only the shown pages are read from the library
+        self._page_fetch: Optional[Callable[[Optional[str]], Iterator]] = None  # Streams (track_id, track) after a cursor
+        self._page_cursor: Optional[str] = None  # Cursor after the last shown row, None when nothing follows
+        self._page_cursor_field: Optional[str] = None  # Sort field the cursor is taken on
+        self._page_status: Optional[Callable[[int], str]] = None  # Status line for a number of shown rows
+
+        # Progress bar ticks, scheduled only while music plays
+        self._progress_job: Optional[str] = None  # Pending Tk after() id of the next tick
+        self._seek_job: Optional[str] = None  # Pending Tk after() id applying a dragged position
+        self._seek_target: float = 0.0  # Seconds the progress bar was last dragged to
+
+        # Search-as-you-type state
+        self._live_search_job: Optional[str] = None  # Pending Tk after() id while the user is typing
+        self._live_search_key: Optional[Tuple[str, str]] = None  # (search type, term) of the shown live results
+        self._live_search_results: List[str] = []  # Track ids matching _live_search_key
         
         # Add as library observer
         library.add_observer(self)  # Add observer to library
@@ -799,13 +826,30 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
 
     def on_playback_state_change(self, is_playing: bool) -> None:  # Method to handle playback state changes
         """Handle playback state changes"""
-        if not is_playing:  # If playback is not playing
+        if is_playing:  # Progress ticks stop while idle, so restart them
+            self.window.after_idle(self._start_progress_update)
+        elif self.player.state == MusicPlayer.STOPPED:  # Stopped, not paused: a paused track keeps its position on screen
             # Reset progress bar and time label when playback stops
             self.progress_scale.set(0)  # Reset progress scale
             self.time_label.configure(text="0:00 / 0:00")  # Reset time label
 
-    def on_library_change(self) -> None:
-        """Handle library updates"""
+    def on_library_change(self, event: Optional[LibraryChangeEvent] = None) -> None:
+        """Handle library updates, which may arrive on the player or file watcher thread"""
+        try:
+            self.window.after(0, self._apply_library_change, event)  # Widgets are only touched on the Tk thread
+        except (RuntimeError, tk.TclError) as e:
+            print(f"Library change not shown, window is closed: {e}")
+
+    def _apply_library_change(self, event: Optional[LibraryChangeEvent]) -> None:
+        """Bring the artist options and the track list up to date with a library change"""
+        self._live_search_key = None  # Live results may be stale; the next keystroke searches afresh
+        if event is None or event.added or event.removed or 'artist' in event.changed_fields:
+            self._refresh_artist_options()  # The set of artists may have changed
+
+        # Patch only the affected lines when the change allows it
+        if event is not None and self._patch_track_rows(event):
+            return
+
         # Get current status text
         current_status = self.status_lbl.cget("text")
         
@@ -815,11 +859,127 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
             
         # Only refresh track list if not playing a playlist
         if not self.player.is_playing:
-            if "Showing" in current_status:
+            if current_status.startswith("Artist ") and self.artist_var.get() != self._ALL_ARTISTS:
+                self.show_artist_tracks()  # Stay on the artist being browsed
+            elif current_status.startswith("Query: "):
+                self.run_query()  # Re-run the query on the changed library
+            elif "Showing" in current_status:
                 self.apply_filter()  # Maintain the current filter
             else:
                 self.list_tracks_clicked()  # Refresh the entire list
 
+    def _patch_track_rows(self, event: LibraryChangeEvent) -> bool:
+        """Update only the list lines and details of changed tracks; False if a full refresh is needed"""
+        if self._row_formatter is None or event.added or event.removed:
+            return False  # Rows appear or disappear
+        if event.changed_fields & self._row_depends_on:
+            return False  # Rows may move or drop out of the current view
+
+        try:
+            for track_id in event.updated:
+                row = self._row_lookup.get(track_id)
+                if row is not None:
+                    line = f"{row + 1}.0"
+                    self.list_txt.delete(line, f"{row + 1}.end")
+                    self.list_txt.insert(line, self._row_formatter(track_id))
+                if track_id == self._detail_track_id:
+                    self._show_track_details(track_id)
+            return True
+        except Exception as e:
+            print(f"Error patching track list: {e}")
+            return False
+
+    def _render_track_rows(self, track_ids: List[str], formatter: Callable[[str], str], depends_on: Set[str]) -> None:
+        """Show one line per track in list_txt and remember which track each line shows"""
+        self._row_ids = list(track_ids)
+        self._row_lookup = {track_id: row for row, track_id in enumerate(self._row_ids)}
+        self._row_formatter = formatter
+        self._row_depends_on = depends_on
+        self._page_fetch = self._page_cursor = self._page_status = None
+        self._set_text(self.list_txt, "\n".join(formatter(track_id) for track_id in self._row_ids))
+        self._update_more_button()
+
+    _PAGE_SIZE = 200  # Rows read per page; "More Tracks" streams the next page from the library
+
+    def _read_page(self, after: Optional[str]) -> List[str]:
+        """Read one page from the current listing and remember the cursor after it"""
+        rows = list(islice(self._page_fetch(after), self._PAGE_SIZE + 1))  # One extra row tells whether more follow
+        track_ids = [track_id for track_id, _ in rows[:self._PAGE_SIZE]]
+        more = len(rows) > self._PAGE_SIZE
+        self._page_cursor = library.cursor_for(track_ids[-1], self._page_cursor_field) if more else None
+        return track_ids
+
+    def _render_track_page(self, fetch: Callable[[Optional[str]], Iterator], formatter: Callable[[str], str],
+                           depends_on: Set[str], status: Callable[[int], str],
+                           cursor_field: Optional[str] = None) -> int:
+        """Show the first page of a streamed listing; returns the number of rows shown"""
+        self._page_fetch, self._page_cursor_field = fetch, cursor_field
+        track_ids = self._read_page(None)
+        cursor = self._page_cursor
+        self._render_track_rows(track_ids, formatter, depends_on)
+        self._page_fetch, self._page_cursor, self._page_status = fetch, cursor, status
+        self.status_lbl.configure(text=status(len(track_ids)))
+        self._update_more_button()
+        return len(track_ids)
+
+    def load_more_tracks(self) -> None:
+        """Append the next page of the current listing"""
+        if self._page_fetch is None or self._page_cursor is None:
+            return
+        try:
+            track_ids = self._read_page(self._page_cursor)
+            start = len(self._row_ids)
+            for offset, track_id in enumerate(track_ids):
+                self._row_lookup[track_id] = start + offset
+            self._row_ids.extend(track_ids)
+            if track_ids:
+                self.list_txt.insert(tk.END, "\n" + "\n".join(self._row_formatter(track_id) for track_id in track_ids))
+            self.status_lbl.configure(text=self._page_status(len(self._row_ids)))
+        except Exception as e:
+            print(f"Error loading more tracks: {e}")
+            self._page_cursor = None
+        self._update_more_button()
+
+    def _update_more_button(self) -> None:
+        """Enable "More Tracks" only while the listing has more pages"""
+        if hasattr(self, 'more_tracks_btn'):
+            self.more_tracks_btn.configure(state="normal" if self._page_cursor is not None else "disabled")
+
+    @staticmethod
+    def _complete_tracks(pairs: Iterator) -> Iterator:
+        """Skip tracks without a name or artist"""
+        return ((track_id, track) for track_id, track in pairs if track.name and track.artist)
+
+    def _clear_track_rows(self, message: str) -> None:
+        """Show a message instead of tracks in list_txt"""
+        self._row_ids = []
+        self._row_lookup = {}
+        self._row_formatter = None
+        self._row_depends_on = set()
+        self._page_fetch = self._page_cursor = self._page_status = None
+        self._set_text(self.list_txt, message)
+        self._update_more_button()
+
+    def _selected_line(self, text_area: ctk.CTkTextbox) -> int:
+        """Zero-based line of the selection start, or of the cursor when nothing is selected"""
+        index = text_area.index("sel.first") if text_area.tag_ranges("sel") else text_area.index("insert")
+        return int(index.split('.')[0]) - 1
+
+    def _selected_track_id(self) -> Optional[str]:
+        """Track on the selected line of list_txt, looked up in the row model rather than parsed from the text"""
+        row = self._selected_line(self.list_txt)
+        if 0 <= row < len(self._row_ids) and library.get_track(self._row_ids[row]):
+            return self._row_ids[row]
+        return None
+
+    def _show_track_details(self, track_id: str) -> None:
+        """Show name, artist, rating and plays of a track in the details panel"""
+        track = library.get_track(track_id)
+        if track:
+            track_details = f"{track.name}\n{track.artist}\nrating: {track.rating}\nplays: {track.play_count}"
+            self._set_text(self.track_txt, track_details)
+            self._detail_track_id = track_id
+
     def _set_text(self, text_area: ctk.CTkTextbox, content: str) -> None:  # Helper method to set text in a text area
         """Helper method to set text in a text area"""
         text_area.delete("0.0", tk.END)  # Clear existing text
@@ -861,33 +1021,19 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
     def list_tracks_clicked(self) -> None:
         """Handler for List All Tracks button with improved error handling"""
         try:
-            self.status_lbl.configure(text="Displaying Track List")
-            self.list_txt.delete("0.0", tk.END)
-            
-            # Get all tracks and sort by track ID
-            sorted_tracks = []
-            for key in sorted(library.library.keys(), key=lambda x: int(x)):
-                track = library.library[key]
-                if track and track.name and track.artist:  # Ensure valid track data
-                    sorted_tracks.append(track.info())
-            
-            if sorted_tracks:
-                self._set_text(self.list_txt, "\n".join(sorted_tracks))
-                
-                # Store the mapping for track selection
-                self._filtered_tracks = {
-                    f"{library.get_name(key)} - {library.get_artist(key)}": key
-                    for key in library.library.keys()
-                    if library.get_name(key) and library.get_artist(key)
-                }
-            else:
-                self._set_text(self.list_txt, "No tracks available")
-                self._filtered_tracks = {}
+            # Stream the tracks in id order, one page at a time
+            shown = self._render_track_page(
+                lambda after: self._complete_tracks(library.iter_tracks(after=after)),
+                lambda key: library.get_track(key).info(),
+                set(),
+                lambda count: f"Displaying Track List ({count} of {len(library.library)} tracks)"
+            )
+            if not shown:
+                self._clear_track_rows("No tracks available")
                 
         except Exception as e:
             print(f"Error listing tracks: {e}")
-            self._set_text(self.list_txt, "Error listing tracks")
-            self._filtered_tracks = {}
+            self._clear_track_rows("Error listing tracks")
 
     def search_tracks(self) -> None:  # Method to search tracks based on criteria
         """Search tracks based on criteria"""
@@ -898,91 +1044,189 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
             self.list_tracks_clicked()  # If empty, display all tracks
             return  # Exit method
 
-        results = []  # Initialize list to store search results
-        for key in library.library.keys():  # Iterate over all track keys in the library
-            track_name = library.get_name(key)  # Get track name
-            artist_name = library.get_artist(key)  # Get artist name
-            
-            if track_name and artist_name:  # Check if both track and artist names are available
-                track_info = f"{track_name} - {artist_name}"  # Format track info
-                
-                if search_type == "Track Name" and search_term in track_name.lower():  # Search by track name
-                    results.append(track_info)  # Add to results
-                elif search_type == "Artist" and search_term in artist_name.lower():  # Search by artist
-                    results.append(track_info)  # Add to results
-                elif search_type == "Both" and (  # Search by both
-                    search_term in track_name.lower() or 
-                    search_term in artist_name.lower()
-                ):
-                    results.append(track_info)  # Add to results
+        results = library.search_track_ids(search_term, search_type)  # Look the term up in the library's token index
         
         if results:  # Check if any results were found
-            self._set_text(self.list_txt, "\n".join(results))  # Display results
-            self.status_lbl.configure(text=f"Found {len(results)} matches")  # Update status label
+            # Display the first page; a name or artist change can change the matches
+            self._render_track_page(
+                lambda after: library.iter_search(search_term, search_type, after=after),
+                lambda key: f"{library.get_name(key)} - {library.get_artist(key)}",
+                {'name', 'artist'},
+                lambda count: f"Found {len(results)} matches" + (f", showing {count}" if count < len(results) else "")
+            )
+            return
+
+        # No exact matches: show close matches, ignoring accents and small typos
+        close_matches = [key for key, _ in library.fuzzy_search(search_term, search_type, limit=20)]
+        if close_matches:
+            self._render_track_rows(
+                close_matches,
+                lambda key: f"{library.get_name(key)} - {library.get_artist(key)}",
+                {'name', 'artist'}
+            )
+            self.status_lbl.configure(text=f"No exact matches, showing {len(close_matches)} close matches")
         else:  # If no matches found
             self.status_lbl.configure(text="No matches found")  # Update status label
-            self._set_text(self.list_txt, "No matches found")  # Display no matches message
+            self._clear_track_rows("No matches found")  # Display no matches message
+
+    _LIVE_SEARCH_DELAY = 200  # Milliseconds of no typing before the live search runs
+
+    def _on_search_typed(self, event=None) -> None:
+        """Debounce keystrokes so fast typing runs one search, not one per key"""
+        if event is not None and event.keysym == 'Return':
+            return  # Return runs the full search
+        if self._live_search_job is not None:
+            self.window.after_cancel(self._live_search_job)
+        self._live_search_job = self.window.after(self._LIVE_SEARCH_DELAY, self._run_live_search)
+
+    def _run_live_search(self) -> None:
+        """Show tracks whose words start with the typed words, narrowing the previous results"""
+        self._live_search_job = None
+        search_term = self.search_entry.get().strip()
+        search_type = self.search_var.get()
+        if not search_term:
+            self._live_search_key = None
+            self.list_tracks_clicked()
+            return
+
+        within = None
+        if self._live_search_key is not None:
+            last_type, last_term = self._live_search_key
+            if last_type == search_type and search_term.lower().startswith(last_term.lower()):
+                within = self._live_search_results  # The term only grew: narrow instead of rescanning
+        results = library.prefix_search(search_term, search_type, within)
+        self._live_search_key = (search_type, search_term)
+        self._live_search_results = results
+
+        if results:
+            self._render_track_rows(
+                results,
+                lambda key: f"{library.get_name(key)} - {library.get_artist(key)}",
+                {'name', 'artist'}
+            )
+            self.status_lbl.configure(text=f"Found {len(results)} matches")
+        else:
+            self.status_lbl.configure(text="No matches found - press Enter for close matches")
+            self._clear_track_rows("No matches found")
 
     def clear_search(self) -> None:  # Method to clear search results
         """Clear search results"""
+        if self._live_search_job is not None:
+            self.window.after_cancel(self._live_search_job)  # Drop a live search still waiting to run
+            self._live_search_job = None
+        self._live_search_key = None
         self.search_entry.delete(0, tk.END)  # Clear search entry
         self.list_tracks_clicked()  # Display all tracks
         self.status_lbl.configure(text="Search cleared")  # Update status label
 
+    _ALL_ARTISTS = "All Artists"  # Artist menu entry that leaves artist browsing
+
+    def show_artist_tracks(self, artist: Optional[str] = None) -> None:
+        """List the tracks of one artist, featured appearances included, with the artist's totals"""
+        artist = artist or self.artist_var.get()
+        if artist == self._ALL_ARTISTS:
+            self.list_tracks_clicked()
+            return
+
+        stats = library.artist_stats(artist)
+        if stats is None:  # The artist's last track was removed
+            self.artist_var.set(self._ALL_ARTISTS)
+            self.list_tracks_clicked()
+            return
+
+        name, track_count, total_plays, average_rating = stats
+        # Membership depends on the artist field; the totals on plays and ratings
+        self._render_track_rows(
+            library.tracks_by_artist(artist),
+            lambda key: library.get_track(key).info(),
+            {'artist', 'play_count', 'rating'}
+        )
+        self.status_lbl.configure(
+            text=f"Artist {name}: {track_count} tracks, {total_plays} plays, average rating {average_rating:.1f}"
+        )
+
+    def _refresh_artist_options(self) -> None:
+        """Reload the artist menu from the artist index"""
+        if not hasattr(self, 'artist_menu'):
+            return  # Widgets not built yet
+        self.artist_menu.configure(values=[self._ALL_ARTISTS] + library.artist_names())
+
     def apply_filter(self, *args) -> None:
         """Apply selected filter to track list while preserving original track information"""
         filter_type = self.filter_var.get()
-        results = []
+        depends_on: Set[str] = set()  # Fields that decide the order of this view
+        cursor_field: Optional[str] = None  # Sort field the page cursor is taken on
 
         try:
-            if filter_type == "No Filter":
-                for key in sorted(library.library.keys(), key=lambda x: int(x)):
-                    name = library.get_name(key)
-                    artist = library.get_artist(key)
-                    if name and artist:  # Only include tracks with valid info
-                        track_info = f"{name} - {artist}"
-                        results.append((track_info, key, name, artist))
-            
-            elif filter_type == "Most Played" or filter_type == "Least Played":
-                tracks = [(key, library.get_name(key), library.get_artist(key), library.get_play_count(key)) 
-                        for key in library.library.keys()]
-                # Only include tracks with valid info
-                tracks = [t for t in tracks if all(x is not None for x in t[1:3])]
-                tracks.sort(key=lambda x: x[3], reverse=(filter_type == "Most Played"))
-                for track_id, name, artist, count in tracks:
-                    track_info = f"{name} - {artist} (Plays: {count})"
-                    results.append((track_info, track_id, name, artist))
-                    
+            if filter_type == "Most Played" or filter_type == "Least Played":
+                depends_on = {'play_count'}
+                cursor_field = 'play_count'
+                descending = filter_type == "Most Played"
+                # Stream the library's maintained play count order
+                fetch = lambda after: self._complete_tracks(
+                    library.iter_sorted("play_count", descending=descending, after=after)
+                )
             elif filter_type in ["Highest Rated", "Lowest Rated"]:
-                tracks = [(key, library.get_name(key), library.get_artist(key), library.get_rating(key)) 
-                        for key in library.library.keys()]
-                # Only include tracks with valid info
-                tracks = [t for t in tracks if all(x is not None for x in t[1:3])]
-                tracks.sort(key=lambda x: x[3], reverse=(filter_type == "Highest Rated"))
-                for track_id, name, artist, rating in tracks:
-                    track_info = f"{name} - {artist} (Rating: {rating})"
-                    results.append((track_info, track_id, name, artist))
-
-            # Clear and update display
-            self.list_txt.delete("0.0", tk.END)
-            for display_text, _, _, _ in results:
-                self.list_txt.insert(tk.END, f"{display_text}\n")
-            
-            # Store the mapping for later use when adding tracks
-            self._filtered_tracks = {
-                f"{name} - {artist}": track_id 
-                for _, track_id, name, artist in results
-            }
-            
-            self.status_lbl.configure(
-                text=f"Showing {len(results)} tracks" + 
-                    (f" for filter: {filter_type}" if filter_type != "No Filter" else "")
+                depends_on = {'rating'}
+                cursor_field = 'rating'
+                descending = filter_type == "Highest Rated"
+                # Stream the library's maintained rating order
+                fetch = lambda after: self._complete_tracks(
+                    library.iter_sorted("rating", descending=descending, after=after)
+                )
+            else:
+                fetch = lambda after: self._complete_tracks(library.iter_tracks(after=after))
+
+            total = len(library.library)
+            self._render_track_page(
+                fetch,
+                lambda track_id: self._format_filter_row(filter_type, track_id),
+                depends_on,
+                lambda count: f"Showing {count}" + (f" of {total}" if count < total else "") +
+                    " tracks" + (f" for filter: {filter_type}" if filter_type != "No Filter" else ""),
+                cursor_field
             )
         except Exception as e:
             print(f"Error applying filter: {e}")
-            self.list_txt.delete("0.0", tk.END)
-            self.list_txt.insert(tk.END, "Error displaying tracks")
-            self._filtered_tracks = {}
+            self._clear_track_rows("Error displaying tracks")
+
+    def run_query(self) -> None:
+        """Show the tracks matching the query typed in the query entry"""
+        text = self.query_entry.get().strip()
+        if not text:
+            self.apply_filter()
+            return
+        try:
+            results = library.query(text)
+        except QuerySyntaxError as e:
+            self.status_lbl.configure(text=f"Query error: {e}")
+            return
+        except Exception as e:
+            print(f"Error running query: {e}")
+            self._clear_track_rows("Error displaying tracks")
+            return
+
+        fields = compile_query(text).fields
+        self._render_track_rows(
+            [track_id for track_id, _ in results],
+            self._format_query_row,
+            fields  # Rows move or drop out only when a field the query uses changes
+        )
+        self.status_lbl.configure(text=f"Query: {len(results)} tracks match '{text}'")
+
+    def _format_query_row(self, track_id: str) -> str:
+        """Format one line of a query result list"""
+        track = library.get_track(track_id)
+        return f"{track.name} - {track.artist} (Rating: {track.rating}, Plays: {track.play_count})"
+
+    def _format_filter_row(self, filter_type: str, track_id: str) -> str:
+        """Format one line of a filtered track list"""
+        track = library.get_track(track_id)
+        if filter_type in ["Most Played", "Least Played"]:
+            return f"{track.name} - {track.artist} (Plays: {track.play_count})"
+        if filter_type in ["Highest Rated", "Lowest Rated"]:
+            return f"{track.name} - {track.artist} (Rating: {track.rating})"
+        return f"{track.name} - {track.artist}"
 
     def _get_filter_options(self) -> List[str]:  # Method to get list of filter options
         """Get list of filter options"""
@@ -1001,42 +1245,24 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
     def view_tracks_clicked(self) -> None:  # Method to view selected track details
         """View selected track details"""
         try:  # Try block to handle exceptions
-            # Get selected line
-            selection = self.list_txt.selection_get() if self.list_txt.tag_ranges("sel") else ""  # Get selected text
-            if not selection:  # If no selection, get the line at cursor
-                cursor_pos = self.list_txt.index("insert")  # Get cursor position
-                selection = self.list_txt.get(f"{cursor_pos} linestart", f"{cursor_pos} lineend")  # Get the line at cursor
-            
-            if not selection.strip():  # Check if selection is empty
+            track_id = self._selected_track_id()  # Track shown on the selected line
+            if track_id is None:  # Check if a track line is selected
                 messagebox.showwarning("No Selection", "Please select a track first")  # Show warning
                 return  # Exit method
-                
-            # Remove any trailing stars (ratings) from the selection
-            base_selection = selection.rstrip("* ")  # Strip trailing stars
+
+            self._show_track_details(track_id)  # Set text in track details textbox
             
-            # Find matching track in library
-            for track_id, track in library.library.items():  # Iterate over library tracks
-                track_text = f"{track.name} - {track.artist}"  # Format track text
-                if track_text == base_selection:  # Check if track matches selection
-                    rating = library.get_rating(track_id)  # Get track rating
-                    play_count = library.get_play_count(track_id)  # Get play count
-                    track_details = f"{track.name}\n{track.artist}\nrating: {rating}\nplays: {play_count}"  # Format track details
-                    self._set_text(self.track_txt, track_details)  # Set text in track details textbox
-                    
-                    track_image = self._load_track_image(track_id)  # Load track image
-                    if track_image:  # If image is loaded
-                        self.image_label.configure(image=track_image)  # Set image label to track image
-                        self.image_label.image = track_image  # Keep reference to avoid garbage collection
-                    
-                    self.status_lbl.configure(text="Track details displayed")  # Update status label ```python
-                    self.status_lbl.configure(text="Track details displayed")  # Update status label to indicate track details are displayed
-                    return  # Exit method after displaying track details
-                    
-            messagebox.showerror("Error", "Could not find track in library")  # Show error if track not found
+            track_image = self._load_track_image(track_id)  # Load track image
+            if track_image:  # If image is loaded
+                self.image_label.configure(image=track_image)  # Set image label to track image
+                self.image_label.image = track_image  # Keep reference to avoid garbage collection
+            
+            self.status_lbl.configure(text="Track details displayed")  # Update status label to indicate track details are displayed
             
         except Exception as e:  # Catch any exceptions
             messagebox.showerror("Error", f"An error occurred: {str(e)}")  # Show error message
             self._set_text(self.track_txt, "Track not found")  # Set track details textbox to indicate track not found
+            self._detail_track_id = None  # No track is shown in the details panel
             self._load_default_image()  # Load default image if track not found
 
     def view_playlists_clicked(self):  # Method to view playlists
@@ -1079,14 +1305,11 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
         """Update rating for selected track with improved error handling"""
         try:
             self._updating_rating = True
-            # Get current cursor position
-            cursor_pos = self.list_txt.index("insert")
-            # Get the line at cursor position
-            selection = self.list_txt.get(f"{cursor_pos} linestart", f"{cursor_pos} lineend").strip()
-
-            if not selection:
+            track_id = self._selected_track_id()  # Track shown on the selected line
+            if track_id is None:
                 messagebox.showwarning("No Selection", "Please select a track first")
                 return
+            selected_track = library.get_track(track_id)
 
             # Create rating dialog with safety checks
             rating_dialog = ctk.CTkToplevel(self.window)
@@ -1098,12 +1321,8 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
             # Center dialog
             rating_dialog.geometry(f"+{self.window.winfo_x() + 150}+{self.window.winfo_y() + 150}")
 
-            # Clean up selection - remove ratings and parenthetical info
-            base_selection = selection.split(' (')[0].strip()
-            base_selection = base_selection.rstrip('* ')
-
             # Track display
-            track_label = ctk.CTkLabel(rating_dialog, text=base_selection)
+            track_label = ctk.CTkLabel(rating_dialog, text=f"{selected_track.name} - {selected_track.artist}")
             track_label.pack(pady=10)
 
             # Rating buttons
@@ -1137,38 +1356,21 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
                         messagebox.showerror("Invalid Rating", "Rating must be between 1 and 5")
                         return
 
-                    found = False
-                    # Search through library for matching track
-                    library_snapshot = library.library.copy()  # Work with a copy
-                    for track_id in sorted(library_snapshot.keys(), key=lambda x: int(x)):
-                        track = library_snapshot[track_id]
-                        track_text = f"{track.name} - {track.artist}"
-
-                        if track_text == base_selection:
-                            found = True
-                            # Update rating with error handling
-                            try:
-                                library.set_rating(track_id, new_rating)
-                                self.status_lbl.configure(text=f"Updated rating for {track.name} to {new_rating} stars")
-                                
-                                # Update track details if they're being viewed
-                                rating = library.get_rating(track_id)
-                                play_count = library.get_play_count(track_id)
-                                track_details = f"{track.name}\n{track.artist}\nrating: {rating}\nplays: {play_count}"
-                                self._set_text(self.track_txt, track_details)
-
-                                # Refresh the track listing without modifying the CSV directly
-                                if "Showing" in self.status_lbl.cget("text"):
-                                    self.apply_filter()
-                                else:
-                                    self.list_tracks_clicked()
-                                break
-                            except Exception as e:
-                                messagebox.showerror("Error", f"Failed to update rating: {str(e)}")
-                                return
-
-                    if not found:
-                        messagebox.showerror("Error", "Could not find track in library")
+                    track = library.get_track(track_id)
+                    if track is None:
+                        messagebox.showerror("Error", "Could not find track in library")  # Removed while the dialog was open
+                        return
+
+                    # Update rating with error handling
+                    try:
+                        library.set_rating(track_id, new_rating)  # The change event patches the listed line
+                        self.status_lbl.configure(text=f"Updated rating for {track.name} to {new_rating} stars")
+                        
+                        # Update track details if they're being viewed
+                        self._show_track_details(track_id)
+                    except Exception as e:
+                        messagebox.showerror("Error", f"Failed to update rating: {str(e)}")
+                        return
                 except Exception as e:
                     messagebox.showerror("Error", f"An error occurred: {str(e)}")
                 finally:
@@ -1193,9 +1395,9 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
         """Safely update rating for currently viewed track"""
         try:
             cursor_pos = self.list_txt.index("insert")
-            current_line = self.list_txt.get(f"{cursor_pos} linestart", f"{cursor_pos} lineend").strip()
+            track_id = self._selected_track_id()  # Track shown on the selected line
             
-            if not current_line:
+            if track_id is None:
                 messagebox.showerror("Error", "Please select a track first")
                 return
 
@@ -1208,68 +1410,34 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
                         hover_color=["#36719F", "#144870"]
                     )
 
-            # Get base selection (song name + artist)
-            base_selection = current_line
-            # Remove any parenthetical info (plays, rating)
-            if " (Plays:" in base_selection:
-                base_selection = base_selection.split(" (Plays:")[0].strip()
-            elif " (Rating:" in base_selection:
-                base_selection = base_selection.split(" (Rating:")[0].strip()
-            # Remove any trailing stars
-            base_selection = base_selection.rstrip('*').strip()
-
             new_rating = self.rating_var.get()
             if not 1 <= new_rating <= 5:
                 messagebox.showerror("Invalid Rating", "Rating must be between 1 and 5")
                 return
 
-            update_successful = False
-            # Search through library
-            for track_id in sorted(library.library.keys(), key=lambda x: int(x)):
-                track = library.library[track_id]
-                track_text = f"{track.name} - {track.artist}"
-                
-                if track_text == base_selection:
-                    # Store cursor position and selected track info
-                    current_pos = cursor_pos
-                    
-                    # Update rating
-                    library.set_rating(track_id, new_rating)
-                    
-                    # Set the status text
-                    status_text = f"Succesfully updated rating for {track.name} to {new_rating} stars"
-                    
-                    # Update the display without triggering list_tracks_clicked
-                    current_view = "Showing" in self.status_lbl.cget("text")
-                    if current_view:
-                        self.apply_filter()
-                    else:
-                        # Update the track list while preserving the status
-                        self.list_txt.delete("0.0", tk.END)
-                        sorted_tracks = []
-                        for key in sorted(library.library.keys(), key=lambda x: int(x)):
-                            track = library.library[key]
-                            if track and track.name and track.artist:
-                                sorted_tracks.append(track.info())
-                        if sorted_tracks:
-                            self._set_text(self.list_txt, "\n".join(sorted_tracks))
-                            
-                    # Restore cursor position
-                    self.list_txt.mark_set("insert", current_pos)
-                    self.list_txt.see("insert")
-                    
-                    # Set the status text AFTER all updates
-                    self.status_lbl.configure(text=status_text)
-                    
-                    # Reset stars to default state after successful update
-                    self.window.after(500, reset_stars)  # Reset after a short delay for better visual feedback
+            track = library.get_track(track_id)
+            
+            # Update rating
+            library.set_rating(track_id, new_rating)
+            
+            # Set the status text
+            status_text = f"Succesfully updated rating for {track.name} to {new_rating} stars"
+            
+            # Update the display without triggering list_tracks_clicked
+            current_view = "Showing" in self.status_lbl.cget("text")
+            if current_view:
+                self.apply_filter()
+            # Otherwise the library change event has already patched the changed line
                     
-                    update_successful = True
-                    break
-
-            if not update_successful:
-                messagebox.showerror("Error", "Could not find track in library")
-                reset_stars()  # Also reset stars if update failed
+            # Restore cursor position
+            self.list_txt.mark_set("insert", cursor_pos)
+            self.list_txt.see("insert")
+            
+            # Set the status text AFTER all updates
+            self.status_lbl.configure(text=status_text)
+            
+            # Reset stars to default state after successful update
+            self.window.after(500, reset_stars)  # Reset after a short delay for better visual feedback
 
         except Exception as e:
             print(f"Error updating rating: {e}")
@@ -1317,70 +1485,38 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
 
     def add_selected_track(self) -> None:
         try:
-            # Get selected line from text widget
-            selection = self.list_txt.selection_get() if self.list_txt.tag_ranges("sel") else ""
-            if not selection:
-                cursor_pos = self.list_txt.index("insert")
-                selection = self.list_txt.get(f"{cursor_pos} linestart", f"{cursor_pos} lineend")
-            
-            if not selection.strip():
+            # Track shown on the selected line
+            track_id = self._selected_track_id()
+            if track_id is None:
                 messagebox.showwarning("No Selection", "Please select a track first")
                 return
             
-            # Clean up the selection - remove any info in parentheses and trailing stars
-            base_selection = selection.split(" (")[0].strip().rstrip("*").strip()
+            track = library.library[track_id]
             
-            # Try to find track_id using the filtered_tracks mapping
-            track_id = None
-            if hasattr(self, '_filtered_tracks'):
-                # Loop through filtered tracks to find a match
-                for track_text, tid in self._filtered_tracks.items():
-                    cleaned_track_text = track_text.split(" (")[0].strip().rstrip("*").strip()
-                    if cleaned_track_text == base_selection:
-                        track_id = tid
-                        break
+            # Check for duplicate
+            if any(track_id == t[0] for t in self.playlist):
+                messagebox.showinfo("Duplicate Track", "Track is already in the playlist!")
+                return
             
-            # If not found in filtered tracks, search through library
-            if not track_id:
-                for key, track in library.library.items():
-                    track_text = f"{track.name} - {track.artist}"
-                    if track_text == base_selection:
-                        track_id = key
-                        break
+            # Add to playlist
+            self.playlist.append((track_id, track.name))
+            self._set_text(self.playlist_txt, "\n".join(name for _, name in self.playlist))
+            self.status_lbl.configure(text=f"Added track: {track.name} - {track.artist}")
             
-            if track_id:
-                track = library.library[track_id]
-                
-                # Check for duplicate
-                if any(track_id == t[0] for t in self.playlist):
-                    messagebox.showinfo("Duplicate Track", "Track is already in the playlist!")
-                    return
-                
-                # Add to playlist
-                self.playlist.append((track_id, track.name))
-                self._set_text(self.playlist_txt, "\n".join(name for _, name in self.playlist))
-                self.status_lbl.configure(text=f"Added track: {track.name} - {track.artist}")
-                
-                # Show track details
-                rating = library.get_rating(track_id)
-                play_count = library.get_play_count(track_id)
-                track_details = f"{track.name}\n{track.artist}\nrating: {rating}\nplays: {play_count}"
-                self._set_text(self.track_txt, track_details)
+            # Show track details
+            self._show_track_details(track_id)
+            
+            # Load and display track image
+            track_image = self._load_track_image(track_id)
+            if track_image:
+                self.image_label.configure(image=track_image)
+                self.image_label.image = track_image
                 
-                # Load and display track image
-                track_image = self._load_track_image(track_id)
-                if track_image:
-                    self.image_label.configure(image=track_image)
-                    self.image_label.image = track_image
-            else:
-                print(f"Debug - Base selection: '{base_selection}'")
-                print("Debug - Available tracks:", {k: f"{v.name} - {v.artist}" for k,v in library.library.items()})
-                messagebox.showerror("Error", "Could not find track in library")
-                    
         except Exception as e:
             print(f"Error adding track: {e}")
             messagebox.showerror("Error", f"An error occurred: {str(e)}")
             self._set_text(self.track_txt, "Track not found")
+            self._detail_track_id = None
             self._load_default_image()
 
     def play_playlist_clicked(self) -> None:
@@ -1392,27 +1528,18 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
         # Configure player before starting playback
         self.player.set_track_info_callback(self.update_track_info)
 
-        # Temporarily store observers and clear them to prevent list_tracks_clicked from being called
-        observers = self.player._observers.copy()
-        self.player._observers.clear()
+        # Start playlist playback; the player thread reports the track once it is playing
+        self.player.play_playlist(self.playlist.copy())
+        self.status_lbl.configure(text="Playing playlist...")
         
-        try:
-            # Start playlist playback
-            self.player.play_playlist(self.playlist.copy())
-            self.status_lbl.configure(text="Playing playlist...")
-            
-            if self.playlist:
-                first_track = self.playlist[0][0]
-                track_name = library.get_name(first_track)
-                artist_name = library.get_artist(first_track)
-                self.track_info.configure(text=f"Now Playing: {track_name} - {artist_name}")
-                
-                # Reset progress indicators
-                self.progress_scale.set(0)
-                self.time_label.configure(text="0:00 / 0:00")
-        finally:
-            # Restore observers
-            self.player._observers = observers
+        first_track = self.playlist[0][0]
+        track_name = library.get_name(first_track)
+        artist_name = library.get_artist(first_track)
+        self.track_info.configure(text=f"Now Playing: {track_name} - {artist_name}")
+        
+        # Reset progress indicators
+        self.progress_scale.set(0)
+        self.time_label.configure(text="0:00 / 0:00")
 
     def reset_playlist_clicked(self) -> None:  # Method to reset playlist
         """Reset playlist and clear current playlist name"""
@@ -1423,24 +1550,16 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
 
     def remove_track_clicked(self) -> None:  # Method to remove track from playlist
         try:  # Try block to handle potential errors
-            # Get cursor position
-            current_pos = self.playlist_txt.index("insert")  # Get current cursor position
-            # Get line at cursor
-            line = self.playlist_txt.get(f"{current_pos} linestart", f"{current_pos} lineend")  # Get entire line at cursor
-            if not line.strip():  # If line is empty or only whitespace
+            # Line n of playlist_txt shows self.playlist[n], so the line number is the playlist position
+            row = self._selected_line(self.playlist_txt)
+            if not 0 <= row < len(self.playlist):  # If the cursor is not on a track line
                 messagebox.showwarning("No Selection", "Please select a track to remove.")  # Show warning dialog
                 return  # Exit the method
 
-            # Find and remove track from playlist
-            for track_id, name in self.playlist:  # Iterate through playlist
-                if name == line.strip():  # If track name matches selected line
-                    # Remove track and keep all others
-                    self.playlist = [track for track in self.playlist if track[0] != track_id]  # Filter out the selected track
-                    self._set_text(self.playlist_txt, "\n".join(name for _, name in self.playlist))  # Update playlist display
-                    self.status_lbl.configure(text=f"Removed track: {line}")  # Update status label
-                    return  # Exit the method
-
-            messagebox.showerror("Error", "Could not find track to remove")  # Show error if track not found
+            # Remove the track on that line and keep all others
+            _, name = self.playlist.pop(row)
+            self._set_text(self.playlist_txt, "\n".join(name for _, name in self.playlist))  # Update playlist display
+            self.status_lbl.configure(text=f"Removed track: {name}")  # Update status label
                 
         except Exception as e:  # Catch any exceptions that occur
             messagebox.showerror("Error", f"An error occurred: {str(e)}")  # Show error dialog with details
@@ -1467,54 +1586,78 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
         """Convert seconds to MM:SS format"""
         return str(timedelta(seconds=int(seconds)))[2:7]  # Convert seconds to timedelta and format as MM:SS
 
-    def _start_progress_update(self):  # Method to start progress update loop
-        """Start the progress update loop"""
-        def update():  # Inner function for continuous updates
-            if self.player.is_playing or pygame.mixer.music.get_busy():  # If music is playing
-                try:  # Try block to handle potential errors
-                    # Calculate current position
-                    current_pos = pygame.mixer.music.get_pos() / 1000.0  # Get current position in seconds
-                    current_pos += self.player._current_position  # Add stored position for accurate tracking
-                    track_length = self.player._track_length  # Get total track length
-                    
-                    if track_length > 0 and current_pos >= 0:  # If valid position and length
-                        # Update progress bar
-                        progress = (current_pos / track_length) * 100  # Calculate progress percentage
-                        self.progress_scale.set(progress)  # Update progress bar
-                        
-                        # Update time display
-                        self.time_label.configure(  # Update time label with current and total time
-                            text=f"{self.format_time(current_pos)} / {self.format_time(track_length)}"
-                        )
-                        
-                        # Handle track end
-                        if current_pos >= track_length:  # If track has ended
-                            self.progress_scale.set(0)  # Reset progress bar
-                            self.time_label.configure(text="0:00 / 0:00")  # Reset time display
-                except Exception as e:  # Catch any exceptions during update
-                    print(f"Error updating progress: {e}")  # Print error message
+    _PROGRESS_TICK = 1000  # Milliseconds per progress tick, aligned to the second shown in the time label
+
+    def _start_progress_update(self):  # Method to start progress updates
+        """Refresh the progress bar now and keep refreshing it while music plays"""
+        if self._progress_job is not None:  # Replace a pending tick rather than running two loops
+            self.window.after_cancel(self._progress_job)
+            self._progress_job = None
+        self._update_progress()
+
+    def _update_progress(self):  # Method to refresh the progress bar once
+        """Show the playback position; schedules the next tick only while music plays"""
+        self._progress_job = None
+        if not self.player.is_playing:  # Idle: nothing to refresh until playback starts
+            return
+        current_pos = 0.0
+        try:  # Try block to handle potential errors
+            # Calculate current position
+            current_pos = self.player.position  # Position in seconds, without a call into the player's mixer
+            track_length = self.player.track_length  # Get total track length
             
-            # Schedule next update
-            self.window.after(100, update)  # Schedule next update in 100ms
+            if track_length > 0 and current_pos >= 0 and self._seek_job is None:  # Valid, and not being dragged
+                # Update progress bar
+                progress = (current_pos / track_length) * 100  # Calculate progress percentage
+                self.progress_scale.set(progress)  # Update progress bar
+                
+                # Update time display
+                self.time_label.configure(  # Update time label with current and total time
+                    text=f"{self.format_time(current_pos)} / {self.format_time(track_length)}"
+                )
+                
+                # Handle track end
+                if current_pos >= track_length:  # If track has ended
+                    self.progress_scale.set(0)  # Reset progress bar
+                    self.time_label.configure(text="0:00 / 0:00")  # Reset time display
+        except Exception as e:  # Catch any exceptions during update
+            print(f"Error updating progress: {e}")  # Print error message
         
-        update()  # Start the update loop
+        # Next tick when the shown second changes
+        delay = self._PROGRESS_TICK - int(max(current_pos, 0) * 1000) % self._PROGRESS_TICK
+        self._progress_job = self.window.after(max(delay, 20), self._update_progress)
+
+    _SEEK_SETTLE = 150  # Milliseconds without drag events before the dragged position is applied
 
     def on_progress_click(self, event) -> None:  # Method to handle progress bar clicks
         """Handle click on progress bar"""
-        if self.player.is_playing and self.player._track_length > 0:  # If music is playing
+        if self.player.state != MusicPlayer.STOPPED and self.player.track_length > 0:  # If a track is loaded
             widget_width = self.progress_scale.winfo_width()  # Get progress bar width
-            relative_pos = event.x / widget_width  # Calculate relative position of click
-            target_pos = relative_pos * self.player._track_length  # Calculate target position in seconds
-            self.player.seek_to_position(target_pos)  # Seek to target position
+            relative_pos = max(0, min(1, event.x / widget_width))  # Calculate and clamp relative position of click
+            self._cancel_pending_seek()  # A click replaces an unfinished drag
+            self.progress_scale.set(relative_pos * 100)  # Move the bar at once, also while paused
+            self.player.seek_to_position(relative_pos * self.player.track_length)  # Seek to target position
             
     def on_progress_drag(self, event) -> None:  # Method to handle progress bar dragging
-        """Handle dragging the progress slider"""
-        if self.player.is_playing and self.player._track_length > 0:  # If music is playing
+        """Handle dragging the progress slider; only the position where the drag settles is applied"""
+        if self.player.state != MusicPlayer.STOPPED and self.player.track_length > 0:  # If a track is loaded
             widget_width = self.progress_scale.winfo_width()  # Get progress bar width
             relative_pos = max(0, min(1, event.x / widget_width))  # Calculate and clamp relative position
-            target_pos = relative_pos * self.player._track_length  # Calculate target position in seconds
-            self.progress_scale.set(relative_pos * 100)  # Update progress bar position
-            self.player.seek_to_position(target_pos)  # Seek to target position
+            self.progress_scale.set(relative_pos * 100)  # Move the bar at once
+            self._seek_target = relative_pos * self.player.track_length  # Calculate target position in seconds
+            self._cancel_pending_seek()
+            self._seek_job = self.window.after(self._SEEK_SETTLE, self._apply_pending_seek)
+
+    def _cancel_pending_seek(self) -> None:
+        """Forget a dragged position that has not been applied yet"""
+        if self._seek_job is not None:
+            self.window.after_cancel(self._seek_job)
+            self._seek_job = None
+
+    def _apply_pending_seek(self) -> None:
+        """Seek to where the drag settled"""
+        self._seek_job = None
+        self.player.seek_to_position(self._seek_target)
 
     def update_volume(self, value) -> None:  # Method to update player volume
         """Update player volume"""
@@ -1665,6 +1808,7 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
         self.search_entry = ctk.CTkEntry(search_frame, width=200)
         self.search_entry.pack(side="left", padx=5)
         self.search_entry.bind('<Return>', lambda e: self.search_tracks())
+        self.search_entry.bind('<KeyRelease>', self._on_search_typed)  # Search as you type
         
         # Search buttons
         ctk.CTkButton(
@@ -1698,6 +1842,40 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
         self.filter_type.configure(command=lambda choice: self.apply_filter())  # Changed this line
         self.filter_type.pack(side="left", padx=5)
 
+        # Artist browse, served from the library's artist index
+        artist_label = ctk.CTkLabel(filter_frame, text="Artist:", anchor="w")
+        artist_label.pack(side="left", padx=5)
+
+        self.artist_var = ctk.StringVar(value=self._ALL_ARTISTS)
+        self.artist_menu = ctk.CTkOptionMenu(
+            filter_frame,
+            variable=self.artist_var,
+            values=[self._ALL_ARTISTS] + library.artist_names(),
+            command=self.show_artist_tracks,
+            width=200
+        )
+        self.artist_menu.pack(side="left", padx=5)
+
+        # Query controls, e.g. artist:adele rating>=4 plays<10 sort:-plays limit:20
+        query_frame = ctk.CTkFrame(search_filter_frame)
+        query_frame.pack(fill="x", padx=10, pady=5)
+
+        query_label = ctk.CTkLabel(query_frame, text="Query:", anchor="w")
+        query_label.pack(side="left", padx=5)
+
+        self.query_entry = ctk.CTkEntry(
+            query_frame, width=400, placeholder_text="artist:adele rating>=4 plays<10 sort:-plays limit:20"
+        )
+        self.query_entry.pack(side="left", padx=5)
+        self.query_entry.bind('<Return>', lambda e: self.run_query())
+
+        ctk.CTkButton(
+            query_frame,
+            text="▶ Run Query",
+            command=self.run_query,
+            width=100
+        ).pack(side="left", padx=5)
+
     def _create_track_listing_frame(self, parent):
         track_frame = ctk.CTkFrame(parent)
         track_frame.pack(fill="both", expand=True, padx=10, pady=5)
@@ -1729,6 +1907,16 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
             width=200
         )
         self.view_tracks_btn.pack(pady=10)
+
+        # Next page of the current listing
+        self.more_tracks_btn = ctk.CTkButton(
+            track_frame,
+            text="More Tracks",
+            command=self.load_more_tracks,
+            width=200,
+            state="disabled"
+        )
+        self.more_tracks_btn.pack(side="bottom", pady=5)
         
         # Track list
         self.list_txt = ctk.CTkTextbox(
@@ -1911,9 +2099,9 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
 
         def change_strategy(*args):
             selected = strategy_var.get()
-            self.player._strategy = self.strategies[selected]
+            self.player.set_strategy(self.strategies[selected])
             # If currently playing, restart with new strategy
-            if self.player._is_playing:
+            if self.player.is_playing:
                 self.player.play_playlist(self.playlist.copy())
 
         strategy_var = ctk.StringVar(value="Sequential")
@@ -1945,5 +2133,9 @@ class JukeboxApp(PlayerObserver, LibraryObserver):  # Define JukeboxApp class fo
 
 # Initialize and run the application
 if __name__ == "__main__":
+    library.start_watching()  # Pick up edits made to tracks.csv while the app is open
+    library.start_audio_scan()  # Time any new or changed audio files in the background
+    print(library.startup_report())
     app = JukeboxApp()
-    app.window.mainloop()
\ No newline at end of file
+    app.window.mainloop()
+    library.close()  # Write any pending library changes before exiting
\ No newline at end of file
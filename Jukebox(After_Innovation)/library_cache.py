@@ -0,0 +1,68 @@
+from collections import OrderedDict  # Import OrderedDict to keep entries in least recently used order
+from threading import Lock  # Import Lock so the UI and the file watcher can share the cache
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple  # Import necessary types for type hinting
+
+class ResultCache:
+    """
+    LRU cache of query results that tracks which library fields each result read
+
+    Every entry remembers the version of each field it depends on. A lookup is a hit
+    only while none of those fields changed since, so a play count change leaves cached
+    name searches valid and a search repeated after it costs one dictionary lookup.
+    """
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Tuple[Tuple[int, ...], Any]]' = OrderedDict()  # key -> (versions, result)
+        self._versions: Dict[str, int] = {}  # Field -> version at its last change
+        self._version = 0  # Bumped on every change, whatever it touched
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def version(self) -> int:
+        """Number of changes seen so far"""
+        return self._version
+
+    def invalidate(self, fields: Iterable[str] = ()) -> None:
+        """Record a change to fields; with no fields, every cached result becomes stale"""
+        with self._lock:
+            self._version += 1
+            fields = list(fields)
+            if fields:
+                for field in fields:
+                    self._versions[field] = self._version
+            else:
+                self._entries.clear()  # Unknown change: nothing cached can be trusted
+
+    def _stamp(self, fields: Tuple[str, ...]) -> Tuple[int, ...]:
+        return tuple(self._versions.get(field, 0) for field in fields)
+
+    def get(self, key: Hashable, fields: Tuple[str, ...], compute: Callable[[], Any]) -> Any:
+        """Get the cached result for key, or compute it when any of fields changed since it was stored"""
+        with self._lock:
+            stamp = self._stamp(fields)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        result = compute()  # Outside the lock: computing may take a while
+        with self._lock:
+            if self._stamp(fields) == stamp:  # Skip storing if a change arrived while computing
+                self._entries[key] = (stamp, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)  # Drop the least recently used result
+        return result
+
+    def clear(self) -> None:
+        """Forget every cached result"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters, the number of cached results and the current version"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'version': self._version}
@@ -0,0 +1,656 @@
+import bisect  # Import bisect to keep the prefix array sorted
+import heapq  # Import heapq for top-k selection of ranked matches
+import html  # Import html to decode entities such as &#39; in YouTube titles
+import re  # Import re for splitting text into tokens
+import unicodedata  # Import unicodedata to fold accents and diacritics
+from collections import Counter  # Import Counter to count shared trigrams per track
+from itertools import islice, takewhile  # Import islice and takewhile to cut pages out of an ordered walk
+from abc import ABC, abstractmethod  # Import abstract base class and abstract method decorators
+from threading import RLock  # Import RLock so the UI thread can query while another thread applies changes
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple  # Import necessary types for type hinting
+from library_item import Track  # Import the Track class the indexes read from
+
+_TOKEN_PATTERN = re.compile(r'\w+')  # Runs of letters and digits
+# Separators between a main artist and featured artists: "A, B", "A & B", "A feat. B", "A ft B", "A featuring B"
+_ARTIST_SEPARATORS = re.compile(r'\s*(?:,|&|\bfeat\b\.?|\bft\b\.?|\bfeaturing\b)\s*', re.IGNORECASE)
+
+# Title decorations that do not change the recording: "(Lyrics)", "[Official Music Video]", "(HD)"
+_DECORATION_WORDS = {
+    'lyrics', 'lyric', 'official', 'music', 'video', 'audio', 'mv', 'hd', 'hq', '4k', 'visualizer',
+    'visualiser', 'remaster', 'remastered', 'clip', 'explicit', 'clean', 'version'
+}
+_BRACKETED = re.compile(r'[\(\[]([^\)\]]*)[\)\]]')
+_FEATURING = re.compile(r'\b(?:feat|ft|featuring)\b\.?\s*', re.IGNORECASE)
+_CHANNEL_SUFFIX = re.compile(r'(?:vevo|\s+-\s+topic|\s+official)$', re.IGNORECASE)  # "SamSmithVEVO", "Adele - Topic"
+
+_CHUNK = 256  # Entries copied per lock hold when streaming an ordered index
+_BLOCK = 512  # Entries per block of a _SortedBlocks list; a block is split once it doubles
+_LAST_KEY = '\U0010ffff'  # Sorts after every track id string, for bisecting past an entry
+
+# Letters that carry their accent in the base character, so NFD decomposition leaves them alone
+_FOLD_TABLE = str.maketrans({'đ': 'd', 'Đ': 'd', 'ø': 'o', 'Ø': 'o', 'ł': 'l', 'Ł': 'l', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe'})
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+def fold_text(text: str) -> str:
+    """Lowercase text and strip accents and diacritics, so "TỪNG" becomes "tung" """
+    decomposed = unicodedata.normalize('NFD', text.translate(_FOLD_TABLE))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+def split_artists(artist: str) -> List[str]:
+    """Split an artist field into the individual artists it credits"""
+    return [part.strip() for part in _ARTIST_SEPARATORS.split(artist) if part.strip()]
+
+def artist_key(artist: str) -> str:
+    """Normalized form of one artist name, so spelling variants group together"""
+    return ' '.join(fold_text(artist).split())
+
+def _compact(text: str) -> str:
+    """Folded text with everything but letters and digits removed, so spacing and punctuation never matter"""
+    return ''.join(char for char in fold_text(text) if char.isalnum())
+
+def _strip_decorations(title: str, featured: List[str]) -> str:
+    """Remove decorative brackets from title, moving "(feat. X)" credits into featured"""
+    def replace(match) -> str:
+        content = match.group(1).strip()
+        feat = _FEATURING.match(content)
+        if feat:
+            featured.extend(split_artists(content[feat.end():].split(' - ')[0]))  # "(featuring Ke$ha - Official Video)"
+            return ' '
+        words = tokenize(fold_text(content))
+        if all(word in _DECORATION_WORDS or word.isdigit() for word in words):
+            return ' '  # Only decoration: "(Lyrics)", "[Official Video 2024]"
+        return match.group(0)  # "(Live)", "(Acoustic)" and the like are different recordings
+    title = _BRACKETED.sub(replace, title)
+    return title.split(' | ')[0]  # "Song - Artist | Show Name 2024"
+
+def duplicate_keys(name: str, artist: str) -> Set[Tuple[str, str]]:
+    """
+    Normalized (title, artist) keys of a track, one per credited artist
+
+    YouTube style titles are taken apart first: "Sam Smith, Kim Petras - Unholy (Official Music
+    Video)" by "SamSmithVEVO" gives the same keys as "Unholy" by "Sam Smith, Kim Petras". Two
+    tracks sharing any key are likely the same song.
+    """
+    featured: List[str] = []
+    title = _strip_decorations(html.unescape(name), featured)
+    if ' - ' in title:
+        credited, title = title.split(' - ', 1)  # "Artist - Title" uploads name the artists in the title
+        artists = split_artists(credited)
+    else:
+        artists = split_artists(_CHANNEL_SUFFIX.sub('', html.unescape(artist).strip()))
+    feat = _FEATURING.search(title)
+    if feat:
+        featured.extend(split_artists(title[feat.end():]))  # "Timber feat. Ke$ha"
+        title = title[:feat.start()]
+    words = title.split()
+    while len(words) > 1 and _compact(words[-1]) in _DECORATION_WORDS:
+        words.pop()  # Unbracketed "... Official MV"
+    title_key = _compact(' '.join(words))
+    if not title_key:
+        return set()
+    artist_keys = {_compact(credit) for credit in artists + featured} - {''}
+    return {(title_key, key) for key in artist_keys} or {(title_key, '')}
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """Trigrams of each folded word, padded so word starts and ends count too"""
+    grams = set()
+    for word in tokenize(fold_text(text)):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+class LibraryIndex(ABC):
+    """Secondary index over the library, kept up to date from library change events
+
+    An index is built the first time it is queried and then follows the
+    LibraryChangeEvents the library publishes. An event of None (everything may
+    have changed) drops the index so the next query rebuilds it.
+    """
+    fields: Set[str] = set()  # Track fields the index depends on
+
+    def __init__(self):
+        self._lock = RLock()
+        self._source: Optional[Mapping[str, Track]] = None  # The track mapping the index was built from
+
+    def ensure(self, tracks: Mapping[str, Track]) -> None:
+        """Build the index from tracks unless it already follows that mapping"""
+        with self._lock:
+            if self._source is not tracks:
+                self._clear()
+                for key, track in list(tracks.items()):  # Snapshot the items in case another thread reloads
+                    self._add(key, track)
+                self._source = tracks
+
+    def apply(self, event, tracks: Mapping[str, Track]) -> None:
+        """Apply a LibraryChangeEvent (or None) that tracks has already gone through"""
+        with self._lock:
+            if self._source is not tracks:
+                return  # Not built yet; ensure() builds it from the current tracks
+            if event is None:
+                self._source = None  # Rebuild on next use
+                return
+            for key in event.removed:
+                self._remove(key)
+            changed_keys = set(event.added)
+            changed_keys.update(key for key, fields in event.updated.items() if fields & self.fields)
+            for key in changed_keys:
+                self._remove(key)
+                track = tracks.get(key)
+                if track is not None:
+                    self._add(key, track)
+
+    @abstractmethod
+    def _clear(self) -> None:
+        pass  # Abstract method to drop every entry
+
+    @abstractmethod
+    def _add(self, key: str, track: Track) -> None:
+        pass  # Abstract method to index one track
+
+    @abstractmethod
+    def _remove(self, key: str) -> None:
+        pass  # Abstract method to forget one track (unknown keys are ignored)
+
+class TokenIndex(LibraryIndex):
+    """Inverted index from the word tokens of one text field to the tracks containing them"""
+    _MAX_EXPANSIONS = 1024  # Cached query token expansions
+
+    def __init__(self, field: str):
+        super().__init__()
+        self.field = field  # 'name' or 'artist'
+        self.fields = {field}
+        self._postings: Dict[str, Set[str]] = {}  # Token -> track ids
+        self._texts: Dict[str, str] = {}  # Track id -> lowercased field text, for the final substring check
+        self._vocabulary: Optional[List[str]] = None  # Sorted tokens, rebuilt after the token set changes
+        self._expansions: Dict[str, Set[str]] = {}  # Query token -> indexed tokens containing it
+
+    def _clear(self) -> None:
+        self._postings = {}
+        self._texts = {}
+        self._vocabulary = None
+        self._expansions = {}
+
+    def _add(self, key: str, track: Track) -> None:
+        text = getattr(track, self.field).lower()
+        self._texts[key] = text
+        for token in set(tokenize(text)):
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = postings = set()
+                self._vocabulary = None  # New token
+                self._expansions = {}
+            postings.add(key)
+
+    def _remove(self, key: str) -> None:
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        for token in set(tokenize(text)):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[token]
+                    self._vocabulary = None  # Token gone
+                    self._expansions = {}
+
+    def _matching_tokens(self, query_token: str) -> Set[str]:
+        """Indexed tokens that contain query_token (exact, prefix or infix)"""
+        expansion = self._expansions.get(query_token)
+        if expansion is None:
+            if self._vocabulary is None:
+                self._vocabulary = sorted(self._postings)
+            # Scanning the vocabulary is far cheaper than scanning every track: tokens repeat across tracks
+            expansion = {token for token in self._vocabulary if query_token in token}
+            if len(self._expansions) >= self._MAX_EXPANSIONS:
+                self._expansions = {}  # Keep the cache bounded while typing many different queries
+            self._expansions[query_token] = expansion
+        return expansion
+
+    def search(self, query: str) -> Set[str]:
+        """Track ids whose field contains query, ignoring case"""
+        query = query.lower()
+        with self._lock:
+            query_tokens = tokenize(query)
+            if not query_tokens:
+                # Nothing to look up (empty or punctuation only): fall back to a substring scan
+                return {key for key, text in self._texts.items() if query in text}
+            candidates: Optional[Set[str]] = None
+            # Intersect the posting lists, longest (usually rarest) query token first
+            for query_token in sorted(set(query_tokens), key=len, reverse=True):
+                matches: Set[str] = set()
+                for token in self._matching_tokens(query_token):
+                    matches |= self._postings[token]
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return set()
+            # Tokens only say each word occurs; check the query occurs as one substring
+            return {key for key in candidates if query in self._texts[key]}
+
+class TrigramIndex(LibraryIndex):
+    """Trigram index over the diacritic-folded text of one field, for typo-tolerant ranked search"""
+    def __init__(self, field: str):
+        super().__init__()
+        self.field = field  # 'name' or 'artist'
+        self.fields = {field}
+        self._postings: Dict[str, Set[str]] = {}  # Trigram -> track ids
+        self._grams: Dict[str, FrozenSet[str]] = {}  # Track id -> its trigrams
+
+    def _clear(self) -> None:
+        self._postings = {}
+        self._grams = {}
+
+    def _add(self, key: str, track: Track) -> None:
+        grams = trigrams(getattr(track, self.field))
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def _remove(self, key: str) -> None:
+        for gram in self._grams.pop(key, ()):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[gram]
+
+    def search(self, query: str, limit: int = 20, threshold: float = 0.5) -> List[Tuple[str, float]]:
+        """Best matching (track_id, score) pairs, highest score first
+
+        The score is the share of the query's trigrams found in the track (so a
+        short query can match a long title), with ties broken by overall similarity.
+        Tracks scoring below threshold are left out.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        with self._lock:
+            shared: Counter = Counter()
+            for gram in query_grams:
+                shared.update(self._postings.get(gram, ()))
+            scored = []
+            for key, hits in shared.items():
+                coverage = hits / len(query_grams)
+                if coverage >= threshold:
+                    similarity = hits / (len(query_grams) + len(self._grams[key]) - hits)
+                    scored.append((coverage, similarity, key))
+        best = heapq.nlargest(limit, scored)
+        return [(key, round(coverage, 3)) for coverage, _, key in best]
+
+class PrefixIndex(LibraryIndex):
+    """Sorted array of the folded word tokens of one field, for word-prefix lookups while typing"""
+    def __init__(self, field: str):
+        super().__init__()
+        self.field = field  # 'name' or 'artist'
+        self.fields = {field}
+        self._entries: List[Tuple[str, str]] = []  # Sorted (token, track_id) pairs
+        self._tokens: Dict[str, Tuple[str, ...]] = {}  # Track id -> its distinct folded tokens
+
+    def ensure(self, tracks: Mapping[str, Track]) -> None:
+        with self._lock:
+            if self._source is not tracks:
+                # Sort once instead of inserting every entry into the sorted array
+                self._tokens = {
+                    key: tuple(set(tokenize(fold_text(getattr(track, self.field)))))
+                    for key, track in list(tracks.items())
+                }
+                self._entries = sorted((token, key) for key, tokens in self._tokens.items() for token in tokens)
+                self._source = tracks
+
+    def _clear(self) -> None:
+        self._entries = []
+        self._tokens = {}
+
+    def _add(self, key: str, track: Track) -> None:
+        tokens = tuple(set(tokenize(fold_text(getattr(track, self.field)))))
+        self._tokens[key] = tokens
+        for token in tokens:
+            bisect.insort(self._entries, (token, key))
+
+    def _remove(self, key: str) -> None:
+        for token in self._tokens.pop(key, ()):
+            position = bisect.bisect_left(self._entries, (token, key))
+            if position < len(self._entries) and self._entries[position] == (token, key):
+                del self._entries[position]
+
+    def lookup(self, prefix: str) -> Set[str]:
+        """Track ids with a token starting with prefix (already folded)"""
+        with self._lock:
+            matches = set()
+            position = bisect.bisect_left(self._entries, (prefix, ''))
+            while position < len(self._entries) and self._entries[position][0].startswith(prefix):
+                matches.add(self._entries[position][1])
+                position += 1
+            return matches
+
+    def tokens(self, key: str) -> Tuple[str, ...]:
+        """Folded tokens of a track, empty for unknown tracks"""
+        return self._tokens.get(key, ())
+
+def prefix_matches(indexes: Iterable[PrefixIndex], query: str, within: Optional[Iterable[str]] = None) -> Set[str]:
+    """Track ids where every query word starts a word in one of the indexed fields
+
+    With within, only those track ids are checked (the results of a shorter
+    query), so each keystroke narrows the previous results instead of
+    looking every word up again.
+    """
+    indexes = list(indexes)
+    words = tokenize(fold_text(query))
+    if within is not None:
+        return {
+            key for key in within
+            if all(any(token.startswith(word) for index in indexes for token in index.tokens(key)) for word in words)
+        }
+    matches: Optional[Set[str]] = None
+    for word in sorted(set(words), key=len, reverse=True):  # Longest (usually rarest) word first
+        found: Set[str] = set()
+        for index in indexes:
+            found |= index.lookup(word)
+        matches = found if matches is None else matches & found
+        if not matches:
+            return set()
+    return matches if matches is not None else set()
+
+class _SortedBlocks:
+    """
+    Sorted list stored as a list of short sorted blocks
+
+    The block that holds an entry is found by a binary search over the last entry of
+    each block, and an insert or delete only shifts the entries of that one block, so
+    an update costs O(log n + _BLOCK) instead of the O(n) memmove of one flat list.
+    """
+    def __init__(self, entries: Iterable = ()):
+        entries = list(entries)  # Already in order
+        self._blocks: List[list] = [entries[i:i + _BLOCK] for i in range(0, len(entries), _BLOCK)]
+        self._maxes: list = [block[-1] for block in self._blocks]  # Last entry of each block
+
+    def add(self, entry) -> None:
+        if not self._blocks:
+            self._blocks.append([entry])
+            self._maxes.append(entry)
+            return
+        position = bisect.bisect_left(self._maxes, entry)
+        if position == len(self._blocks):
+            position -= 1  # Past every entry: append to the last block
+            self._blocks[position].append(entry)
+            self._maxes[position] = entry
+        else:
+            bisect.insort(self._blocks[position], entry)
+        block = self._blocks[position]
+        if len(block) > 2 * _BLOCK:
+            self._blocks[position:position + 1] = [block[:_BLOCK], block[_BLOCK:]]
+            self._maxes[position:position + 1] = [block[_BLOCK - 1], block[-1]]
+
+    def discard(self, entry) -> None:
+        position = bisect.bisect_left(self._maxes, entry)
+        if position == len(self._blocks):
+            return
+        block = self._blocks[position]
+        index = bisect.bisect_left(block, entry)
+        if block[index] != entry:
+            return
+        del block[index]
+        if block:
+            self._maxes[position] = block[-1]
+        else:
+            del self._blocks[position]
+            del self._maxes[position]
+
+    def iter_from(self, entry) -> Iterator:
+        """Entries >= entry in order; the caller holds the owner's lock while iterating"""
+        position = bisect.bisect_left(self._maxes, entry)
+        if position == len(self._blocks):
+            return
+        block = self._blocks[position]
+        yield from block[bisect.bisect_left(block, entry):]
+        for next_position in range(position + 1, len(self._blocks)):
+            yield from self._blocks[next_position]
+
+    def last_before(self, entry):
+        """The largest entry < entry, or None"""
+        position = bisect.bisect_left(self._maxes, entry)
+        if position < len(self._blocks):
+            block = self._blocks[position]
+            index = bisect.bisect_left(block, entry)
+            if index:
+                return block[index - 1]
+        return self._maxes[position - 1] if position else None
+
+    def last(self):
+        """The largest entry, or None when empty"""
+        return self._maxes[-1] if self._maxes else None
+
+class SortedIndex(LibraryIndex):
+    """Tracks kept ordered by a numeric field, so ordered pages need no sort
+
+    Entries live in a _SortedBlocks list: a change event moves a track in
+    O(log n + _BLOCK) time, and a page costs O(log n) plus its length.
+    """
+    def __init__(self, field: str):
+        super().__init__()
+        self.field = field  # 'play_count' or 'rating'
+        self.fields = {field}
+        self._entries = _SortedBlocks()  # Sorted (value, numeric id, track_id)
+        self._values: Dict[str, int] = {}  # Track id -> the value it is filed under
+
+    def ensure(self, tracks: Mapping[str, Track]) -> None:
+        with self._lock:
+            if self._source is not tracks:
+                self._values = {key: getattr(track, self.field) for key, track in list(tracks.items())}
+                self._entries = _SortedBlocks(sorted((value, int(key), key) for key, value in self._values.items()))
+                self._source = tracks
+
+    def _clear(self) -> None:
+        self._entries = _SortedBlocks()
+        self._values = {}
+
+    def _add(self, key: str, track: Track) -> None:
+        value = getattr(track, self.field)
+        self._values[key] = value
+        self._entries.add((value, int(key), key))  # Binary search for the block, then for the slot
+
+    def _remove(self, key: str) -> None:
+        value = self._values.pop(key, None)
+        if value is None:
+            return
+        self._entries.discard((value, int(key), key))
+
+    def _next_chunk(self, descending: bool, after: Optional[Tuple[int, int]]) -> List[Tuple[int, int, str]]:
+        """Up to _CHUNK entries that follow the (value, numeric id) position after, in walk order"""
+        entries = self._entries
+        if not descending:
+            start = () if after is None else (after[0], after[1], _LAST_KEY)  # () sorts before every entry
+            return list(islice(entries.iter_from(start), _CHUNK))
+        if after is None:
+            top = entries.last()
+            if top is None:
+                return []
+            value, start = top[0], (top[0],)
+        else:
+            value, start = after[0], (after[0], after[1], _LAST_KEY)
+        # Descending walks the groups of equal values from the top, each group in id order
+        while True:
+            group = takewhile(lambda entry: entry[0] == value, entries.iter_from(start))
+            chunk = list(islice(group, _CHUNK))
+            if chunk:
+                return chunk
+            below = entries.last_before((value,))
+            if below is None:
+                return []
+            value, start = below[0], (below[0],)
+
+    def iter_entries(self, descending: bool = True, after: Optional[Tuple[int, int]] = None) -> Iterator[Tuple[int, int, str]]:
+        """
+        Yield (value, numeric id, track_id) in sorted order, starting after the (value, numeric id) position
+
+        Equal values stay in id order either way. Entries are copied a chunk at a time, so
+        memory stays flat however far the caller reads, and changes made between chunks are
+        picked up instead of invalidating the walk.
+        """
+        while True:
+            with self._lock:
+                chunk = self._next_chunk(descending, after)
+            if not chunk:
+                return
+            yield from chunk
+            after = chunk[-1][:2]
+
+    def range(self, low: int, high: Optional[int] = None) -> Set[str]:
+        """Track ids with low <= value < high (no upper bound when high is None)"""
+        with self._lock:
+            entries = self._entries.iter_from((low,))
+            if high is not None:
+                entries = takewhile(lambda entry: entry[0] < high, entries)
+            return {entry[2] for entry in entries}
+
+    def page(self, descending: bool = True, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Track ids from position offset in sorted order, at most limit of them"""
+        stop = None if limit is None else offset + limit
+        return [entry[2] for entry in islice(self.iter_entries(descending), offset, stop)]
+
+class IdIndex(LibraryIndex):
+    """Track ids in numeric order, so listings can start at any id without sorting the library"""
+    fields: Set[str] = set()  # Ids never change; only adds and removes matter
+
+    def __init__(self):
+        super().__init__()
+        self._entries: List[Tuple[int, str]] = []  # Sorted (numeric id, track_id)
+
+    def ensure(self, tracks: Mapping[str, Track]) -> None:
+        with self._lock:
+            if self._source is not tracks:
+                self._entries = sorted((int(key), key) for key in list(tracks.keys()))
+                self._source = tracks
+
+    def _clear(self) -> None:
+        self._entries = []
+
+    def _add(self, key: str, track: Track) -> None:
+        bisect.insort(self._entries, (int(key), key))
+
+    def _remove(self, key: str) -> None:
+        entry = (int(key), key)
+        position = bisect.bisect_left(self._entries, entry)
+        if position < len(self._entries) and self._entries[position] == entry:
+            del self._entries[position]
+
+    def iter_keys(self, after: Optional[int] = None) -> Iterator[str]:
+        """Yield track ids in numeric order, starting after the numeric id after, a chunk at a time"""
+        while True:
+            with self._lock:
+                start = 0 if after is None else bisect.bisect_right(self._entries, (after, _LAST_KEY))
+                chunk = self._entries[start:start + _CHUNK]
+            if not chunk:
+                return
+            for _, key in chunk:
+                yield key
+            after = chunk[-1][0]
+
+class DuplicateIndex(LibraryIndex):
+    """Hash index from normalized (title, artist) keys to tracks, for spotting songs already in the library"""
+    fields = {'name', 'artist'}
+
+    def __init__(self):
+        super().__init__()
+        self._tracks: Dict[Tuple[str, str], Set[str]] = {}  # Key -> track ids filed under it
+        self._filed: Dict[str, Set[Tuple[str, str]]] = {}  # Track id -> its keys, for removal
+
+    def _clear(self) -> None:
+        self._tracks = {}
+        self._filed = {}
+
+    def _add(self, key: str, track: Track) -> None:
+        keys = duplicate_keys(track.name, track.artist)
+        for dup_key in keys:
+            self._tracks.setdefault(dup_key, set()).add(key)
+        self._filed[key] = keys
+
+    def _remove(self, key: str) -> None:
+        for dup_key in self._filed.pop(key, ()):
+            tracks = self._tracks[dup_key]
+            tracks.discard(key)
+            if not tracks:
+                del self._tracks[dup_key]
+
+    def find(self, name: str, artist: str) -> Set[str]:
+        """Track ids that share a normalized (title, artist) key with the given name and artist"""
+        matches: Set[str] = set()
+        with self._lock:
+            for dup_key in duplicate_keys(name, artist):
+                matches |= self._tracks.get(dup_key, set())
+        return matches
+
+class ArtistIndex(LibraryIndex):
+    """Artist -> track ids, with running play totals and ratings per artist
+
+    Artist fields are split into the individual artists they credit, so
+    "Sam Smith, Kim Petras" files the track under both artists.
+    """
+    fields = {'artist', 'play_count', 'rating'}
+
+    def __init__(self):
+        super().__init__()
+        self._names: Dict[str, str] = {}  # Artist key -> display name (first spelling seen)
+        self._tracks: Dict[str, Set[str]] = {}  # Artist key -> track ids
+        self._plays: Dict[str, int] = {}  # Artist key -> total plays of its tracks
+        self._rating_sums: Dict[str, int] = {}  # Artist key -> sum of its tracks' ratings
+        self._filed: Dict[str, Tuple[Tuple[str, ...], int, int]] = {}  # Track id -> (artist keys, plays, rating) as counted
+
+    def _clear(self) -> None:
+        self._names = {}
+        self._tracks = {}
+        self._plays = {}
+        self._rating_sums = {}
+        self._filed = {}
+
+    def _add(self, key: str, track: Track) -> None:
+        artist_keys = []
+        for artist in split_artists(track.artist):
+            artist_id = artist_key(artist)
+            if artist_id and artist_id not in artist_keys:
+                artist_keys.append(artist_id)
+                self._names.setdefault(artist_id, artist)
+        plays, rating = track.play_count, track.rating
+        for artist_id in artist_keys:
+            self._tracks.setdefault(artist_id, set()).add(key)
+            self._plays[artist_id] = self._plays.get(artist_id, 0) + plays
+            self._rating_sums[artist_id] = self._rating_sums.get(artist_id, 0) + rating
+        self._filed[key] = (tuple(artist_keys), plays, rating)
+
+    def _remove(self, key: str) -> None:
+        filed = self._filed.pop(key, None)
+        if filed is None:
+            return
+        artist_keys, plays, rating = filed
+        for artist_id in artist_keys:
+            tracks = self._tracks[artist_id]
+            tracks.discard(key)
+            if tracks:
+                self._plays[artist_id] -= plays
+                self._rating_sums[artist_id] -= rating
+            else:
+                # Last track of this artist is gone
+                del self._tracks[artist_id], self._plays[artist_id], self._rating_sums[artist_id], self._names[artist_id]
+
+    def artists(self) -> List[str]:
+        """Display names of every artist, alphabetically"""
+        with self._lock:
+            return sorted(self._names.values(), key=artist_key)
+
+    def track_ids(self, artist: str) -> Set[str]:
+        """Track ids crediting the artist (matched in normalized form)"""
+        with self._lock:
+            return set(self._tracks.get(artist_key(artist), ()))
+
+    def stats(self, artist: str) -> Optional[Tuple[str, int, int, float]]:
+        """(display name, track count, total plays, average rating) of an artist, or None"""
+        with self._lock:
+            artist_id = artist_key(artist)
+            tracks = self._tracks.get(artist_id)
+            if not tracks:
+                return None
+            return (self._names[artist_id], len(tracks), self._plays[artist_id],
+                    self._rating_sums[artist_id] / len(tracks))
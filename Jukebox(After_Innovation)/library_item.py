@@ -1,12 +1,29 @@
 from abc import ABC, abstractmethod  # Importing ABC and abstractmethod for creating abstract base classes
-import pygame  # Importing pygame for multimedia handling
-from threading import Thread  # Importing Thread for running tasks in parallel
+import importlib.util  # Importing importlib.util to defer loading pygame until playback is used
+import sys  # Importing sys to register the deferred module
 import os.path  # Importing os.path for file path manipulations
 import time  # Importing time for handling time-related functions
 from typing import Optional, Callable, List, Tuple  # Importing types for type hints
+from playback_scheduler import DeadlineScheduler  # Importing the scheduler that wakes playback only at deadlines
+
+def _lazy_import(name: str):
+    """Import a module that is only loaded the first time one of its attributes is used"""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+pygame = _lazy_import('pygame')  # Importing pygame for multimedia handling, loaded on first use
 
 class MediaItem(ABC):
     """Abstract base class for media items"""
+    __slots__ = ('_name', '_artist', '_rating', '_play_count', '_file_path')  # No per-instance __dict__
+
     def __init__(self, name: str, artist: str, rating: int = 0):
         self._name = name  # Initialize the name of the media item
         self._artist = artist  # Initialize the artist of the media item
@@ -18,10 +35,18 @@ class MediaItem(ABC):
     def name(self) -> str:
         return self._name  # Return the name of the media item
 
+    @name.setter
+    def name(self, value: str) -> None:
+        self._name = value  # Set the name of the media item
+
     @property
     def artist(self) -> str:
         return self._artist  # Return the artist of the media item
 
+    @artist.setter
+    def artist(self, value: str) -> None:
+        self._artist = value  # Set the artist of the media item
+
     @property
     def rating(self) -> int:
         return self._rating  # Return the rating of the media item
@@ -38,11 +63,15 @@ class MediaItem(ABC):
     def increment_play_count(self) -> None:
         self._play_count += 1  # Increment the play count by 1
 
+    def set_play_count(self, count: int) -> None:
+        if count >= 0:  # Ensure the play count is not negative
+            self._play_count = count  # Set a stored play count directly
+
     def info(self) -> str:
-        return f"{self._name} - {self._artist} {self.stars()}"  # Return a string with media item info
+        return f"{self.name} - {self.artist} {self.stars()}"  # Return a string with media item info
 
     def stars(self) -> str:
-        return "*" * self._rating  # Return a string of stars based on the rating
+        return "*" * self.rating  # Return a string of stars based on the rating
 
     def set_file_path(self, path: str) -> None:
         self._file_path = path  # Set the file path for the media item
@@ -52,6 +81,8 @@ class MediaItem(ABC):
 
 class Track(MediaItem):
     """Implementation of audio track"""
+    __slots__ = ()
+
     def __init__(self, name: str, artist: str, rating: int = 0):
         super().__init__(name, artist, rating)  # Call the parent constructor
 
@@ -75,6 +106,19 @@ class PlaybackStrategy(ABC):
     def get_initial_track(self, playlist: List[Tuple[str, str]]) -> int:
         pass  # Abstract method to get the initial track index
 
+    def peek_next(self, playlist: List[Tuple[str, str]], current_index: int, n: int = 1) -> List[int]:
+        """
+        Indexes of the next n tracks get_next_track will return, without advancing
+
+        The default walks get_next_track, which suits deterministic strategies;
+        strategies that draw at random must remember their draws so a peek comes true.
+        """
+        upcoming = []
+        for _ in range(n):
+            current_index = self.get_next_track(playlist, current_index)
+            upcoming.append(current_index)
+        return upcoming
+
 class SequentialPlaybackStrategy(PlaybackStrategy):
     """Plays tracks in sequential order"""
     def get_next_track(self, playlist: List[Tuple[str, str]], current_index: int) -> int:
@@ -85,33 +129,69 @@ class SequentialPlaybackStrategy(PlaybackStrategy):
 
 class RandomPlaybackStrategy(PlaybackStrategy):
     """Plays tracks in random order"""
-    def get_next_track(self, playlist: List[Tuple[str, str]], current_index: int) -> int:
+    def __init__(self):
+        self._upcoming: List[int] = []  # Draws already shown by peek_next, used up by get_next_track
+        self._upcoming_size = 0  # Playlist length the draws were made for
+
+    def _draws(self, playlist: List[Tuple[str, str]], n: int) -> List[int]:
+        """The next n random draws for this playlist, drawing more as needed"""
         import random  # Import random for generating random numbers
-        return random.randint(0, len(playlist) - 1)  # Return a random track index
+        if self._upcoming_size != len(playlist):
+            self._upcoming, self._upcoming_size = [], len(playlist)  # The playlist changed; old draws may not fit
+        while len(self._upcoming) < n:
+            self._upcoming.append(random.randint(0, len(playlist) - 1))
+        return self._upcoming
+
+    def get_next_track(self, playlist: List[Tuple[str, str]], current_index: int) -> int:
+        return self._draws(playlist, 1).pop(0)  # Return a random track index, the peeked one first
+
+    def peek_next(self, playlist: List[Tuple[str, str]], current_index: int, n: int = 1) -> List[int]:
+        return self._draws(playlist, n)[:n]
 
     def get_initial_track(self, playlist: List[Tuple[str, str]]) -> int:
         import random  # Import random for generating random numbers
         return random.randint(0, len(playlist) - 1)  # Return a random initial track index
 
 class MusicPlayer:
-    """Handles music playback functionality with improved OOP structure"""
+    """
+    Handles music playback functionality with improved OOP structure
+
+    One long-lived player thread owns the mixer. The public methods only queue a command
+    for it and return at once; the thread runs the commands one at a time, in the order
+    they were given, between the end of track and play count deadlines. State changes
+    happen only on that thread, so a burst of next/previous presses plays out in order.
+    """
+    STOPPED, PLAYING, PAUSED = "stopped", "playing", "paused"  # Player states
+    _PLAY_COUNT_SECONDS = 1.0  # Seconds a track must play before its play count goes up
+    _END_RECHECK = 0.05  # Seconds between checks once a track runs past its probed length
+    _UNKNOWN_LENGTH_CHECK = 1.0  # Seconds between end checks for tracks whose length is unknown
+    _PREFETCH_DELAY = 0.5  # Seconds a track plays before the next one is queued, so skipping through loads nothing extra
+
     def __init__(self, strategy: PlaybackStrategy = None):
         pygame.mixer.init()
+        self._state: str = self.STOPPED  # Changed only on the player thread
         self._current_track: Optional[str] = None
-        self._is_playing: bool = False
         self._current_playlist: list = []
-        self._playlist_thread: Optional[Thread] = None
-        self._current_position: float = 0
+        self._current_position: float = 0  # Seconds into the track when the mixer's get_pos() read 0
+        self._paused_position: float = 0  # Seconds into the track while paused or stopped
         self._track_length: float = 0
         self._track_index: int = 0
         self._played_duration: float = 0
         self._last_position_check: float = 0
         self._track_info_callback: Optional[Callable] = None
-        self._paused: bool = False
         self._volume: float = 0.7
         self._observers: List[PlayerObserver] = []
         self._strategy = strategy or SequentialPlaybackStrategy()
-        self._changing_track: bool = False
+        self._queued: Optional[Tuple[int, str, str]] = None  # (playlist index, track id, path) queued in the mixer
+        self._transition_gaps: List[float] = []  # Measured seconds of silence between consecutive playlist tracks
+        self._scheduler = DeadlineScheduler("music-player")  # The player thread: commands and deadlines
+        self._end_timer: Optional[int] = None  # Scheduler handle of the end of track check
+        self._count_timer: Optional[int] = None  # Scheduler handle of the play count deadline
+        self._prefetch_timer: Optional[int] = None  # Scheduler handle of queueing the next track
+        self._counted: bool = False  # Whether the current track's play was counted
+        self._expected_end: float = 0.0  # time.monotonic() at which the current track should run out
+        self._position_anchor: float = 0.0  # time.monotonic() at which the current track would have been at 0:00
+        self._end_event: Optional[int] = self._enable_end_event()  # pygame event type posted when a track finishes
 
     def add_observer(self, observer: PlayerObserver) -> None:
         self._observers.append(observer)  # Add an observer to the list
@@ -122,11 +202,11 @@ class MusicPlayer:
 
     def notify_observers(self, track_info: str = None) -> None:
         """Notify observers about state changes"""
-        for observer in self._observers:
+        for observer in list(self._observers):
             try:
                 if track_info:
                     observer.on_track_change(track_info)
-                observer.on_playback_state_change(self._is_playing)
+                observer.on_playback_state_change(self.is_playing)
             except Exception as e:
                 print(f"Error notifying observer: {e}")
 
@@ -146,40 +226,111 @@ class MusicPlayer:
             print(f"Error loading track: {e}")
             return None
 
-    def play_single_track(self, track_number: str) -> bool:
-        """Play a single track and handle the audio setup"""
-        track_path = self.load_track(track_number)
-        if not track_path:
-            return False
-
+    def _track_duration(self, track_id: str, track_path: str) -> float:
+        """Length of a track in seconds, probed once from its headers and remembered by the library"""
         try:
-            # Load track for length calculation
-            self._sound = pygame.mixer.Sound(track_path)
-            self._track_length = self._sound.get_length()
-            
-            # Load and play track
-            pygame.mixer.music.load(track_path)
-            pygame.mixer.music.play()
-            pygame.mixer.music.set_volume(self._volume)
-            
-            # Update state
-            self._current_track = track_number
-            self._current_position = 0.0
-            self._played_duration = 0.0
-            self._last_position_check = time.time()
-            self._is_playing = True
-            
-            # Start monitoring play duration for play count updates
-            self._monitor_play_duration()
-            
-            return True
-            
+            import track_library as lib
+            info = lib.library.get_audio_info(
+                str(track_id).zfill(2), track_path,
+                fallback=lambda path: pygame.mixer.Sound(path).get_length()  # Only for files the probe cannot read
+            )
+            return info.duration if info else 0.0
         except Exception as e:
-            print(f"Error playing track: {e}")
-            self._track_length = 0.0
-            self._sound = None
+            print(f"Error getting track length: {e}")
+            return 0.0
+
+    # Commands: queued for the player thread, they return at once
+
+    def _command(self, name: str, action: Callable[[], None]) -> None:
+        """Queue action for the player thread; a failure stops playback rather than leaving it half changed"""
+        def run():
+            try:
+                action()
+            except Exception as e:
+                print(f"Error {name}: {e}")
+                self._stop()
+        self._scheduler.submit(run)
+
+    def wait_idle(self, timeout: Optional[float] = 2.0) -> bool:
+        """Block until every command given so far has been carried out; False on timeout"""
+        return self._scheduler.flush(timeout)
+
+    def play_single_track(self, track_number: str) -> bool:
+        """Play a single track; False if its file cannot be found"""
+        if not self.load_track(track_number):
             return False
-    
+        self._command("playing track", lambda: self._start_track(track_number))
+        return True
+
+    def play_playlist(self, playlist: list) -> None:
+        """Play a playlist from the strategy's first track"""
+        if playlist:
+            self._command("playing playlist", lambda playlist=playlist.copy(): self._play_playlist(playlist))
+
+    def play_next(self) -> None:
+        """Play the next track in the playlist"""
+        self._command("playing next track", lambda: self._skip(forward=True))
+
+    def play_previous(self) -> None:
+        """Play the previous track in the playlist"""
+        self._command("playing previous track", lambda: self._skip(forward=False))
+
+    def toggle_playback(self) -> None:
+        """Toggle between play and pause"""
+        self._command("toggling playback", self._toggle)
+
+    def pause(self) -> None:
+        """Pause playback"""
+        self._command("pausing", self._pause)
+
+    def unpause(self) -> None:
+        """Resume paused playback"""
+        self._command("resuming", self._unpause)
+
+    def stop(self) -> None:
+        """Stop playback"""
+        self._command("stopping", self._stop)
+
+    def set_volume(self, volume: float) -> None:
+        """Set playback volume"""
+        self._volume = max(0.0, min(1.0, volume))  # Ensure volume is between 0.0 and 1.0
+        self._command("setting volume", lambda: pygame.mixer.music.set_volume(self._volume))
+
+    def seek_to_position(self, position: float) -> None:
+        """Seek to a specific position in the current track"""
+        self._command("seeking position", lambda: self._seek(position))
+
+    def set_strategy(self, strategy: PlaybackStrategy) -> None:
+        """Choose how the next track is picked, from the track after the one already queued"""
+        self._command("changing playback strategy", lambda: self._set_strategy(strategy))
+
+    # State, safe to read from any thread
+
+    @property
+    def state(self) -> str:
+        """STOPPED, PLAYING or PAUSED"""
+        return self._state
+
+    @property
+    def is_playing(self) -> bool:
+        return self._state == self.PLAYING  # Return the current playing state
+
+    @property
+    def current_track(self) -> Optional[str]:
+        return self._current_track  # Return the current track number
+
+    @property
+    def track_length(self) -> float:
+        """Length of the current track in seconds, 0 if unknown"""
+        return self._track_length
+
+    @property
+    def position(self) -> float:
+        """Seconds into the current track, estimated from the clock without touching the mixer"""
+        if self._state == self.PLAYING:
+            return max(time.monotonic() - self._position_anchor, 0.0)
+        return self._paused_position
+
     def _get_current_track_info(self) -> str:
         """Get formatted track info for current track with improved synchronization"""
         try:
@@ -201,89 +352,6 @@ class MusicPlayer:
             print(f"Error getting track info: {e}")
             return "Error getting track info"
 
-    def play_playlist(self, playlist: list) -> None:
-        if not playlist:
-            return
-            
-        self._current_playlist = playlist.copy()
-        self._track_index = self._strategy.get_initial_track(self._current_playlist)
-        self._paused = False
-        self._is_playing = True
-        self._current_position = 0.0
-        self._changing_track = False
-
-        def playlist_worker():
-            while self._is_playing and self._current_playlist:
-                try:
-                    if self._changing_track:
-                        time.sleep(0.1)
-                        continue
-
-                    current_track = self._current_playlist[self._track_index]
-                    track_id = current_track[0]
-                    self._current_track = track_id  # Update current track ID
-                    
-                    if self.play_single_track(track_id):
-                        # Update track info after successful play
-                        track_info = self._get_current_track_info()
-                        if self._track_info_callback:
-                            self._track_info_callback(track_info)
-                        self.notify_observers(track_info)
-                        
-                        while pygame.mixer.music.get_busy() or self._paused:
-                            if not self._is_playing or self._changing_track:
-                                pygame.mixer.music.stop()
-                                break
-                                
-                            if self._paused:
-                                time.sleep(0.1)
-                                continue
-                                
-                            time.sleep(0.1)
-                        
-                        # Only advance if we're still playing and not paused
-                        if self._is_playing and not self._changing_track:
-                            next_index = self._strategy.get_next_track(
-                                self._current_playlist,
-                                self._track_index
-                            )
-                            self._track_index = next_index
-                            # Reset positions for next track
-                            self._current_position = 0.0
-                            self._played_duration = 0.0
-                            continue
-                                
-                except Exception as e:
-                    print(f"Error in playlist worker: {e}")
-                    time.sleep(0.1)
-
-        # Stop existing playback
-        if self._playlist_thread and self._playlist_thread.is_alive():
-            self.stop()
-            time.sleep(0.1)
-
-        # Start new playlist thread
-        self._playlist_thread = Thread(target=playlist_worker)
-        self._playlist_thread.daemon = True
-        self._playlist_thread.start()
-
-    def _monitor_play_duration(self) -> None:
-        """Monitor track play duration for play count updates"""
-        def monitor():
-            while self._is_playing and (pygame.mixer.music.get_busy() or self._paused):  # Loop while playing or paused
-                if not self._paused:  # Check if not paused
-                    current_time = time.time()  # Get the current time
-                    elapsed = current_time - self._last_position_check  # Calculate elapsed time
-                    self._played_duration += elapsed  # Update played duration
-                    self._last_position_check = current_time  # Update last position check time
-                    
-                    if self._played_duration >= 1 and self._current_track:  # Check if at least 1 second has played
-                        import track_library as lib  # Import track library for updating play count
-                        lib.library.increment_play_count(str(self._current_track).zfill(2))  # Increment play count
-                        break  # Exit the monitor loop
-                time.sleep(0.1)  # Sleep briefly to avoid busy waiting
-        Thread(target=monitor, daemon=True).start()  # Start the monitor thread
-
     def _update_track_info(self) -> None:
         """Update track info display"""
         if self._track_info_callback:
@@ -294,168 +362,127 @@ class MusicPlayer:
             except Exception as e:
                 print(f"Error updating track info display: {e}")
 
-    def play_previous(self) -> None:
-        """Play the previous track in the playlist"""
-        if not self._current_playlist or self._changing_track:
-            return
-        
-        # Prevent multiple track changes    
-        self._changing_track = True
-        
-        try:
-            # Stop current playback
-            pygame.mixer.music.stop()
-            
-            # Calculate previous index BEFORE playing
-            prev_index = (self._track_index - 1) if self._track_index > 0 else len(self._current_playlist) - 1
-            self._track_index = prev_index
-            
-            # Get track info
-            track_id = self._current_playlist[self._track_index][0]
-            
-            # Reset states
-            self._current_position = 0.0
-            self._played_duration = 0.0
-            self._is_playing = True
-            self._paused = False
-            self._current_track = track_id
-            
-            # Load and play track
-            track_path = self.load_track(track_id)
-            if track_path:
-                # Load track for length calculation
-                self._sound = pygame.mixer.Sound(track_path)
-                self._track_length = self._sound.get_length()
-                
-                # Load and play track
-                pygame.mixer.music.load(track_path)
-                pygame.mixer.music.play()
-                pygame.mixer.music.set_volume(self._volume)
-                
-                # Update track info and notify observers
-                track_info = self._get_current_track_info()
-                if self._track_info_callback:
-                    self._track_info_callback(track_info)
-                self.notify_observers(track_info)
-                
-        except Exception as e:
-            print(f"Error playing previous track: {e}")
-            self._is_playing = False
-            self._paused = False
-        finally:
-            self._changing_track = False
+    def gap_report(self) -> str:
+        """Summary of the measured gaps between tracks"""
+        if not self._transition_gaps:
+            return "No track transitions measured yet"
+        gaps = self._transition_gaps
+        return (f"{len(gaps)} track transitions, average gap {sum(gaps) / len(gaps) * 1000:.0f} ms, "
+                f"worst {max(gaps) * 1000:.0f} ms")
 
-    def play_next(self) -> None:
-        """Play the next track in the playlist"""
-        if not self._current_playlist or self._changing_track:
-            return
+    # Everything below runs on the player thread
+
+    def _start_track(self, track_number: str) -> bool:
+        """Load a track into the mixer and play it from the start"""
+        track_path = self.load_track(track_number)
+        if not track_path:
+            return False
 
-        # Prevent multiple track changes
-        self._changing_track = True
-        
         try:
-            # Stop current playback
-            pygame.mixer.music.stop()
-            
-            # Calculate next index BEFORE playing
-            next_index = self._strategy.get_next_track(
-                self._current_playlist, 
-                self._track_index
-            )
-            self._track_index = next_index
+            # Length from the library's probed metadata; the file is not decoded
+            self._track_length = self._track_duration(track_number, track_path)
             
-            # Get track info
-            track_id = self._current_playlist[self._track_index][0]
+            # Load and play track
+            self._cancel_deadlines()
+            self._queued = None  # Loading drops whatever was queued
+            pygame.mixer.music.load(track_path)
+            pygame.mixer.music.play()
+            pygame.mixer.music.set_volume(self._volume)
             
-            # Reset states
+            # Update state
+            self._current_track = track_number
             self._current_position = 0.0
             self._played_duration = 0.0
-            self._is_playing = True
-            self._paused = False
-            self._current_track = track_id
+            self._counted = False
+            self._state = self.PLAYING
+            
+            # Wake up again only when the play count threshold or the end of the track is due
+            self._track_started()
+            
+            return True
             
-            # Load and play track
-            track_path = self.load_track(track_id)
-            if track_path:
-                # Load track for length calculation
-                self._sound = pygame.mixer.Sound(track_path)
-                self._track_length = self._sound.get_length()
-                
-                # Load and play track
-                pygame.mixer.music.load(track_path)
-                pygame.mixer.music.play()
-                pygame.mixer.music.set_volume(self._volume)
-                
-                # Update track info and notify observers
-                track_info = self._get_current_track_info()
-                if self._track_info_callback:
-                    self._track_info_callback(track_info)
-                self.notify_observers(track_info)
-                
         except Exception as e:
-            print(f"Error playing next track: {e}")
-            self._is_playing = False
-            self._paused = False
-        finally:
-            self._changing_track = False
-
-    @property
-    def is_playing(self) -> bool:
-        return self._is_playing  # Return the current playing state
-
-    @property
-    def current_track(self) -> Optional[str]:
-        return self._current_track  # Return the current track number
+            print(f"Error playing track: {e}")
+            self._track_length = 0.0
+            return False
 
-    def toggle_playback(self) -> None:
-        """Toggle between play and pause"""
-        if self._is_playing:  # Check if currently playing
-            self.pause()  # Call pause method
+    def _play_index(self, index: int) -> bool:
+        """Start the playlist entry at index and show it"""
+        self._track_index = index
+        track_id = self._current_playlist[index][0]
+        self._current_track = track_id
+        if not self._start_track(track_id):
+            return False
+        track_info = self._get_current_track_info()
+        if self._track_info_callback:
+            self._track_info_callback(track_info)
+        self.notify_observers(track_info)
+        return True
+
+    def _play_from(self, index: int) -> bool:
+        """Start the playlist at index, skipping entries whose file is missing; stops if none can play"""
+        for _ in range(len(self._current_playlist)):
+            if self._play_index(index):
+                return True
+            print(f"Skipping track {self._current_playlist[index][0]}: file not found")
+            index = self._strategy.get_next_track(self._current_playlist, index)
+        self._stop()
+        return False
+
+    def _play_playlist(self, playlist: list) -> None:
+        self._current_playlist = playlist
+        self._play_from(self._strategy.get_initial_track(self._current_playlist))
+
+    def _skip(self, forward: bool) -> None:
+        """Move to the next or previous playlist track, whatever the current state"""
+        if not self._current_playlist:
+            return
+        if forward:
+            index = self._strategy.get_next_track(self._current_playlist, self._track_index)
         else:
-            self.unpause()  # Call unpause method
-
-    def stop_playback(self) -> None:
-        """Stop playback"""
-        self.stop()  # Call stop method
-        self.progress_scale.set(0)  # Reset progress scale to 0
-        self.time_label.configure(text="0:00 / 0:00")  # Reset time label display
-        self.track_info.configure(text="No track playing")  # Update track info display
-        # Reset track index to start of playlist
-        self.player._track_index = 0  # Reset track index to 0
-
-    def pause(self) -> None:
-        """Pause playback with improved state handling"""
-        if self._is_playing and not self._paused:  # Check if currently playing and not already paused
-            pygame.mixer.music.pause()  # Pause the music playback
-            self._paused = True  # Set paused state to True
-            self._is_playing = False  # Set playing state to False
-            # Store current position when pausing
-            pos = pygame.mixer.music.get_pos() / 1000.0  # Get the current position in seconds
-            self._current_position += pos  # Update current position with paused position
-
-    def unpause(self) -> None:
-        """Resume playback with improved state handling"""
-        if self._paused:  # Reload and seek to the stored position
-            if self._current_track:  # Check if there is a current track
-                track_path = self.load_track(self._current_track)  # Load the current track
-                if track_path:  # If the track path is valid
-                    pygame.mixer.music.load(track_path)  # Load the track into the mixer
-                    pygame.mixer.music.play(start=self._current_position)  # Start playing from the stored position
-                    pygame.mixer.music.set_volume(self._volume)  # Set the volume level
-            
-            self._paused = False  # Set paused state to False
-            self._is_playing = True  # Set playing state to True
-            self._last_position_check = time.time()  # Record the last position check time
-            self.notify_observers()  # Notify observers of state change
+            index = (self._track_index - 1) if self._track_index > 0 else len(self._current_playlist) - 1
+        self._play_from(index)
+
+    def _set_strategy(self, strategy: PlaybackStrategy) -> None:
+        self._strategy = strategy
+        if self._queued is not None:
+            # The queued track was peeked from the old strategy: queue the new one's choice in its place
+            self._prefetch_next()
+
+    def _toggle(self) -> None:
+        if self._state == self.PLAYING:
+            self._pause()
+        elif self._state == self.PAUSED:
+            self._unpause()
+
+    def _pause(self) -> None:
+        if self._state != self.PLAYING:
+            return
+        pygame.mixer.music.pause()  # Pause the music playback; the stream stays loaded
+        self._cancel_deadlines()  # Nothing is due while paused
+        self._accumulate_played()  # Count the time played up to the pause
+        self._paused_position = self._position()  # Store current position when pausing
+        self._state = self.PAUSED
+        self.notify_observers()
+
+    def _unpause(self) -> None:
+        if self._state != self.PAUSED:
+            return
+        pygame.mixer.music.unpause()  # Carry on from the paused sample; no reload, and the queued track stays
+        self._state = self.PLAYING
+        self._track_started()  # Re-arm the deadlines from the resumed position
+        self.notify_observers()  # Notify observers of state change
 
-    def stop(self) -> None:
-        """Stop playback"""
+    def _stop(self) -> None:
+        self._cancel_deadlines()  # Nothing is due once stopped
         pygame.mixer.music.stop()  # Stop the music playback
-        self._is_playing = False  # Set playing state to False
-        self._paused = False  # Set paused state to False
+        self._drain_end_events()  # Stopping posts an end event; it is not a finished track
+        self._queued = None  # Stopping also empties the mixer's queue
+        self._state = self.STOPPED
         self._current_playlist = []  # Clear the current playlist
         self._played_duration = 0  # Reset played duration
         self._current_position = 0  # Reset current position
+        self._paused_position = 0
         self._track_length = 0  # Reset track length
         if self._track_info_callback:  # Check if track info callback is set
             self._track_info_callback("No track playing")  # Update track info display
@@ -463,24 +490,208 @@ class MusicPlayer:
         # Notify observers about the state change
         self.notify_observers()  # Notify observers of playback stop
 
-    def set_volume(self, volume: float) -> None:
-        """Set playback volume"""
-        self._volume = max(0.0, min(1.0, volume))  # Ensure volume is between 0.0 and 1.0
-        pygame.mixer.music.set_volume(self._volume)  # Set the volume level in the mixer
+    def _seek(self, position: float) -> None:
+        if self._state == self.STOPPED or not self._current_track:
+            return
+        if self._track_length > 0:
+            position = min(position, self._track_length)
+        position = max(position, 0.0)
+        if self._state == self.PLAYING:
+            self._accumulate_played()  # Time played before the jump still counts
+        try:
+            # Jump within the already loaded stream: no file access and no restart of decoding
+            pygame.mixer.music.set_pos(position)
+            # get_pos() keeps counting from play(), so move the offset added to it instead
+            self._current_position = position - max(pygame.mixer.music.get_pos(), 0) / 1000.0
+        except pygame.error as e:
+            print(f"Seeking within the stream failed, reloading the track: {e}")
+            if not self._reload_at(position):
+                return
+        self._paused_position = position
+        if self._state == self.PLAYING:
+            self._track_started()  # The end of the track moved
+
+    def _reload_at(self, position: float) -> bool:
+        """Load the current track again and start it at position, for codecs that cannot seek in place"""
+        track_path = self.load_track(self._current_track)  # Load the current track
+        if not track_path:  # If the track path is not valid
+            return False
+        self._queued = None  # Loading drops whatever was queued
+        pygame.mixer.music.load(track_path)  # Load the track into the mixer
+        pygame.mixer.music.play(start=position)  # Start playing from the new position
+        pygame.mixer.music.set_volume(self._volume)  # Set the volume level
+        if self._state == self.PAUSED:
+            pygame.mixer.music.pause()  # Stay paused at the new position
+        self._current_position = position
+        return True
+
+    def _prefetch_next(self) -> None:
+        """Resolve the track after the current one and queue it in the mixer, so it follows without a gap"""
+        self._prefetch_timer = None
+        self._queued = None
+        if not self._current_playlist or self._state != self.PLAYING:
+            return
+        try:
+            next_index = self._strategy.peek_next(self._current_playlist, self._track_index, 1)[0]
+            track_id = self._current_playlist[next_index][0]
+            track_path = self.load_track(track_id)  # Resolve and stat the file now, not when the song ends
+            if not track_path:
+                return
+            self._track_duration(track_id, track_path)  # Probe its length ahead of time
+            with open(track_path, 'rb') as file:
+                file.read(64 * 1024)  # Open the file early so its start is in the OS cache
+            pygame.mixer.music.queue(track_path)
+            self._queued = (next_index, track_id, track_path)
+        except Exception as e:
+            print(f"Error prefetching next track: {e}")
+            self._queued = None
+
+    def _start_queued_track(self, previous_end: float) -> None:
+        """Take over the queued track the mixer has just switched to"""
+        next_index, track_id, track_path = self._queued
+        self._queued = None
+        self._strategy.get_next_track(self._current_playlist, self._track_index)  # Use up the peeked choice
+        started_at = time.monotonic() - max(pygame.mixer.music.get_pos(), 0) / 1000.0
+        self._record_gap(started_at - previous_end)
+        self._track_index = next_index
+        self._current_track = track_id
+        self._track_length = self._track_duration(track_id, track_path)
+        self._current_position = 0.0
+        self._played_duration = time.monotonic() - started_at
+        self._last_position_check = time.monotonic()
+        self._counted = False
+        track_info = self._get_current_track_info()
+        if self._track_info_callback:
+            self._track_info_callback(track_info)
+        self.notify_observers(track_info)
+        self._schedule_deadlines()
+
+    def _record_gap(self, gap: float) -> None:
+        """Remember the silence measured between two tracks"""
+        gap = max(gap, 0.0)
+        self._transition_gaps.append(gap)
+        del self._transition_gaps[:-100]  # Keep the most recent transitions
+        print(f"Track transition gap: {gap * 1000:.0f} ms")
+
+    def _enable_end_event(self) -> Optional[int]:
+        """Have the mixer post an event when a track finishes; None when pygame's event queue is unavailable"""
+        try:
+            if not pygame.display.get_init():
+                # pygame only delivers events once the display module is up. The app draws with Tk, so
+                # bring it up on SDL's dummy video driver: no window and no second connection to the
+                # window system next to Tk's. A driver already chosen in SDL_VIDEODRIVER is kept.
+                driver = os.environ.get('SDL_VIDEODRIVER')
+                if driver is None:
+                    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+                try:
+                    pygame.display.init()
+                finally:
+                    if driver is None:
+                        del os.environ['SDL_VIDEODRIVER']  # Read at init only, so leave the environment as it was
+            event_type = pygame.USEREVENT + 1
+            pygame.mixer.music.set_endevent(event_type)
+            return event_type
+        except Exception as e:
+            print(f"Track end events unavailable, checking the mixer at each deadline instead: {e}")
+            return None
 
-    def seek_to_position(self, position: float) -> None:
-        """Seek to a specific position in the current track"""
-        if self._is_playing and self._current_track:  # Check if currently playing and there is a current track
-            try:
-                # Store the target position
-                self._current_position = position  # Update current position to the target position
-                
-                # Reload and play the track from the new position
-                track_path = self.load_track(self._current_track)  # Load the current track
-                if track_path:  # If the track path is valid
-                    pygame.mixer.music.load(track_path)  # Load the track into the mixer
-                    pygame.mixer.music.play(start=position)  # Start playing from the new position
-                    pygame.mixer.music.set_volume(self._volume)  # Set the volume level
-                    
-            except Exception as e:
-                print(f"Error seeking position: {e}")  # Print error message if an exception occurs
\ No newline at end of file
+    def _drain_end_events(self) -> bool:
+        """Take the pending end of track events; True if there were any"""
+        if self._end_event is None:
+            return False
+        try:
+            # pump=False only reads events already posted, which is safe from any thread
+            return bool(pygame.event.get(eventtype=self._end_event, pump=False))
+        except Exception as e:
+            print(f"Error reading track end events: {e}")
+            self._end_event = None
+            return False
+
+    def _position(self) -> float:
+        """Seconds into the current track, from the mixer"""
+        return self._current_position + max(pygame.mixer.music.get_pos(), 0) / 1000.0
+
+    def _track_finished(self) -> bool:
+        """Whether the mixer finished the current track, going silent or moving on to the queued one"""
+        if self._end_event is not None:
+            return self._drain_end_events() or not pygame.mixer.music.get_busy()
+        if not pygame.mixer.music.get_busy():
+            return True
+        # Without end events: a position well behind the clock means the queued track started over from zero
+        return self._queued is not None and self._position() < time.monotonic() - self._position_anchor - 0.5
+
+    def _cancel_deadlines(self) -> None:
+        """Forget the end of track, play count and prefetch deadlines"""
+        for handle in (self._end_timer, self._count_timer, self._prefetch_timer):
+            self._scheduler.cancel(handle)
+        self._end_timer = self._count_timer = self._prefetch_timer = None
+
+    def _accumulate_played(self) -> None:
+        """Add the time played since the last check to the current track's played duration"""
+        now = time.monotonic()
+        self._played_duration += now - self._last_position_check
+        self._last_position_check = now
+
+    def _schedule_deadlines(self) -> None:
+        """Arm the play count, prefetch and end of track deadlines from the current position"""
+        self._cancel_deadlines()
+        if self._state != self.PLAYING:
+            return
+        position = self._position()
+        self._position_anchor = time.monotonic() - position
+        if not self._counted:
+            self._count_timer = self._scheduler.call_later(
+                self._PLAY_COUNT_SECONDS - self._played_duration, self._count_play)
+        if self._track_length > 0:
+            remaining = max(self._track_length - position, 0.0)
+            self._expected_end = time.monotonic() + remaining
+            self._end_timer = self._scheduler.call_later(remaining, self._on_track_end_due)
+        else:
+            remaining = self._UNKNOWN_LENGTH_CHECK
+            self._expected_end = 0.0
+            self._end_timer = self._scheduler.call_later(self._UNKNOWN_LENGTH_CHECK, self._on_track_end_due)
+        if self._queued is None and self._current_playlist:
+            self._prefetch_timer = self._scheduler.call_later(
+                min(self._PREFETCH_DELAY, remaining / 2), self._prefetch_next)
+
+    def _track_started(self) -> None:
+        """Arm the deadlines for a track the mixer has just (re)started"""
+        self._drain_end_events()  # Stopping or replacing the previous track may have posted one
+        self._last_position_check = time.monotonic()
+        self._schedule_deadlines()
+
+    def _count_play(self) -> None:
+        """Play count deadline: count the play once the track has played long enough"""
+        self._count_timer = None
+        if self._counted or not self._current_track or self._state != self.PLAYING:
+            return
+        self._accumulate_played()
+        if self._played_duration < self._PLAY_COUNT_SECONDS:
+            self._count_timer = self._scheduler.call_later(
+                self._PLAY_COUNT_SECONDS - self._played_duration, self._count_play)
+            return
+        self._counted = True
+        import track_library as lib  # Import track library for updating play count
+        lib.library.increment_play_count(str(self._current_track).zfill(2))
+
+    def _on_track_end_due(self) -> None:
+        """End of track deadline: confirm the track ended and move on"""
+        self._end_timer = None
+        if self._state != self.PLAYING:
+            return
+        if not self._track_finished():
+            # Probed lengths can be a little short, so look again shortly
+            delay = self._END_RECHECK if self._track_length > 0 else self._UNKNOWN_LENGTH_CHECK
+            self._end_timer = self._scheduler.call_later(delay, self._on_track_end_due)
+            return
+        previous_end = min(self._expected_end, time.monotonic()) if self._expected_end else time.monotonic()
+        if self._queued is not None and pygame.mixer.music.get_busy():
+            self._start_queued_track(previous_end)  # The mixer already moved on without a gap
+        elif self._current_playlist:
+            next_index = self._strategy.get_next_track(self._current_playlist, self._track_index)
+            if self._play_from(next_index):
+                self._record_gap(time.monotonic() - previous_end)  # Track was started after the last one ended
+        else:
+            self._cancel_deadlines()
+            self._state = self.STOPPED  # A single track ran out
+            self.notify_observers()
@@ -0,0 +1,125 @@
+import re  # Import re for tokenizing query text
+import shlex  # Import shlex so quoted values like artist:"sam smith" stay together
+from functools import lru_cache  # Import lru_cache so each distinct query text is compiled once
+from typing import Callable, List, Optional, Tuple  # Import necessary types for type hinting
+
+class QuerySyntaxError(ValueError):
+    """Raised when a library query cannot be parsed"""
+    pass
+
+# Field names accepted in queries -> track field
+TEXT_FIELDS = {'name': 'name', 'title': 'name', 'track': 'name', 'artist': 'artist'}
+NUMBER_FIELDS = {'rating': 'rating', 'plays': 'play_count', 'play_count': 'play_count', 'id': 'track_id'}
+SORT_FIELDS = {**TEXT_FIELDS, **NUMBER_FIELDS}
+
+_CONDITION = re.compile(r'^([a-z_]+)(<=|>=|!=|=|<|>|:)(.*)$', re.IGNORECASE)
+
+# Row layout used by predicates: (track_id, name, artist, rating, play_count)
+_ROW_POSITIONS = {'track_id': 0, 'name': 1, 'artist': 2, 'rating': 3, 'play_count': 4}
+
+class CompiledQuery:
+    """A parsed query: text matches, numeric bounds, leftover predicates, order and limit"""
+    def __init__(self, source: str):
+        self.source = source
+        self.text_terms: List[Tuple[Tuple[str, ...], str]] = []  # (fields, text); any field may contain the text
+        self.ranges: List[Tuple[str, int, Optional[int]]] = []  # (field, low, high) with low <= value < high
+        self.excluded: List[Tuple[str, int]] = []  # (field, value) for != conditions
+        self.sort_field: Optional[str] = None
+        self.descending = False
+        self.limit: Optional[int] = None
+        self.offset = 0
+
+    @property
+    def fields(self) -> set:
+        """Track fields the result depends on (for refreshing views that show it)"""
+        used = {field for fields, _ in self.text_terms for field in fields}
+        used.update(field for field, _, _ in self.ranges)
+        used.update(field for field, _ in self.excluded)
+        if self.sort_field:
+            used.add(self.sort_field)
+        used.discard('track_id')
+        return used
+
+    def predicate(self) -> Callable[[tuple], bool]:
+        """Predicate over (track_id, name, artist, rating, play_count) rows checking every condition"""
+        checks = []
+        for fields, text in self.text_terms:
+            positions = [_ROW_POSITIONS[field] for field in fields]
+            checks.append(lambda row, positions=positions, text=text: any(text in row[p].lower() for p in positions))
+        for field, low, high in self.ranges:
+            position = _ROW_POSITIONS[field]
+            if field == 'track_id':
+                checks.append(lambda row, low=low, high=high: low <= int(row[0]) and (high is None or int(row[0]) < high))
+            else:
+                checks.append(lambda row, p=position, low=low, high=high: low <= row[p] and (high is None or row[p] < high))
+        for field, value in self.excluded:
+            position = _ROW_POSITIONS[field]
+            if field == 'track_id':
+                checks.append(lambda row, value=value: int(row[0]) != value)
+            else:
+                checks.append(lambda row, p=position, value=value: row[p] != value)
+        return lambda row: all(check(row) for check in checks)
+
+def _number(text: str, term: str) -> int:
+    try:
+        return int(text)
+    except ValueError:
+        raise QuerySyntaxError(f"Expected a whole number in '{term}'")
+
+@lru_cache(maxsize=256)
+def compile_query(source: str) -> CompiledQuery:
+    """
+    Parse a query such as: artist:adele rating>=4 plays<10 sort:-plays limit:20
+
+    Terms:
+        word                   name or artist contains word
+        name:text artist:text  that field contains text (quote text with spaces)
+        rating/plays/id OP n   OP is one of = : != < <= > >=
+        sort:field sort:-field order by a field, '-' for descending
+        limit:n offset:n       page of the ordered results
+    """
+    try:
+        terms = shlex.split(source)
+    except ValueError as e:
+        raise QuerySyntaxError(f"Unbalanced quotes in query: {e}")
+    query = CompiledQuery(source)
+    for term in terms:
+        match = _CONDITION.match(term)
+        if not match:
+            query.text_terms.append((('name', 'artist'), term.lower()))  # Bare word: search both fields
+            continue
+        key, operator, value = match.group(1).lower(), match.group(2), match.group(3)
+        if key in ('sort', 'order') and operator in (':', '='):
+            descending = value.startswith('-')
+            field = SORT_FIELDS.get(value.lstrip('+-').lower())
+            if field is None:
+                raise QuerySyntaxError(f"Cannot sort by '{value.lstrip('+-')}'")
+            query.sort_field, query.descending = field, descending
+        elif key in ('limit', 'offset') and operator in (':', '='):
+            number = _number(value, term)
+            if number < 0:
+                raise QuerySyntaxError(f"'{term}' must not be negative")
+            if key == 'limit':
+                query.limit = number
+            else:
+                query.offset = number
+        elif key in TEXT_FIELDS:
+            if operator not in (':', '='):
+                raise QuerySyntaxError(f"'{key}' only supports ':' matching")
+            if value:
+                query.text_terms.append(((TEXT_FIELDS[key],), value.lower()))
+        elif key in NUMBER_FIELDS:
+            field, number = NUMBER_FIELDS[key], _number(value, term)
+            if operator == '!=':
+                query.excluded.append((field, number))
+            else:
+                # Turn every comparison into a half-open range low <= value < high
+                low, high = {
+                    ':': (number, number + 1), '=': (number, number + 1),
+                    '<': (0, number), '<=': (0, number + 1),
+                    '>': (number + 1, None), '>=': (number, None),
+                }[operator]
+                query.ranges.append((field, max(low, 0), high))
+        else:
+            raise QuerySyntaxError(f"Unknown field '{key}'")
+    return query
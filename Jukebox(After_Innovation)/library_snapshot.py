@@ -0,0 +1,90 @@
+import hashlib  # Import hashlib for the digest of the CSV contents
+import mmap  # Import mmap to read the snapshot without copying it into memory first
+import os  # Import OS module for file stats and atomic replace
+import struct  # Import struct for the fixed-width binary layout
+from typing import Iterable, List, Optional, Tuple  # Import necessary types for type hinting
+
+# Snapshot layout (little endian):
+#   header: magic (4s), version (H), reserved (H), CSV mtime in ns (Q), CSV size (Q),
+#           BLAKE2b digest of the CSV contents (16s), track count (I)
+#   each track: rating (B), play count (I), then track_id, name and artist
+#   as length-prefixed UTF-8 strings (H length followed by the bytes)
+SNAPSHOT_MAGIC = b'JKBX'
+SNAPSHOT_VERSION = 2
+_HEADER = struct.Struct('<4sHHQQ16sI')
+_DIGEST_SIZE = 16
+_CHUNK_SIZE = 1 << 20
+_NUMBERS = struct.Struct('<BI')
+_LENGTH = struct.Struct('<H')
+
+SnapshotRow = Tuple[str, str, str, int, int]  # (track_id, name, artist, rating, play_count)
+
+def _csv_digest(csv_file: str) -> bytes:
+    """Digest of the CSV contents; hashing is far cheaper than parsing it"""
+    digest = hashlib.blake2b(digest_size=_DIGEST_SIZE)
+    with open(csv_file, 'rb') as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def write_snapshot(snapshot_file: str, csv_file: str, rows: Iterable[SnapshotRow]) -> bool:
+    """Write rows as a snapshot of csv_file, stamped with the CSV's current mtime, size and digest"""
+    try:
+        stat = os.stat(csv_file)
+        csv_digest = _csv_digest(csv_file)
+        body = bytearray()
+        count = 0
+        for track_id, name, artist, rating, play_count in rows:
+            body += _NUMBERS.pack(rating, play_count)
+            for text in (track_id, name, artist):
+                data = text.encode('utf-8')
+                body += _LENGTH.pack(len(data))  # struct.error if a field is over 64 KiB
+                body += data
+            count += 1
+        header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, stat.st_mtime_ns, stat.st_size,
+                              csv_digest, count)
+        temp_file = snapshot_file + '.tmp'
+        with open(temp_file, 'wb') as file:
+            file.write(header)
+            file.write(body)
+        os.replace(temp_file, snapshot_file)  # Readers never see a half-written snapshot
+        return True
+    except Exception as e:
+        print(f"Error writing library snapshot: {str(e)}")
+        return False
+
+def read_snapshot(snapshot_file: str, csv_file: str) -> Optional[List[SnapshotRow]]:
+    """Read the snapshot if it still matches csv_file, otherwise return None"""
+    try:
+        if not os.path.exists(snapshot_file):
+            return None
+        stat = os.stat(csv_file)
+        with open(snapshot_file, 'rb') as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, version, _, mtime_ns, size, csv_digest, count = _HEADER.unpack_from(data, 0)
+                if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                    return None  # Unknown format: fall back to the CSV
+                if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+                    return None  # The CSV changed since the snapshot was written
+                if csv_digest != _csv_digest(csv_file):
+                    return None  # Same-size edit that a coarse mtime did not show
+                rows: List[SnapshotRow] = []
+                offset = _HEADER.size
+                for _ in range(count):
+                    rating, play_count = _NUMBERS.unpack_from(data, offset)
+                    offset += _NUMBERS.size
+                    fields = []
+                    for _ in range(3):
+                        (length,) = _LENGTH.unpack_from(data, offset)
+                        offset += _LENGTH.size
+                        if offset + length > len(data):
+                            return None  # Truncated snapshot
+                        fields.append(data[offset:offset + length].decode('utf-8'))
+                        offset += length
+                    rows.append((fields[0], fields[1], fields[2], rating, play_count))
+                if offset != len(data):
+                    return None  # Trailing bytes: not a snapshot we wrote
+                return rows
+    except Exception as e:
+        print(f"Error reading library snapshot: {str(e)}")
+        return None
@@ -0,0 +1,110 @@
+import heapq  # Import heapq to keep pending deadlines ordered by time
+import itertools  # Import itertools to number the scheduled calls
+import time  # Import time for the monotonic clock the deadlines are measured on
+from collections import deque  # Import deque for the first-in, first-out command queue
+from threading import Condition, Event, Thread, current_thread  # Import Condition to sleep until the next deadline or command
+from typing import Callable, Deque, List, Optional, Tuple  # Import necessary types for type hinting
+
+class DeadlineScheduler:
+    """
+    One background thread that runs submitted commands in order and callbacks at given times
+
+    The thread sleeps until a command arrives or the earliest pending deadline is due,
+    so nothing wakes up just to check whether it is time yet. Everything it runs runs
+    on that one thread, one call at a time.
+    """
+    def __init__(self, name: str = "deadline-scheduler"):
+        self._name = name
+        self._heap: List[Tuple[float, int, Callable[[], None]]] = []  # (monotonic time, handle, callback)
+        self._commands: Deque[Callable[[], None]] = deque()  # Run before any deadline, in submission order
+        self._counter = itertools.count(1)
+        self._condition = Condition()
+        self._thread: Optional[Thread] = None  # Started with the first scheduled call
+        self._closed = False
+        self.wakeups = 0  # Times the thread woke up, for measuring how quiet it is
+
+    def submit(self, command: Callable[[], None]) -> None:
+        """Run command on the scheduler thread as soon as the commands before it are done"""
+        with self._condition:
+            self._commands.append(command)
+            self._start()
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every command submitted so far has run; False on timeout"""
+        if self.on_thread():
+            return True  # Called from a command: the earlier ones already ran
+        done = Event()
+        self.submit(done.set)
+        return done.wait(timeout)
+
+    def on_thread(self) -> bool:
+        """Whether the caller is running on the scheduler thread"""
+        return self._thread is not None and current_thread() is self._thread
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> int:
+        """Run callback after delay seconds; returns a handle for cancel()"""
+        return self.call_at(time.monotonic() + max(delay, 0.0), callback)
+
+    def call_at(self, when: float, callback: Callable[[], None]) -> int:
+        """Run callback at the time.monotonic() value when; returns a handle for cancel()"""
+        with self._condition:
+            handle = next(self._counter)
+            heapq.heappush(self._heap, (when, handle, callback))
+            self._start()
+            if self._heap[0][1] == handle:
+                self._condition.notify()  # New earliest deadline: shorten the current sleep
+            return handle
+
+    def cancel(self, handle: Optional[int]) -> None:
+        """Drop a scheduled call that has not run yet"""
+        if handle is None:
+            return
+        with self._condition:
+            for position, entry in enumerate(self._heap):
+                if entry[1] == handle:
+                    self._heap[position] = self._heap[-1]
+                    self._heap.pop()
+                    heapq.heapify(self._heap)  # Only a handful of deadlines are ever pending
+                    return
+
+    def pending(self) -> int:
+        """Number of deadlines waiting to run"""
+        with self._condition:
+            return len(self._heap)
+
+    def _start(self) -> None:
+        """Start the thread with the first call; the caller holds the condition"""
+        if self._thread is None and not self._closed:
+            self._thread = Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the thread; calls still pending never run"""
+        with self._condition:
+            self._closed = True
+            self._heap.clear()
+            self._commands.clear()
+            self._condition.notify()
+        if self._thread is not None and not self.on_thread():
+            self._thread.join(timeout=1.0)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not self._commands:
+                    now = time.monotonic()
+                    if self._heap and self._heap[0][0] <= now:
+                        break
+                    self._condition.wait(self._heap[0][0] - now if self._heap else None)
+                    self.wakeups += 1
+                if self._closed:
+                    return
+                if self._commands:
+                    callback = self._commands.popleft()
+                else:
+                    _, _, callback = heapq.heappop(self._heap)
+            try:
+                callback()  # Outside the lock, so callbacks can schedule or cancel
+            except Exception as e:
+                print(f"Error in scheduled playback call: {e}")
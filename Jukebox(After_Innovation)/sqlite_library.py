@@ -0,0 +1,201 @@
+import csv  # Import CSV module for importing and exporting the tracks.csv layout
+import os  # Import OS module for file path handling
+import sqlite3  # Import sqlite3 for the database storage engine
+from threading import RLock  # Import RLock to share one connection between the UI and player threads
+from typing import Iterator, Optional, List, Set, Tuple  # Import necessary types for type hinting
+from library_item import Track  # Import the Track class from library_item module
+from track_library import MusicLibrary  # Import the CSV library this engine replaces
+
+class SQLiteMusicLibrary(MusicLibrary):
+    """Music library stored in SQLite (WAL mode) with indexed queries"""
+    _SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS tracks (
+            track_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            artist TEXT NOT NULL,
+            rating INTEGER NOT NULL DEFAULT 0,
+            play_count INTEGER NOT NULL DEFAULT 0
+        )""",
+        "CREATE INDEX IF NOT EXISTS idx_tracks_artist ON tracks(artist)",
+        "CREATE INDEX IF NOT EXISTS idx_tracks_name_lower ON tracks(lower(name))",
+        "CREATE INDEX IF NOT EXISTS idx_tracks_rating ON tracks(rating)",
+        "CREATE INDEX IF NOT EXISTS idx_tracks_play_count ON tracks(play_count)",
+    )
+    _SORT_CHUNK = 256  # Rows read per query when streaming a sort order
+
+    def __init__(self, db_file: Optional[str] = None, flush_interval: float = 2.0, max_dirty: int = 50,
+                 compact: bool = False, watch: bool = False, library_file: Optional[str] = None):
+        # Keep the database next to tracks.csv unless told otherwise
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self._db_file = db_file or os.path.join(current_dir, "tracks.db")
+        self._db_lock = RLock()  # sqlite3 connections are not safe to share without a lock
+        self._connection: Optional[sqlite3.Connection] = None
+        super().__init__(flush_interval, max_dirty, compact, watch, library_file)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database in WAL mode and create the schema"""
+        connection = sqlite3.connect(self._db_file, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")  # Readers never block the writer
+        connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, fast per commit
+        with connection:
+            for statement in self._SCHEMA:
+                connection.execute(statement)
+        return connection
+
+    def _initialize_library(self) -> None:
+        """Open the database, migrating tracks.csv on first run"""
+        self._startup_source = 'database'
+        with self._db_lock:
+            self._connection = self._connect()
+            count = self._connection.execute("SELECT COUNT(*) FROM tracks").fetchone()[0]
+        if count == 0 and os.path.exists(self._library_file):
+            self.import_csv(self._library_file)  # First run: migrate the existing CSV, which notifies observers
+        else:
+            self._load_library_from_db()
+            self.notify_observers()  # Notify observers about the initial load
+
+    def _setup_file_watcher(self):
+        """The database is the source of truth, so there is no CSV to watch"""
+        pass
+
+    def _save_snapshot(self) -> bool:
+        """The database is the source of truth, so there is no CSV snapshot to keep"""
+        return False
+
+    def _load_library_from_db(self) -> None:
+        """Load every track row into memory"""
+        with self._db_lock:
+            rows = self._connection.execute(
+                "SELECT track_id, name, artist, rating, play_count FROM tracks "
+                "ORDER BY CAST(track_id AS INTEGER)"
+            ).fetchall()
+        self._library.clear()
+        for track_id, name, artist, rating, play_count in rows:
+            track = Track(name, artist, rating)
+            track.set_play_count(play_count)  # Set directly instead of incrementing play_count times
+            self._library[track_id] = track
+
+    def reload_library(self) -> None:
+        """Reload library from the database"""
+        try:
+            self.flush()  # Pending changes would otherwise be overwritten by the reload
+            self._load_library_from_db()
+            self.notify_observers()  # Notify observers about the change
+        except Exception as e:
+            print(f"Error reloading library: {e}")
+
+    def _record_play(self, track_id: str, track: Track) -> None:
+        """Count a play in memory; the background flusher updates its row"""
+        with self._write_lock:
+            track.increment_play_count()
+            self._mark_dirty(track_id)
+
+    def _write_batch(self, dirty: Set[str], removed: Set[str]) -> bool:
+        """Write a batch of changed and removed tracks in one transaction"""
+        rows = [
+            (track_id, track.name, track.artist, track.rating, track.play_count)
+            for track_id, track in ((key, self._library.get(key)) for key in dirty)
+            if track is not None
+        ]
+        try:
+            with self._db_lock, self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO tracks (track_id, name, artist, rating, play_count) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._connection.executemany(
+                    "DELETE FROM tracks WHERE track_id = ?",
+                    [(track_id,) for track_id in removed]
+                )
+            return True
+        except Exception as e:
+            print(f"Error writing library database: {str(e)}")
+            return False
+
+    def _order_by(self, field: str, descending: bool) -> str:
+        """ORDER BY clause for field; equal values in id order, the same order SortedIndex gives the CSV backend"""
+        return f"ORDER BY {field} {'DESC' if descending else 'ASC'}, CAST(track_id AS INTEGER)"
+
+    def _sorted_page(self, field: str, descending: bool, offset: int, limit: Optional[int]) -> List[Tuple[str, Track]]:
+        """Read the page from the column index instead of the in-memory SortedIndex"""
+        query = f"SELECT track_id FROM tracks {self._order_by(field, descending)} LIMIT ? OFFSET ?"
+        self.flush()  # Order by the current values, not by rows still waiting to be written
+        with self._db_lock:
+            rows = self._connection.execute(query, (-1 if limit is None else limit, offset)).fetchall()
+        return [(track_id, self._library[track_id]) for (track_id,) in rows if track_id in self._library]
+
+    def _sorted_keys(self, field: str, descending: bool, position: Optional[Tuple[int, int]]) -> Iterator[str]:
+        """Walk the column index a chunk at a time, each chunk starting after the last (value, numeric id) read"""
+        self.flush()  # Order by the current values, not by rows still waiting to be written
+        beyond = '<' if descending else '>'
+        while True:
+            where, params = "", ()
+            if position is not None:
+                where = f"WHERE {field} {beyond} ? OR ({field} = ? AND CAST(track_id AS INTEGER) > ?)"
+                params = (position[0], position[0], position[1])
+            query = f"SELECT track_id, {field} FROM tracks {where} {self._order_by(field, descending)} LIMIT ?"
+            with self._db_lock:
+                rows = self._connection.execute(query, params + (self._SORT_CHUNK,)).fetchall()
+            if not rows:
+                return
+            for track_id, _ in rows:
+                yield track_id
+            position = (rows[-1][1], int(rows[-1][0]))
+
+    def import_csv(self, csv_file: Optional[str] = None) -> int:
+        """Replace the database contents with a file in the tracks.csv layout"""
+        csv_file = csv_file or self._library_file
+        with self._write_lock:
+            self._dirty.clear()  # The import replaces anything still pending
+            self._removed.clear()
+            self._dirty_since = None
+        rows = []
+        with open(csv_file, 'r', newline='', encoding='utf-8') as file:
+            for row in csv.DictReader(file):
+                try:
+                    rows.append((
+                        str(row['track_id']).zfill(2),
+                        row['name'],
+                        row['artist'],
+                        int(row['rating']),
+                        int(row['play_count'])
+                    ))
+                except Exception as row_error:
+                    print(f"Error importing track {row.get('track_id', 'unknown')}: {str(row_error)}")
+        with self._db_lock, self._connection:
+            self._connection.execute("DELETE FROM tracks")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO tracks (track_id, name, artist, rating, play_count) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        self._load_library_from_db()
+        # Same dict refilled, so indexes and cached results would not notice the change on their own
+        self.notify_observers()
+        return len(rows)
+
+    def export_csv(self, csv_file: Optional[str] = None) -> int:
+        """Write the database contents in the tracks.csv layout"""
+        csv_file = csv_file or self._library_file
+        self.flush()  # Export what is in memory, not an older database state
+        with self._db_lock:
+            rows = self._connection.execute(
+                "SELECT track_id, name, artist, rating, play_count FROM tracks "
+                "ORDER BY CAST(track_id AS INTEGER)"
+            ).fetchall()
+        temp_file = csv_file + '.tmp'
+        with open(temp_file, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+            writer.writerows(rows)
+        os.replace(temp_file, csv_file)  # Only replace the original after a complete write
+        return len(rows)
+
+    def close(self) -> None:
+        """Flush pending writes and close the database connection"""
+        super().close()
+        with self._db_lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,49 @@
+import struct
+import wave
+from audio_probe import probe_audio
+
+# MPEG-1 layer III, 128 kbit/s, 44.1 kHz, joint stereo: 417 byte frames of 1152 samples
+_FRAME_HEADER = b'\xff\xfb\x90\x64'
+_FRAME_LENGTH = 417
+
+def write_mp3(path, frames, xing_frames=None):
+    with open(path, 'wb') as f:
+        f.write(b'ID3\x03\x00\x00\x00\x00\x00\x0a' + b'\x00' * 10)  # 10 byte ID3v2 tag
+        for index in range(frames):
+            frame = bytearray(_FRAME_HEADER + b'\x00' * (_FRAME_LENGTH - 4))
+            if index == 0 and xing_frames is not None:
+                frame[36:48] = b'Xing' + struct.pack('>II', 1, xing_frames)
+            f.write(frame)
+
+def test_wav_duration(tmp_path):
+    """Test WAV files are timed from the fmt and data chunks"""
+    path = tmp_path / "tone.wav"
+    with wave.open(str(path), 'wb') as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(8000)
+        w.writeframes(b'\x00\x00' * 2 * 8000 * 3)
+    info = probe_audio(str(path))
+    assert abs(info.duration - 3.0) < 1e-6
+    assert (info.sample_rate, info.channels, info.bitrate) == (8000, 2, 256)
+    assert info.file_size == path.stat().st_size
+
+def test_cbr_mp3_duration(tmp_path):
+    """Test constant bitrate MP3s are timed from the bitrate and size"""
+    path = tmp_path / "cbr.mp3"
+    write_mp3(path, 100)
+    info = probe_audio(str(path))
+    assert abs(info.duration - 100 * _FRAME_LENGTH * 8 / 128000) < 1e-6
+    assert (info.sample_rate, info.bitrate, info.channels) == (44100, 128, 2)
+
+def test_xing_frame_count(tmp_path):
+    """Test a Xing header's frame count gives the exact duration"""
+    path = tmp_path / "vbr.mp3"
+    write_mp3(path, 10, xing_frames=500)
+    assert abs(probe_audio(str(path)).duration - 500 * 1152 / 44100) < 1e-6
+
+def test_unreadable_file(tmp_path):
+    """Test files without audio headers are reported as None"""
+    path = tmp_path / "notes.mp3"
+    path.write_bytes(b'not audio at all')
+    assert probe_audio(str(path)) is None
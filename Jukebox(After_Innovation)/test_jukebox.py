@@ -74,3 +74,24 @@ def test_volume_control(app):
     
     app.update_volume(0)
     assert app.player._volume == 0.0
+
+def test_selection_resolves_track_id(app):
+    """Test the selected line maps to its track through the row model"""
+    app.list_tracks_clicked()
+    if not app._row_ids:
+        pytest.skip("Library is empty")
+    app.list_txt.mark_set("insert", "1.0")
+    assert app._selected_track_id() == app._row_ids[0]
+    app.list_txt.mark_set("insert", f"{len(app._row_ids) + 5}.0")
+    assert app._selected_track_id() in (app._row_ids[-1], None)
+
+def test_track_list_pages(app):
+    """Test the track list shows one page and appends the next on demand"""
+    app._PAGE_SIZE = 1
+    app.list_tracks_clicked()
+    if app._page_cursor is None:
+        pytest.skip("Library has fewer than two tracks")
+    assert len(app._row_ids) == 1
+    app.load_more_tracks()
+    assert len(app._row_ids) == 2
+    assert app._row_lookup[app._row_ids[1]] == 1
@@ -0,0 +1,31 @@
+from library_cache import ResultCache
+
+def test_hit_until_dependency_changes():
+    """Test a result stays cached until a field it depends on changes"""
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert cache.get("q", ("name",), compute) == 1
+    assert cache.get("q", ("name",), compute) == 1
+    cache.invalidate({"rating"})
+    assert cache.get("q", ("name",), compute) == 1
+    cache.invalidate({"name"})
+    assert cache.get("q", ("name",), compute) == 2
+    assert cache.stats() == {"hits": 2, "misses": 2, "entries": 1, "version": 2}
+
+def test_invalidate_everything():
+    """Test a change to unknown fields drops every result"""
+    cache = ResultCache()
+    cache.get("q", (), lambda: 1)
+    cache.invalidate()
+    assert cache.get("q", (), lambda: 2) == 2
+
+def test_least_recently_used_is_evicted():
+    """Test the cache keeps at most max_entries results"""
+    cache = ResultCache(max_entries=2)
+    cache.get("a", (), lambda: "a")
+    cache.get("b", (), lambda: "b")
+    cache.get("a", (), lambda: "a")  # "b" is now the oldest
+    cache.get("c", (), lambda: "c")
+    assert cache.get("a", (), lambda: "new") == "a"
+    assert cache.get("b", (), lambda: "new") == "new"
@@ -0,0 +1,175 @@
+from library_index import IdIndex, TokenIndex, TrigramIndex, PrefixIndex, SortedIndex, ArtistIndex, prefix_matches, duplicate_keys, split_artists, tokenize, fold_text
+from track_library import LibraryChangeEvent
+from library_item import Track
+
+def make_tracks():
+    return {
+        "01": Track("Hello", "Adele"),
+        "02": Track("Rolling in the Deep", "Adele"),
+        "03": Track("Deep Blue", "Ocean Band"),
+    }
+
+def test_tokenize():
+    """Test text is split into lowercase word tokens"""
+    assert tokenize("Rolling in the Deep (Live)") == ["rolling", "in", "the", "deep", "live"]
+
+def test_token_search_matches_substring_semantics():
+    """Test the index finds the same tracks as a substring scan"""
+    tracks = make_tracks()
+    index = TokenIndex('name')
+    index.ensure(tracks)
+    assert index.search("deep") == {"02", "03"}
+    assert index.search("ELL") == {"01"}  # Infix of a token
+    assert index.search("the deep") == {"02"}
+    assert index.search("deep the") == set()  # Both words occur, but not as one substring
+    assert index.search("") == {"01", "02", "03"}
+
+def test_token_index_follows_events():
+    """Test the index is updated from change events"""
+    tracks = make_tracks()
+    index = TokenIndex('name')
+    index.ensure(tracks)
+    tracks["04"] = Track("Deeper", "Someone")
+    del tracks["03"]
+    tracks["01"].name = "Goodbye"
+    index.apply(LibraryChangeEvent(added={"04"}, removed={"03"}, updated={"01": {"name"}}), tracks)
+    assert index.search("deep") == {"02", "04"}
+    assert index.search("hello") == set()
+    assert index.search("good") == {"01"}
+
+def test_token_index_rebuilds_after_full_reload():
+    """Test a None event makes the next ensure rebuild the index"""
+    tracks = make_tracks()
+    index = TokenIndex('artist')
+    index.ensure(tracks)
+    tracks["01"].artist = "Someone Else"
+    index.apply(None, tracks)
+    index.ensure(tracks)
+    assert index.search("adele") == {"02"}
+
+def test_fold_text():
+    """Test accents and Vietnamese diacritics are folded away"""
+    assert fold_text("QUA TỪNG KHUNG HÌNH") == "qua tung khung hinh"
+    assert fold_text("Đêm Đông") == "dem dong"
+    assert fold_text("Beyoncé") == "beyonce"
+
+def test_trigram_search_ranks_fuzzy_matches():
+    """Test folded, typo-tolerant matches come back best first"""
+    tracks = {
+        "01": Track("QUA TỪNG KHUNG HÌNH", "Various"),
+        "02": Track("Hello", "Adele"),
+        "03": Track("Yellow", "Coldplay"),
+    }
+    index = TrigramIndex('name')
+    index.ensure(tracks)
+    assert index.search("qua tung")[0] == ("01", 1.0)
+    results = index.search("helo")
+    assert results[0][0] == "02"
+    assert "01" not in dict(results)
+    assert index.search("hello", limit=1) == [("02", 1.0)]
+
+def test_prefix_index_lookup_and_narrowing():
+    """Test word-prefix lookups and narrowing of earlier results"""
+    tracks = {
+        "01": Track("Hello", "Adele"),
+        "02": Track("Help!", "The Beatles"),
+        "03": Track("Đêm Nay", "Hà Anh Tuấn"),
+    }
+    name, artist = PrefixIndex('name'), PrefixIndex('artist')
+    name.ensure(tracks)
+    artist.ensure(tracks)
+    assert prefix_matches([name], "hel") == {"01", "02"}
+    assert prefix_matches([name], "dem") == {"03"}
+    assert prefix_matches([name, artist], "help beat") == {"02"}
+    assert prefix_matches([name], "hell", within={"01", "02"}) == {"01"}
+    assert prefix_matches([name], "ello") == set()  # Only word starts match
+
+    tracks["04"] = Track("Hell Freezes Over", "Eagles")
+    del tracks["01"]
+    name.apply(LibraryChangeEvent(added={"04"}, removed={"01"}), tracks)
+    assert prefix_matches([name], "hell") == {"04"}
+
+def test_sorted_index_pages_and_updates():
+    """Test the sort order is maintained and paged without resorting"""
+    tracks = {str(i).zfill(2): Track(f"Song {i}", "Artist", i % 3) for i in range(1, 7)}
+    index = SortedIndex('rating')
+    index.ensure(tracks)
+    assert index.page(descending=True, limit=3) == ["02", "05", "01"]
+    assert index.page(descending=False, offset=1, limit=2) == ["06", "01"]
+    tracks["03"].rating = 5
+    index.apply(LibraryChangeEvent(updated={"03": {"rating"}}), tracks)
+    assert index.page(limit=1) == ["03"]
+    index.apply(LibraryChangeEvent(updated={"04": {"name"}}), tracks)  # Unrelated field
+    assert len(index.page()) == 6
+
+def test_ordered_walks_cross_chunks():
+    """Test streamed walks match a full sort across many chunks"""
+    tracks = {str(i): Track(f"Song {i}", "Artist", i % 4) for i in range(1, 1001)}
+    index = SortedIndex('rating')
+    index.ensure(tracks)
+    expected = sorted(tracks, key=lambda key: (-tracks[key].rating, int(key)))
+    assert [key for _, _, key in index.iter_entries(descending=True)] == expected
+    assert [key for _, _, key in index.iter_entries(descending=True, after=(2, 998))] == expected[expected.index("998") + 1:]
+    ids = IdIndex()
+    ids.ensure(tracks)
+    assert list(ids.iter_keys()) == [str(i) for i in range(1, 1001)]
+    ids.apply(LibraryChangeEvent(removed={"500"}), tracks)
+    assert list(ids.iter_keys(after=498)) == ["499"] + [str(i) for i in range(501, 1001)]
+
+def test_sorted_index_blocks_follow_updates(monkeypatch):
+    """Test the blocked sort order stays exact while blocks split and empty out"""
+    import random
+    import library_index
+    monkeypatch.setattr(library_index, '_BLOCK', 4)
+    rng = random.Random(7)
+    tracks = {str(i): Track(f"Song {i}", "Artist", 0) for i in range(1, 201)}
+    for track in tracks.values():
+        track.set_play_count(rng.randrange(10))
+    index = SortedIndex('play_count')
+    index.ensure(tracks)
+    for _ in range(500):
+        key = str(rng.randrange(1, 201))
+        if key in tracks and rng.random() < 0.2:
+            del tracks[key]
+            index.apply(LibraryChangeEvent(removed={key}), tracks)
+        elif key in tracks:
+            tracks[key].set_play_count(rng.randrange(10))
+            index.apply(LibraryChangeEvent(updated={key: {"play_count"}}), tracks)
+        else:
+            tracks[key] = Track(f"Song {key}", "Artist", 0)
+            index.apply(LibraryChangeEvent(added={key}), tracks)
+    expected = sorted(tracks, key=lambda key: (-tracks[key].play_count, int(key)))
+    assert [key for _, _, key in index.iter_entries(descending=True)] == expected
+    assert index.page(descending=False) == sorted(tracks, key=lambda key: (tracks[key].play_count, int(key)))
+    assert index.range(3, 6) == {key for key, track in tracks.items() if 3 <= track.play_count < 6}
+
+def test_split_artists():
+    """Test featured artists are split out of the artist field"""
+    assert split_artists("Sam Smith, Kim Petras") == ["Sam Smith", "Kim Petras"]
+    assert split_artists("Pitbull ft. Ke$ha") == ["Pitbull", "Ke$ha"]
+    assert split_artists("AC/DC") == ["AC/DC"]
+
+def test_artist_index_running_totals():
+    """Test per-artist tracks, plays and average rating follow changes"""
+    tracks = {"01": Track("Unholy", "Sam Smith, Kim Petras", 4), "02": Track("Stay With Me", "Sam Smith", 2)}
+    tracks["01"].set_play_count(10)
+    index = ArtistIndex()
+    index.ensure(tracks)
+    assert index.track_ids("sam smith") == {"01", "02"}
+    assert index.stats("Kim Petras") == ("Kim Petras", 1, 10, 4.0)
+    assert index.stats("Sam Smith") == ("Sam Smith", 2, 10, 3.0)
+
+    tracks["02"].increment_play_count()
+    index.apply(LibraryChangeEvent(updated={"02": {"play_count"}}), tracks)
+    del tracks["01"]
+    index.apply(LibraryChangeEvent(removed={"01"}), tracks)
+    assert index.stats("Sam Smith") == ("Sam Smith", 1, 1, 2.0)
+    assert index.stats("Kim Petras") is None
+    assert index.artists() == ["Sam Smith"]
+
+def test_duplicate_keys():
+    """Test title decorations, entities and featured credits normalize away"""
+    assert duplicate_keys("Alicia Keys - If I Ain&#39;t Got You (Lyrics)", "7clouds") == {("ifiaintgotyou", "aliciakeys")}
+    assert duplicate_keys("Timber (featuring Ke$ha - Official Video)", "PitbullVEVO") == {("timber", "pitbull"), ("timber", "keha")}
+    assert duplicate_keys("Hello (Live)", "Adele") != duplicate_keys("Hello", "Adele - Topic")
+    assert duplicate_keys("(Lyrics)", "Adele") == set()
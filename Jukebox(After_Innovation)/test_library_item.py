@@ -1,6 +1,20 @@
 import pytest
+import os
+import shutil
+import time
+import track_library
 from library_item import MediaItem, Track, PlaybackStrategy, SequentialPlaybackStrategy, RandomPlaybackStrategy, MusicPlayer
 
+@pytest.fixture(autouse=True)
+def shared_library(tmp_path, monkeypatch):
+    """Give the player a shared library on a copy of tracks.csv, so tests leave the real one alone"""
+    library_file = str(tmp_path / "tracks.csv")
+    shutil.copy(os.path.join(os.path.dirname(os.path.abspath(track_library.__file__)), "tracks.csv"), library_file)
+    library = track_library.MusicLibrary(library_file=library_file)
+    monkeypatch.setattr(track_library, '_shared_library', library)
+    yield library
+    library.close()
+
 def test_track_creation():
     """Test track creation and basic properties"""
     track = Track("Test Song", "Test Artist", 4)
@@ -106,4 +120,124 @@ def test_music_player_observers():
     player.notify_observers("Test Track")
     
     assert len(observer.track_changes) == 1
-    assert len(observer.state_changes) == 1
\ No newline at end of file
+    assert len(observer.state_changes) == 1
+
+def test_peek_next_comes_true():
+    """Test peek_next shows the tracks get_next_track will return"""
+    playlist = [("01", "Track 1"), ("02", "Track 2"), ("03", "Track 3")]
+    sequential = SequentialPlaybackStrategy()
+    assert sequential.peek_next(playlist, 1, 3) == [2, 0, 1]
+
+    shuffled = RandomPlaybackStrategy()
+    upcoming = shuffled.peek_next(playlist, 0, 4)
+    assert shuffled.peek_next(playlist, 0, 2) == upcoming[:2]  # Peeking again does not redraw
+    assert [shuffled.get_next_track(playlist, 0) for _ in range(4)] == upcoming
+
+def _tone_player(tmp_path, track_ids, seconds):
+    """A player whose tracks are short generated WAV files"""
+    import wave
+    paths = {}
+    for track_id in track_ids:
+        paths[track_id] = str(tmp_path / f"track_{track_id}.wav")
+        with wave.open(paths[track_id], "wb") as track:
+            track.setnchannels(1)
+            track.setsampwidth(2)
+            track.setframerate(22050)
+            track.writeframes(b"\x00\x01" * int(22050 * seconds))
+    player = MusicPlayer()
+    player.load_track = paths.get
+    player._track_duration = lambda track_id, path: seconds
+    return player
+
+def test_playlist_advances_on_track_end(tmp_path):
+    """Test the end of track deadline moves the playlist on without a polling thread"""
+    import threading
+    player = _tone_player(tmp_path, ("98", "99"), 0.3)
+    changes = []
+    player.set_track_info_callback(changes.append)
+    threads = threading.active_count()
+
+    player.play_playlist([("98", "First"), ("99", "Second")])
+    assert player.wait_idle()
+    assert threading.active_count() <= threads + 1  # Only the player thread
+    deadline = time.time() + 3
+    while player.current_track != "99" and time.time() < deadline:
+        time.sleep(0.05)
+    assert player.current_track == "99"
+    assert len(changes) >= 2
+    assert player._scheduler.wakeups < 20
+    player.stop()
+    assert player.wait_idle()
+    assert player.state == MusicPlayer.STOPPED
+    assert player._scheduler.pending() == 0
+
+def test_rapid_commands_run_in_order(tmp_path):
+    """Test a burst of next/previous presses is carried out in order on one thread"""
+    import threading
+    player = _tone_player(tmp_path, ("95", "96", "97"), 5.0)
+    started = []
+    player.set_track_info_callback(started.append)
+    threads = threading.active_count()
+
+    player.play_playlist([("95", "A"), ("96", "B"), ("97", "C")])
+    for _ in range(4):
+        player.play_next()  # 95 -> 96 -> 97 -> 95 -> 96
+    player.play_previous()  # -> 95
+    player.pause()
+    player.toggle_playback()
+    assert player.wait_idle()
+    assert threading.active_count() <= threads + 1
+    assert started == [f"Now Playing: {name}" for name in "ABCABA"]
+    assert player.current_track == "95" and player.is_playing
+    player.stop()
+    player.play_next()  # Nothing to skip through once stopped
+    assert player.wait_idle()
+    assert player.state == MusicPlayer.STOPPED
+
+def test_seek_and_resume_without_reloading(tmp_path):
+    """Test seeking and resuming move within the loaded stream instead of loading the file again"""
+    player = _tone_player(tmp_path, ("90",), 10.0)
+    player._count_play = lambda: None
+    assert player.play_single_track("90")
+    assert player.wait_idle()
+    resolved = []
+    load_track = player.load_track
+    player.load_track = lambda track_id: resolved.append(track_id) or load_track(track_id)
+
+    player.pause()
+    player.seek_to_position(8.0)
+    assert player.wait_idle()
+    assert player.state == MusicPlayer.PAUSED
+    assert player.position == 8.0
+    player.unpause()
+    player.seek_to_position(9.0)
+    assert player.wait_idle()
+    assert resolved == []  # No file was looked up again
+    assert 8.9 <= player.position <= 9.5
+    deadline = time.time() + 4
+    while player.state != MusicPlayer.STOPPED and time.time() < deadline:
+        time.sleep(0.05)
+    assert player.state == MusicPlayer.STOPPED  # The end came a second after the seek, not ten
+
+def test_set_strategy_requeues_next_track(tmp_path):
+    """Test changing strategy replaces the track queued by the old one"""
+    class LastTrackStrategy(SequentialPlaybackStrategy):
+        def get_next_track(self, playlist, current_index):
+            return len(playlist) - 1
+
+    player = _tone_player(tmp_path, ("95", "96", "97"), 5.0)
+    player._count_play = lambda: None
+    player.play_playlist([("95", "A"), ("96", "B"), ("97", "C")])
+    deadline = time.time() + 3
+    while player._queued is None and time.time() < deadline:
+        time.sleep(0.05)
+    assert player._queued[0] == 1
+
+    player.set_strategy(LastTrackStrategy())
+    assert player.wait_idle()
+    assert player._queued[0] == 2
+    player.play_next()
+    assert player.wait_idle()
+    assert player.current_track == "97"
+    player.stop()
+    assert player.wait_idle()
@@ -0,0 +1,29 @@
+import pytest
+from library_query import compile_query, QuerySyntaxError
+
+def test_compile_terms():
+    """Test each kind of term lands in the right part of the compiled query"""
+    query = compile_query('adele artist:"sam smith" rating>=4 plays<10 id!=3 sort:-plays limit:20 offset:5')
+    assert query.text_terms == [(("name", "artist"), "adele"), (("artist",), "sam smith")]
+    assert query.ranges == [("rating", 4, None), ("play_count", 0, 10)]
+    assert query.excluded == [("track_id", 3)]
+    assert (query.sort_field, query.descending, query.limit, query.offset) == ("play_count", True, 20, 5)
+    assert query.fields == {"name", "artist", "rating", "play_count"}
+
+def test_compiled_queries_are_cached():
+    """Test the same text compiles to the same object"""
+    assert compile_query("rating:5") is compile_query("rating:5")
+
+def test_predicate():
+    """Test the predicate checks every condition on a row"""
+    predicate = compile_query("hello rating>3 id<=2").predicate()
+    assert predicate(("02", "Hello", "Adele", 5, 0))
+    assert not predicate(("03", "Hello", "Adele", 5, 0))
+    assert not predicate(("01", "Hello", "Adele", 3, 0))
+    assert not predicate(("01", "Skyfall", "Adele", 5, 0))
+
+@pytest.mark.parametrize("text", ["genre:pop", "rating>high", "name<3", "sort:colour", 'artist:"open', "limit:-1"])
+def test_syntax_errors(text):
+    """Test malformed queries raise QuerySyntaxError"""
+    with pytest.raises(QuerySyntaxError):
+        compile_query(text)
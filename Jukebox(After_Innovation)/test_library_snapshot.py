@@ -0,0 +1,46 @@
+import os
+from library_snapshot import read_snapshot, write_snapshot
+
+ROWS = [("01", "Hello", "Adele", 5, 12), ("02", "Señorita", "Shawn Mendes", 0, 0)]
+
+def write_csv(path, text="track_id,name,artist,rating,play_count\n"):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+def test_snapshot_round_trip(tmp_path):
+    """Test rows read back from a snapshot match what was written"""
+    csv_file = str(tmp_path / "tracks.csv")
+    write_csv(csv_file)
+    assert write_snapshot(csv_file + ".snapshot", csv_file, ROWS)
+    assert read_snapshot(csv_file + ".snapshot", csv_file) == ROWS
+
+def test_snapshot_invalid_after_csv_change(tmp_path):
+    """Test a snapshot is ignored once the CSV has changed"""
+    csv_file = str(tmp_path / "tracks.csv")
+    write_csv(csv_file)
+    write_snapshot(csv_file + ".snapshot", csv_file, ROWS)
+    write_csv(csv_file, "track_id,name,artist,rating,play_count\n01,Hello,Adele,5,13\n")
+    assert read_snapshot(csv_file + ".snapshot", csv_file) is None
+
+def test_snapshot_invalid_after_same_size_edit(tmp_path):
+    """Test a snapshot is ignored after an edit that keeps the CSV's size and mtime"""
+    csv_file = str(tmp_path / "tracks.csv")
+    write_csv(csv_file, "track_id,name,artist,rating,play_count\n01,Hello,Adele,5,12\n")
+    write_snapshot(csv_file + ".snapshot", csv_file, ROWS[:1])
+    stat = os.stat(csv_file)
+    write_csv(csv_file, "track_id,name,artist,rating,play_count\n01,Hello,Adele,4,12\n")
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # As a coarse-mtime filesystem would
+    assert read_snapshot(csv_file + ".snapshot", csv_file) is None
+
+def test_truncated_snapshot(tmp_path):
+    """Test a damaged snapshot is ignored instead of loaded"""
+    csv_file = str(tmp_path / "tracks.csv")
+    write_csv(csv_file)
+    snapshot_file = csv_file + ".snapshot"
+    write_snapshot(snapshot_file, csv_file, ROWS)
+    stat = os.stat(csv_file)
+    with open(snapshot_file, 'r+b') as f:
+        f.truncate(os.path.getsize(snapshot_file) - 3)
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert read_snapshot(snapshot_file, csv_file) is None
+    assert read_snapshot(str(tmp_path / "missing"), csv_file) is None
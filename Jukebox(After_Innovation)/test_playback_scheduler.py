@@ -0,0 +1,41 @@
+import threading
+import time
+from playback_scheduler import DeadlineScheduler
+
+def test_calls_run_in_deadline_order():
+    """Test callbacks run at their deadlines, earliest first"""
+    scheduler = DeadlineScheduler()
+    ran = []
+    done = threading.Event()
+    scheduler.call_later(0.10, lambda: ran.append("late") or done.set())
+    scheduler.call_later(0.02, lambda: ran.append("early"))
+    assert done.wait(2.0)
+    assert ran == ["early", "late"]
+    scheduler.close()
+
+def test_cancel_and_quiet_while_idle():
+    """Test a cancelled call never runs and an idle scheduler does not wake up"""
+    scheduler = DeadlineScheduler()
+    ran = []
+    handle = scheduler.call_later(0.05, lambda: ran.append(1))
+    scheduler.cancel(handle)
+    scheduler.cancel(handle)  # Cancelling twice is harmless
+    assert scheduler.pending() == 0
+    time.sleep(0.2)
+    assert ran == []
+    assert scheduler.wakeups <= 1  # At most the wakeup caused by the cancel
+    scheduler.close()
+
+def test_commands_run_in_order_before_deadlines():
+    """Test submitted commands run first-in first-out on the scheduler thread"""
+    scheduler = DeadlineScheduler()
+    ran = []
+    scheduler.call_later(0, lambda: ran.append("deadline"))
+    for number in range(5):
+        scheduler.submit(lambda number=number: ran.append((number, scheduler.on_thread())))
+    assert scheduler.flush(2.0)
+    time.sleep(0.05)
+    assert [entry for entry in ran if entry != "deadline"] == [(number, True) for number in range(5)]
+    assert "deadline" in ran
+    assert not scheduler.on_thread()
+    scheduler.close()
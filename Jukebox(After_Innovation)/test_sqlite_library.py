@@ -0,0 +1,118 @@
+import pytest
+import os
+import csv
+import sqlite3
+from sqlite_library import SQLiteMusicLibrary
+
+@pytest.fixture
+def sqlite_library(tmp_path):
+    """Create a temporary SQLite library for testing"""
+    # A new database and no CSV to migrate, so the library starts empty
+    library = SQLiteMusicLibrary(str(tmp_path / "test_tracks.db"), library_file=str(tmp_path / "test_tracks.csv"))
+    library._observers = []
+
+    yield library
+    library.close()
+
+def test_add_and_remove_track(sqlite_library):
+    """Test adding and removing tracks through the database"""
+    assert sqlite_library.add_track("01", "Test Track", "Test Artist", 4)
+    assert sqlite_library.get_name("01") == "Test Track"
+    sqlite_library.flush()
+
+    row = sqlite_library._connection.execute(
+        "SELECT name, artist, rating FROM tracks WHERE track_id = '01'"
+    ).fetchone()
+    assert row == ("Test Track", "Test Artist", 4)
+
+    assert sqlite_library.remove_track("01")
+    assert "01" not in sqlite_library._library
+    sqlite_library.flush()
+    assert sqlite_library._connection.execute("SELECT COUNT(*) FROM tracks").fetchone()[0] == 0
+
+def test_rating_and_play_count_update_row(sqlite_library):
+    """Test rating and play count changes update the stored row"""
+    sqlite_library.add_track("01", "Test Track", "Test Artist", 3)
+    sqlite_library.set_rating("01", 5)
+    sqlite_library.increment_play_count("01")
+    sqlite_library.flush()
+
+    # A fresh connection sees the committed values
+    connection = sqlite3.connect(sqlite_library._db_file)
+    row = connection.execute("SELECT rating, play_count FROM tracks WHERE track_id = '01'").fetchone()
+    connection.close()
+    assert row == (5, 1)
+
+def test_wal_mode(sqlite_library):
+    """Test the database runs in WAL mode"""
+    mode = sqlite_library._connection.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+def test_sorted_by_uses_play_count(sqlite_library):
+    """Test indexed sort queries"""
+    sqlite_library.add_track("01", "Quiet", "Artist", 1, 2)
+    sqlite_library.add_track("02", "Loud", "Artist", 5, 9)
+    sqlite_library.add_track("03", "Middle", "Artist", 3, 5)
+
+    most_played = [track_id for track_id, _ in sqlite_library.sorted_by("play_count")]
+    assert most_played == ["02", "03", "01"]
+
+    lowest_rated = [track_id for track_id, _ in sqlite_library.sorted_by("rating", descending=False, limit=1)]
+    assert lowest_rated == ["01"]
+
+def test_sorted_by_breaks_ties_by_id(sqlite_library):
+    """Test equal values come back in numeric id order, as with the CSV backend"""
+    for track_id in ("10", "02", "07"):
+        sqlite_library.add_track(track_id, f"Track {track_id}", "Artist", 3, 4)
+    sqlite_library.add_track("05", "Top", "Artist", 3, 8)
+
+    assert [track_id for track_id, _ in sqlite_library.sorted_by("play_count")] == ["05", "02", "07", "10"]
+    assert [track_id for track_id, _ in sqlite_library.sorted_by("rating", descending=False)] == ["02", "05", "07", "10"]
+
+def test_sorted_pages_come_from_the_database(sqlite_library, monkeypatch):
+    """Test sorted_page and iter_sorted run the indexed query, cursors included, without the in-memory index"""
+    monkeypatch.setattr(SQLiteMusicLibrary, '_SORT_CHUNK', 2)  # Several chunks for a handful of tracks
+    for track_id, plays in (("01", 3), ("02", 9), ("03", 3), ("04", 0), ("05", 3)):
+        sqlite_library.add_track(track_id, f"Track {track_id}", "Artist", 1, plays)
+
+    assert [key for key, _ in sqlite_library.sorted_page("play_count", offset=1, limit=3)] == ["01", "03", "05"]
+    assert [key for key, _ in sqlite_library.iter_sorted("play_count")] == ["02", "01", "03", "05", "04"]
+    cursor = sqlite_library.cursor_for("03", "play_count")
+    assert [key for key, _ in sqlite_library.iter_sorted("play_count", after=cursor)] == ["05", "04"]
+    assert [key for key, _ in sqlite_library.iter_sorted("play_count", descending=False, limit=2)] == ["04", "01"]
+    assert sqlite_library._sorted_indexes["play_count"]._source is None  # Never built
+
+def test_search_after_import(sqlite_library, tmp_path):
+    """Test indexes and cached results follow the tracks an import brings in"""
+    sqlite_library.add_track("01", "Hello", "Adele", 5)
+    assert sqlite_library.search_track_ids("hello", "Both") == ["01"]
+    assert sqlite_library.get_unique_artists() == {"Adele"}
+
+    source = tmp_path / "catalog.csv"
+    with open(source, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+        writer.writerow(['01', 'Unholy', 'Sam Smith', '4', '0'])
+    sqlite_library.import_csv(str(source))
+
+    assert sqlite_library.search_track_ids("unholy", "Both") == ["01"]
+    assert sqlite_library.search_track_ids("hello", "Both") == []
+    assert sqlite_library.get_unique_artists() == {"Sam Smith"}
+
+def test_csv_import_export(sqlite_library, tmp_path):
+    """Test migrating to and from the tracks.csv layout"""
+    source = tmp_path / "catalog.csv"
+    with open(source, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+        writer.writerow(['01', 'Qua Từng Khung Hình', 'Artist One', '4', '7'])
+        writer.writerow(['02', 'Second', 'Artist Two', '2', '0'])
+
+    assert sqlite_library.import_csv(str(source)) == 2
+    assert sqlite_library.get_play_count("01") == 7
+    assert sqlite_library.get_unique_artists() == {"Artist One", "Artist Two"}
+
+    target = tmp_path / "export.csv"
+    assert sqlite_library.export_csv(str(target)) == 2
+    with open(source, newline='', encoding='utf-8') as original, open(target, newline='', encoding='utf-8') as exported:
+        assert list(csv.reader(original)) == list(csv.reader(exported))
@@ -1,7 +1,8 @@
 import pytest
 import os
 import csv
-from track_library import MusicLibrary, CSVHandler
+import time
+from track_library import MusicLibrary, CSVHandler, LibraryChangeEvent
 from library_item import Track
 
 @pytest.fixture
@@ -11,17 +12,14 @@ def temp_library(tmp_path):
     if not os.path.exists(tmp_path):
         os.makedirs(tmp_path)
     
-    # Initialize library with test file path
-    library = MusicLibrary()
-    library._library_file = str(tmp_path / "test_tracks.csv")
-    
     # Create initial CSV file with headers
-    with open(library._library_file, 'w', newline='') as f:
+    library_file = str(tmp_path / "test_tracks.csv")
+    with open(library_file, 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
     
-    # Clear any existing data
-    library._library = {}
+    # Initialize library with test file path
+    library = MusicLibrary(library_file=library_file)
     library._observers = []
     
     return library
@@ -149,4 +147,431 @@ def test_csv_file_structure(temp_library):
         reader = csv.reader(f)
         header = next(reader)
         expected_header = ['track_id', 'name', 'artist', 'rating', 'play_count']
-        assert header == expected_header, f"Expected header {expected_header}, got {header}"
\ No newline at end of file
+        assert header == expected_header, f"Expected header {expected_header}, got {header}"
+
+def test_play_count_journaled(temp_library):
+    """Test play events go to the journal instead of rewriting the CSV"""
+    temp_library.add_track("01", "Test Track", "Test Artist")
+    temp_library.flush()
+    temp_library.increment_play_count("01")
+    temp_library.increment_play_count("01")
+
+    # CSV still holds the count from add_track, the plays live in the journal
+    with open(temp_library._library_file, 'r', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]['play_count'] == '0'
+    with open(temp_library._journal_file, 'r') as f:
+        assert f.read().split() == ["01", "01"]
+
+def test_play_journal_replay(temp_library):
+    """Test journaled plays survive a restart before compaction"""
+    temp_library.add_track("01", "Test Track", "Test Artist")
+    temp_library.flush()
+    temp_library.increment_play_count("01")
+
+    # Simulate a restart by reloading from disk
+    temp_library._library.clear()
+    temp_library._initialize_library()
+    assert temp_library.get_play_count("01") == 1
+
+def test_play_journal_compaction(temp_library):
+    """Test compaction folds the journal into the CSV"""
+    temp_library.add_track("01", "Test Track", "Test Artist")
+    temp_library.increment_play_count("01")
+    assert temp_library.flush()
+
+    assert not os.path.exists(temp_library._journal_file)
+    with open(temp_library._library_file, 'r', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]['play_count'] == '1'
+
+    # Nothing left to replay, so the count is not doubled on restart
+    temp_library._library.clear()
+    temp_library._initialize_library()
+    assert temp_library.get_play_count("01") == 1
+
+def test_mutations_are_coalesced(temp_library):
+    """Test a burst of edits is written as one batch by flush()"""
+    temp_library.add_track("01", "Test Track", "Test Artist")
+    for rating in [1, 2, 3, 4]:
+        temp_library.set_rating("01", rating)
+
+    # Nothing has been written yet
+    with open(temp_library._library_file, 'r', newline='') as f:
+        assert len(list(csv.reader(f))) == 1
+    assert temp_library._dirty == {"01"}
+
+    assert temp_library.flush()
+    assert not temp_library._dirty
+    with open(temp_library._library_file, 'r', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]['rating'] == '4'
+
+def test_removal_is_flushed(temp_library):
+    """Test removed tracks disappear from the CSV on flush"""
+    temp_library.add_track("01", "Track 1", "Artist 1")
+    temp_library.add_track("02", "Track 2", "Artist 2")
+    temp_library.flush()
+
+    temp_library.remove_track("01")
+    temp_library.flush()
+    with open(temp_library._library_file, 'r', newline='') as f:
+        assert [row['track_id'] for row in csv.DictReader(f)] == ["02"]
+
+def test_background_flush(temp_library):
+    """Test the flusher writes pending changes once the dirty limit is reached"""
+    temp_library._max_dirty = 2
+    temp_library.add_track("01", "Track 1", "Artist 1")
+    temp_library.add_track("02", "Track 2", "Artist 2")
+
+    deadline = time.time() + 5
+    while temp_library._dirty and time.time() < deadline:
+        time.sleep(0.05)
+    assert not temp_library._dirty
+
+def test_close_flushes_pending_writes(temp_library):
+    """Test close() writes pending changes"""
+    temp_library.add_track("01", "Test Track", "Test Artist")
+    temp_library.close()
+    with open(temp_library._library_file, 'r', newline='') as f:
+        assert [row['track_id'] for row in csv.DictReader(f)] == ["01"]
+
+def test_reload_applies_row_diff(temp_library):
+    """Test reload only touches rows that changed and keeps Track identity"""
+    temp_library.add_track("01", "Track 1", "Artist 1", 3)
+    temp_library.add_track("02", "Track 2", "Artist 2", 4)
+    temp_library.flush()
+    unchanged = temp_library._library["01"]
+    edited = temp_library._library["02"]
+
+    # An external tool edits one row, removes nothing and adds a track
+    with open(temp_library._library_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+        writer.writerow(['01', 'Track 1', 'Artist 1', '3', '0'])
+        writer.writerow(['02', 'Track 2', 'Artist 2', '1', '5'])
+        writer.writerow(['03', 'Track 3', 'Artist 3', '2', '0'])
+
+    added, removed, updated = temp_library._load_library_from_csv()
+    assert added == {"03"}
+    assert removed == set()
+    assert updated == {"02": {"rating", "play_count"}}
+    assert temp_library._library["01"] is unchanged
+    assert temp_library._library["02"] is edited
+    assert edited.rating == 1 and edited.play_count == 5
+
+def test_reload_without_changes_does_not_notify(temp_library):
+    """Test touching the CSV without changing it does not notify observers"""
+    temp_library.add_track("01", "Track 1", "Artist 1")
+    temp_library.flush()
+    observer = MockLibraryObserver()
+    temp_library.add_observer(observer)
+
+    temp_library._last_modified = 0  # Pretend the file was touched externally
+    temp_library.reload_library()
+    assert observer.changes == 0
+
+class MockEventObserver:
+    def __init__(self):
+        self.events = []
+
+    def on_library_change(self, event=None):
+        self.events.append(event)
+
+def test_change_events(temp_library):
+    """Test observers receive which tracks and fields changed"""
+    observer = MockEventObserver()
+    legacy_observer = MockLibraryObserver()
+    temp_library.add_observer(observer)
+    temp_library.add_observer(legacy_observer)
+
+    temp_library.add_track("01", "Test Track", "Test Artist")
+    temp_library.set_rating("01", 4)
+    temp_library.increment_play_count("01")
+    temp_library.remove_track("01")
+
+    added, rated, played, removed = observer.events
+    assert isinstance(added, LibraryChangeEvent)
+    assert added.added == {"01"}
+    assert rated.updated == {"01": {"rating"}}
+    assert played.changed_fields == {"play_count"}
+    assert removed.removed == {"01"}
+
+    # Observers with the old no-argument hook keep working
+    assert legacy_observer.changes == 4
+
+def test_library_view_is_read_only(temp_library):
+    """Test the library property is a live read-only view"""
+    view = temp_library.library
+    temp_library.add_track("01", "Test Track", "Test Artist")
+    assert "01" in view
+    with pytest.raises(TypeError):
+        view["02"] = view["01"]
+
+def test_track_rows(temp_library):
+    """Test bulk rows come back sorted by numeric track id"""
+    temp_library.add_track("10", "Track 10", "Artist", 2, 7)
+    temp_library.add_track("02", "Track 2", "Artist", 5, 1)
+    assert temp_library.track_rows() == [
+        ("02", "Track 2", "Artist", 5, 1),
+        ("10", "Track 10", "Artist", 2, 7),
+    ]
+
+def test_startup_uses_snapshot(temp_library, monkeypatch):
+    """Test a valid snapshot is loaded without parsing the CSV"""
+    temp_library.add_track("01", "Test Track", "Test Artist", 3, 40)
+    assert not os.path.exists(temp_library._library_file + '.snapshot')  # Only written on close
+    temp_library.close()
+    assert os.path.exists(temp_library._library_file + '.snapshot')
+
+    temp_library._library = {}
+    def fail():
+        raise AssertionError("CSV should not be parsed")
+    monkeypatch.setattr(temp_library, '_load_library_from_csv', fail)
+    temp_library._initialize_library()
+    assert temp_library.get_play_count("01") == 40
+    assert temp_library.get_rating("01") == 3
+
+def test_file_watcher_is_opt_in(temp_library):
+    """Test the CSV watcher only runs once requested, on the CSV's directory"""
+    assert not hasattr(temp_library, 'observer')
+    temp_library.start_watching()
+    try:
+        watches = list(temp_library.observer.emitters)
+        assert watches[0].watch.path == os.path.dirname(temp_library._library_file)
+        assert "file watcher started" in temp_library.startup_report()
+    finally:
+        temp_library.stop_watching()
+    assert not hasattr(temp_library, 'observer')
+
+def test_shared_library_is_created_once(monkeypatch):
+    """Test the shared library is built lazily and reused"""
+    import track_library
+    created = []
+    monkeypatch.setattr(track_library, '_shared_library', None)
+    monkeypatch.setattr(track_library, 'create_library', lambda: created.append(1) or "library")
+    assert track_library.library == "library"
+    assert track_library.get_library() == "library"
+    assert len(created) == 1
+
+def test_add_tracks_bulk(temp_library):
+    """Test bulk add reports each item, writes once and sends one event"""
+    temp_library.add_track("01", "Existing", "Artist")
+    temp_library.flush()
+    observer = MockEventObserver()
+    temp_library.add_observer(observer)
+    writes = []
+    original = temp_library._write_batch
+    temp_library._write_batch = lambda dirty, removed: writes.append(set(dirty)) or original(dirty, removed)
+
+    result = temp_library.add_tracks([
+        ("02", "Song 2", "Artist", 4),
+        {'track_id': '3', 'name': 'Song 3', 'artist': 'Artist', 'rating': '2', 'play_count': '7'},
+        ("01", "Duplicate", "Artist"),
+        ("04", "Song 4", "Artist", 9),
+        ("05", "", "Artist"),
+    ])
+
+    assert result.succeeded == ["02", "03"]
+    assert set(result.failed) == {"01", "04", "05"}
+    assert result.persisted and not result
+    assert writes == [{"02", "03"}]
+    assert len(observer.events) == 1 and observer.events[0].added == {"02", "03"}
+    assert temp_library.get_play_count("03") == 7
+    with open(temp_library._library_file, newline='') as f:
+        assert [row['track_id'] for row in csv.DictReader(f)] == ["01", "02", "03"]
+
+def test_add_tracks_normalizes_ids(temp_library):
+    """Test bulk add rejects missing ids and treats 1, 01 and 001 as the same track"""
+    result = temp_library.add_tracks([
+        {'name': 'No id', 'artist': 'Artist'},
+        {'track_id': '  ', 'name': 'Blank id', 'artist': 'Artist'},
+        ("1", "Song 1", "Artist"),
+        ("001", "Again", "Artist"),
+        ("-3", "Negative", "Artist"),
+    ])
+    assert result.succeeded == ["01"]
+    assert result.failed["01"] == "Track 01 already exists"
+    assert result.failed[""] == "Track ID is required"
+    assert result.failed["-3"] == "Track ID must not be negative"
+    assert "00" not in temp_library._library
+    assert temp_library.update_tracks([("0001", {'rating': 3})]).succeeded == ["01"]
+    with open(temp_library._library_file, newline='') as f:
+        assert [row['track_id'] for row in csv.DictReader(f)] == ["01"]
+
+def test_single_and_bulk_add_share_one_key(temp_library):
+    """Test add_track and add_tracks store '001' under the same key, so the two forms collide"""
+    assert temp_library.add_track("001", "Single", "Artist")
+    assert list(temp_library._library) == ["01"]
+    assert temp_library.add_tracks([("1", "Bulk", "Artist")]).failed == {"01": "Track 01 already exists"}
+    assert not temp_library.add_track(1, "Again", "Artist")
+    assert temp_library.get_name("0001") == "Single"
+    temp_library.set_rating(1, 4)
+    assert temp_library.get_rating("01") == 4
+    assert temp_library.remove_track("001")
+    assert len(temp_library._library) == 0
+
+def test_update_tracks_bulk(temp_library):
+    """Test bulk update applies valid changes and reports the rest"""
+    temp_library.add_tracks([("01", "Song 1", "Artist"), ("02", "Song 2", "Artist")])
+    observer = MockEventObserver()
+    temp_library.add_observer(observer)
+
+    result = temp_library.update_tracks([
+        {'track_id': '01', 'rating': 5},
+        ("02", {'name': 'Renamed', 'play_count': 3}),
+        {'track_id': '09', 'rating': 1},
+        {'track_id': '01', 'colour': 'red'},
+    ])
+
+    assert result.succeeded == ["01", "02"]
+    assert set(result.failed) == {"09", "01"}
+    assert temp_library.get_rating("01") == 5
+    assert temp_library.get_name("02") == "Renamed"
+    assert len(observer.events) == 1
+    assert observer.events[0].updated == {"01": {"rating"}, "02": {"name", "play_count"}}
+
+def test_search_index_follows_library(temp_library):
+    """Test search results stay current after adds, removes and reloads"""
+    temp_library.add_track("01", "Hello", "Adele")
+    temp_library.add_track("02", "Skyfall", "Adele")
+    assert temp_library.search_track_ids("adele", "Artist") == ["01", "02"]
+    temp_library.remove_track("01")
+    temp_library.add_track("03", "Hello Again", "Someone")
+    assert temp_library.search_track_ids("hello", "Both") == ["03"]
+    temp_library.flush()
+
+    with open(temp_library._library_file, 'a', newline='') as f:
+        csv.writer(f).writerow(['04', 'Hello From The CSV', 'Editor', 0, 0])
+    temp_library._last_modified = 0
+    temp_library.reload_library()
+    assert temp_library.search_track_ids("hello", "Track Name") == ["03", "04"]
+
+def test_fuzzy_search(temp_library):
+    """Test fuzzy search ignores diacritics and follows library changes"""
+    temp_library.add_track("01", "QUA TỪNG KHUNG HÌNH", "Nguyễn Văn A")
+    temp_library.add_track("02", "Believer", "Imagine Dragons")
+    assert temp_library.fuzzy_search("qua tung")[0][0] == "01"
+    assert temp_library.fuzzy_search("nguyen", "Artist")[0][0] == "01"
+    assert temp_library.fuzzy_search("belever", "Track Name")[0][0] == "02"
+    temp_library.remove_track("02")
+    assert temp_library.fuzzy_search("believer") == []
+
+def test_prefix_search(temp_library):
+    """Test search-as-you-type lookups and narrowing"""
+    temp_library.add_track("01", "Love Yourself", "Justin Bieber")
+    temp_library.add_track("02", "Love Story", "Taylor Swift")
+    first = temp_library.prefix_search("lo", "Both")
+    assert first == ["01", "02"]
+    assert temp_library.prefix_search("love ta", "Both", within=first) == ["02"]
+    assert temp_library.prefix_search("just", "Track Name") == []
+
+def test_top_and_bottom_k(temp_library):
+    """Test top_k/bottom_k follow play count changes"""
+    temp_library.add_tracks([("01", "A", "X", 3, 5), ("02", "B", "X", 1, 9), ("03", "C", "X", 5, 0)])
+    assert [key for key, _ in temp_library.top_k("play_count", 2)] == ["02", "01"]
+    for _ in range(10):
+        temp_library.increment_play_count("03")
+    assert [key for key, _ in temp_library.top_k("play_count", 1)] == ["03"]
+    assert [key for key, _ in temp_library.bottom_k("rating", 1)] == ["02"]
+    assert [key for key, _ in temp_library.sorted_page("rating", offset=1, limit=5)] == ["01", "02"]
+    with pytest.raises(ValueError):
+        temp_library.top_k("name", 1)
+
+def test_artist_catalog(temp_library):
+    """Test artist lookups include featured appearances"""
+    temp_library.add_tracks([
+        ("01", "La la la", "Naughty Boy, Sam Smith", 5, 3),
+        ("02", "Too Good at Goodbyes", "Sam Smith", 3, 1),
+    ])
+    assert temp_library.get_unique_artists() == {"Naughty Boy", "Sam Smith"}
+    assert temp_library.tracks_by_artist("Sam Smith") == ["01", "02"]
+    assert temp_library.artist_stats("sam smith") == ("Sam Smith", 2, 4, 4.0)
+    temp_library.set_rating("02", 5)
+    assert temp_library.artist_stats("Sam Smith")[3] == 5.0
+
+def test_query(temp_library):
+    """Test compiled queries combine index lookups with the remaining conditions"""
+    temp_library.add_tracks([
+        ("01", "Hello", "Adele", 5, 2),
+        ("02", "Skyfall", "Adele", 4, 40),
+        ("03", "Someone Like You", "Adele", 5, 7),
+        ("04", "Halo", "Beyonce", 5, 1),
+    ])
+    assert [key for key, _ in temp_library.query("artist:adele rating>=4 plays<10")] == ["01", "03"]
+    assert [key for key, _ in temp_library.query("rating=5 sort:-plays limit:2")] == ["03", "01"]
+    assert [key for key, _ in temp_library.query("sort:plays offset:1 limit:2")] == ["01", "03"]
+    assert [key for key, _ in temp_library.query("id>=2 rating!=4")] == ["03", "04"]
+    assert [key for key, _ in temp_library.query("sort:-name limit:1")] == ["03"]
+    temp_library.increment_play_count("04")
+    assert [key for key, _ in temp_library.query("halo plays:2")] == ["04"]
+
+def test_result_cache_versions(temp_library):
+    """Test cached searches survive unrelated changes and follow related ones"""
+    temp_library.add_tracks([("01", "Hello", "Adele", 5, 2), ("02", "Halo", "Beyonce", 4, 1)])
+    version = temp_library.version
+    assert temp_library.search_track_ids("h", "Track Name") == ["01", "02"]
+    temp_library.increment_play_count("01")  # Names did not change
+    assert temp_library.version == version + 1
+    hits = temp_library.cache_stats()["hits"]
+    assert temp_library.search_track_ids("h", "Track Name") == ["01", "02"]
+    assert temp_library.cache_stats()["hits"] == hits + 1
+    assert [key for key, _ in temp_library.top_k("play_count", 1)] == ["01"]
+    for _ in range(3):
+        temp_library.increment_play_count("02")
+    assert [key for key, _ in temp_library.top_k("play_count", 1)] == ["02"]
+    temp_library.remove_track("01")
+    assert temp_library.search_track_ids("h", "Track Name") == ["02"]
+
+def test_paged_iteration_with_cursors(temp_library):
+    """Test listings resume after a cursor even when tracks change between pages"""
+    temp_library.add_tracks([(str(i).zfill(2), f"Song {i}", "Artist", i % 3, i) for i in range(1, 11)])
+    first = list(temp_library.iter_tracks(limit=4))
+    assert [key for key, _ in first] == ["01", "02", "03", "04"]
+    cursor = temp_library.cursor_for(first[-1][0])
+    temp_library.remove_track("05")
+    assert [key for key, _ in temp_library.iter_tracks(limit=3, after=cursor)] == ["06", "07", "08"]
+    assert [key for key, _ in temp_library.iter_tracks(offset=8)] == ["10"]
+
+    assert [key for key, _ in temp_library.iter_search("song 1", "Track Name", after="01")] == ["10"]
+
+    page = list(temp_library.iter_sorted("rating", limit=4))
+    assert [key for key, _ in page] == ["02", "08", "01", "04"]  # Rating 2 first, ties in id order
+    cursor = temp_library.cursor_for(page[-1][0], "rating")
+    rest = [key for key, _ in temp_library.iter_sorted("rating", after=cursor)]
+    assert rest == ["07", "10", "03", "06", "09"]
+
+def test_duplicate_detection(temp_library):
+    """Test re-uploads of a song are recognised before they are added"""
+    temp_library.add_track("01", "Unholy", "Sam Smith, Kim Petras")
+    assert temp_library.find_duplicates("Sam Smith, Kim Petras - Unholy (Official Music Video)", "SamSmithVEVO") == ["01"]
+    assert temp_library.find_duplicates("Unholy (Live)", "Sam Smith") == []
+    result = temp_library.add_tracks([
+        ("02", "Kim Petras - Unholy [Lyrics]", "7clouds"),
+        ("03", "Timber (feat. Ke$ha)", "Pitbull"),
+        ("04", "Pitbull - Timber (Official Video)", "PitbullVEVO"),
+    ], skip_duplicates=True)
+    assert result.succeeded == ["03"]
+    assert result.failed == {"02": "Likely duplicate of track 01", "04": "Likely duplicate of track 03"}
+
+def test_audio_info_is_probed_once(temp_library, tmp_path):
+    """Test audio metadata is cached, persisted and refreshed when the file changes"""
+    import wave
+    os.makedirs(tmp_path / "tracks")
+    path = tmp_path / "tracks" / "track_01.wav"
+    def write(seconds):
+        with wave.open(str(path), 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(1)
+            w.setframerate(8000)
+            w.writeframes(b'\x80' * 8000 * seconds)
+    write(2)
+    temp_library.add_track("01", "Tone", "Generator")
+    assert temp_library.audio_path("01") == str(path)
+    assert temp_library.get_audio_info("01").duration == 2.0
+    assert temp_library.scan_audio_info() == 0  # Already known and unchanged
+    assert temp_library._save_audio_info()
+    temp_library._audio_info_source = None  # Forget memory; read the saved metadata back
+    assert temp_library.get_audio_info("01").sample_rate == 8000
+    write(5)
+    assert temp_library.get_audio_info("01").duration == 5.0
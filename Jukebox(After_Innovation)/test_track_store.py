@@ -0,0 +1,104 @@
+import pytest
+import csv
+from track_store import CompactTrackStore, StoredTrack
+from track_library import MusicLibrary
+from library_item import Track
+
+def make_track(name, artist, rating=0, play_count=0):
+    track = Track(name, artist, rating)
+    track.set_play_count(play_count)
+    return track
+
+def test_store_round_trip():
+    """Test tracks read back from the columns match what was stored"""
+    store = CompactTrackStore()
+    store["01"] = make_track("Song", "Artist", 4, 12)
+    track = store["01"]
+    assert isinstance(track, StoredTrack)
+    assert (track.name, track.artist, track.rating, track.play_count) == ("Song", "Artist", 4, 12)
+    assert track.info() == "Song - Artist ****"
+    assert "01" in store and "1" not in store
+    assert len(store) == 1
+
+def test_proxy_writes_through():
+    """Test changes made through a proxy land in the store"""
+    store = CompactTrackStore()
+    store["01"] = make_track("Song", "Artist")
+    store["01"].rating = 3
+    store["01"].increment_play_count()
+    store["01"].rating = 9  # Out of range, ignored like on Track
+    assert store["01"].rating == 3
+    assert store["01"].play_count == 1
+
+def test_delete_keeps_other_rows():
+    """Test deleting a row does not disturb proxies for the other tracks"""
+    store = CompactTrackStore()
+    for index in range(1, 4):
+        store[str(index).zfill(2)] = make_track(f"Song {index}", "Artist", index)
+    last = store["03"]
+    del store["01"]
+    assert list(sorted(store)) == ["02", "03"]
+    assert last.name == "Song 3" and last.rating == 3
+    with pytest.raises(KeyError):
+        store["01"]
+
+def test_artists_are_interned():
+    """Test repeated artist names share one string"""
+    store = CompactTrackStore()
+    store["01"] = make_track("One", "".join(["Ad", "ele"]))
+    store["02"] = make_track("Two", "".join(["Ade", "le"]))
+    assert store["01"].artist is store["02"].artist
+
+def test_compact_library(tmp_path):
+    """Test MusicLibrary works the same on top of the compact store"""
+    library_file = str(tmp_path / "test_tracks.csv")
+    with open(library_file, 'w', newline='') as f:
+        csv.writer(f).writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+    library = MusicLibrary(compact=True, library_file=library_file)
+    library._observers = []
+    assert library.add_track("05", "Song", "Artist", 2)
+    library.set_rating("05", 5)
+    library.increment_play_count("05")
+    assert library.get_rating("05") == 5
+    assert library.get_play_count("05") == 1
+    assert library.track_rows() == [("05", "Song", "Artist", 5, 1)]
+    library.close()
+
+def test_compact_library_bulk_add_validates_keys(tmp_path):
+    """Test a bulk add on the compact store rejects unstorable ids before adding anything"""
+    library_file = str(tmp_path / "test_tracks.csv")
+    with open(library_file, 'w', newline='') as f:
+        csv.writer(f).writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+    library = MusicLibrary(compact=True, library_file=library_file)
+    library._observers = []
+    result = library.add_tracks([("50", "Song", "Artist"), ("007", "Bond", "Artist"), (str(2 ** 40), "Big", "Artist")])
+    assert result.succeeded == ["50", "07"]  # '007' is the same key as '07'
+    assert result.failed == {str(2 ** 40): f"Track ID {2 ** 40} cannot be stored"}
+    assert library.get_name("07") == "Bond"
+    assert library.search_track_ids("bond", "Track Name") == ["07"]  # Indexes saw the batch
+    library.close()
+
+def test_compact_library_loads_non_canonical_csv_ids(tmp_path):
+    """Test ids like '7' and '001' in tracks.csv are padded instead of failing the whole load"""
+    library_file = str(tmp_path / "test_tracks.csv")
+    with open(library_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+        writer.writerows([['7', 'Seven', 'Artist', 3, 1], ['001', 'One', 'Artist', 4, 2], ['x', 'Bad', 'Artist', 0, 0]])
+    library = MusicLibrary(compact=True, library_file=library_file)
+    assert library.track_rows() == [("01", "One", "Artist", 4, 2), ("07", "Seven", "Artist", 3, 1)]
+    with open(library_file, newline='') as f:
+        assert len(list(csv.reader(f))) == 4  # Not replaced by the backup
+    library.close()
+
+def test_compact_library_loads_non_canonical_snapshot_ids(tmp_path):
+    """Test a snapshot row keyed '1' is loaded as '01' instead of crashing the constructor"""
+    from library_snapshot import write_snapshot
+    library_file = str(tmp_path / "test_tracks.csv")
+    with open(library_file, 'w', newline='') as f:
+        csv.writer(f).writerow(['track_id', 'name', 'artist', 'rating', 'play_count'])
+    write_snapshot(library_file + '.snapshot', library_file, [("1", "Hello", "Adele", 5, 12), ("", "Bad", "Artist", 0, 0)])
+    library = MusicLibrary(compact=True, library_file=library_file)
+    assert library._startup_source == 'snapshot'
+    assert library.track_rows() == [("01", "Hello", "Adele", 5, 12)]
+    library.close()
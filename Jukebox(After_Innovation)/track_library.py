@@ -1,18 +1,92 @@
-from typing import Optional, Dict, List, Set  # Import necessary types for type hinting
+from typing import Optional, Dict, List, Set, Tuple, Mapping, MutableMapping, Iterable, Iterator, Callable, Any  # Import necessary types for type hinting
 from library_item import Track  # Import the Track class from library_item module
+from track_store import CompactTrackStore  # Import the columnar store used for very large libraries
+from library_snapshot import read_snapshot, write_snapshot  # Import the binary snapshot used for fast startup
+from audio_probe import AudioInfo, probe_audio  # Import the header probe that times audio files without decoding them
+from library_cache import ResultCache  # Import the versioned cache for search and filter results
+from library_query import compile_query, CompiledQuery, QuerySyntaxError  # Import the query language behind MusicLibrary.query
+from library_index import LibraryIndex, IdIndex, DuplicateIndex, duplicate_keys, TokenIndex, TrigramIndex, PrefixIndex, SortedIndex, ArtistIndex, prefix_matches  # Import the secondary indexes kept in step with the library
 from abc import ABC, abstractmethod  # Import abstract base class and abstract method decorators
+import bisect  # Import bisect to resume paged searches after a cursor
 import csv  # Import CSV module for handling CSV file operations
+from types import MappingProxyType  # Import MappingProxyType for a read-only view of the library
 import os  # Import OS module for interacting with the operating system
 import time  # Import time module for time-related functions
-from watchdog.observers import Observer  # Import Observer class from watchdog for file monitoring
+import atexit  # Import atexit to flush pending writes on interpreter shutdown
+import inspect  # Import inspect to detect observers that still use the no-argument hook
+import weakref  # Import weakref to track open libraries without keeping them alive
+from itertools import islice  # Import islice to start streams part way through a result
+from threading import Thread, Event, Lock, RLock, current_thread  # Import threading primitives for the background flusher
 from watchdog.events import FileSystemEventHandler  # Import event handler for file system events
 
+class LibraryChangeEvent:
+    """Describes which tracks a library update added, removed or modified"""
+    def __init__(self, added: Optional[Set[str]] = None, removed: Optional[Set[str]] = None,
+                 updated: Optional[Dict[str, Set[str]]] = None):
+        self.added: Set[str] = set(added or ())  # Track ids that were added
+        self.removed: Set[str] = set(removed or ())  # Track ids that were removed
+        self.updated: Dict[str, Set[str]] = dict(updated or {})  # Track id -> names of changed fields
+
+    @property
+    def changed_fields(self) -> Set[str]:
+        """All fields modified on any updated track"""
+        return set().union(*self.updated.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.updated)
+
+    def __repr__(self) -> str:
+        return f"LibraryChangeEvent(added={self.added}, removed={self.removed}, updated={self.updated})"
+
+class BulkResult:
+    """Per-item outcome of a bulk add or update, in input order"""
+    def __init__(self):
+        self.items: List[Tuple[str, bool, str]] = []  # (track_id, succeeded, message)
+        self.persisted = False  # Whether the successful items reached storage
+
+    def record(self, track_id: str, succeeded: bool, message: str = "ok") -> None:
+        self.items.append((track_id, succeeded, message))
+
+    @property
+    def succeeded(self) -> List[str]:
+        """Track ids that were applied"""
+        return [track_id for track_id, ok, _ in self.items if ok]
+
+    @property
+    def failed(self) -> Dict[str, str]:
+        """Track id -> reason for every item that was rejected"""
+        return {track_id: message for track_id, ok, message in self.items if not ok}
+
+    def __bool__(self) -> bool:
+        return bool(self.items) and all(ok for _, ok, _ in self.items)
+
+    def __repr__(self) -> str:
+        return f"BulkResult(succeeded={len(self.succeeded)}, failed={self.failed}, persisted={self.persisted})"
+
 class LibraryObserver(ABC):
     """Observer interface for library updates"""
     @abstractmethod
-    def on_library_change(self) -> None:
+    def on_library_change(self, event: Optional[LibraryChangeEvent] = None) -> None:
+        """Called after the library changed; event is None when everything may have changed"""
         pass
 
+# Observer types whose on_library_change accepts a change event
+_event_aware_observers: Dict[type, bool] = {}
+
+def _accepts_change_event(observer) -> bool:
+    """Check whether an observer implements the hook that takes a change event"""
+    observer_type = type(observer)
+    if observer_type not in _event_aware_observers:
+        try:
+            parameters = inspect.signature(observer.on_library_change).parameters.values()
+            _event_aware_observers[observer_type] = any(
+                parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD, parameter.VAR_POSITIONAL)
+                for parameter in parameters
+            )
+        except (TypeError, ValueError):
+            _event_aware_observers[observer_type] = False  # Fall back to the original no-argument hook
+    return _event_aware_observers[observer_type]
+
 class CSVHandler(FileSystemEventHandler):
     """Handler for CSV file changes"""
     def __init__(self, library):
@@ -23,24 +97,78 @@ class CSVHandler(FileSystemEventHandler):
         if not event.is_directory and event.src_path.endswith('tracks.csv'):
             self.library.reload_library()  # Reload library if the tracks.csv file is modified
 
+# Libraries with a background flusher, flushed once more when the interpreter exits
+_open_libraries = weakref.WeakSet()
+
 class MusicLibrary:
     """Enhanced music library with observer pattern and CSV storage"""
-    def __init__(self):
+    # Compact the play journal into tracks.csv once it holds this many events...
+    _JOURNAL_MAX_ENTRIES = 100
+    # ...or once its oldest event is this many seconds old
+    _JOURNAL_MAX_AGE = 30.0
+    # Number of search and filter results kept in the result cache
+    _RESULT_CACHE_SIZE = 256
+
+    def __init__(self, flush_interval: float = 2.0, max_dirty: int = 50, compact: bool = False,
+                 watch: bool = False, library_file: Optional[str] = None):
         # Get the directory containing the script
         current_dir = os.path.dirname(os.path.abspath(__file__))
-        # Set the library file path relative to the script location
-        self._library_file = os.path.join(current_dir, "tracks.csv")
-        self._library: Dict[str, Track] = {}
+        # Set the library file path relative to the script location unless told otherwise
+        self._library_file = library_file or os.path.join(current_dir, "tracks.csv")
+        # The compact store keeps tracks in columns instead of one object each, for very large libraries
+        self._library: MutableMapping[str, Track] = CompactTrackStore() if compact else {}
         self._observers: List[LibraryObserver] = []
         self._last_modified = 0
+        self._write_lock = RLock()  # Guards pending changes against a concurrent flush
+        self._flush_interval = flush_interval  # Seconds a change may wait before it is written
+        self._max_dirty = max_dirty  # Write immediately once this many tracks are pending
+        self._dirty: Set[str] = set()  # Added or modified tracks not yet written
+        self._removed: Set[str] = set()  # Removed tracks not yet written
+        self._dirty_since: Optional[float] = None  # When the oldest pending change was made
+        self._journal_entries = 0  # Number of play events not yet folded into the CSV
+        self._journal_since: Optional[float] = None  # When the oldest journaled play was made
+        self._flush_event = Event()  # Wakes the flusher early when a limit is reached
+        self._flusher_thread: Optional[Thread] = None
+        self._closed = False
+        # Secondary indexes, built on first use and then updated from change events
+        self._token_indexes: Dict[str, TokenIndex] = {'name': TokenIndex('name'), 'artist': TokenIndex('artist')}
+        self._trigram_indexes: Dict[str, TrigramIndex] = {'name': TrigramIndex('name'), 'artist': TrigramIndex('artist')}
+        self._prefix_indexes: Dict[str, PrefixIndex] = {'name': PrefixIndex('name'), 'artist': PrefixIndex('artist')}
+        self._sorted_indexes: Dict[str, SortedIndex] = {'play_count': SortedIndex('play_count'), 'rating': SortedIndex('rating')}
+        self._artist_index = ArtistIndex()
+        self._id_index = IdIndex()
+        self._duplicate_index = DuplicateIndex()
+        self._indexes: List[LibraryIndex] = [
+            *self._token_indexes.values(), *self._trigram_indexes.values(), *self._prefix_indexes.values(),
+            *self._sorted_indexes.values(), self._artist_index, self._id_index, self._duplicate_index
+        ]
+        # Search and filter results, valid until a field they read changes
+        self._result_cache = ResultCache(self._RESULT_CACHE_SIZE)
+        self._cache_source: Optional[Mapping[str, Track]] = None  # Track mapping the cached results came from
+        # Durations and formats of the audio files, probed once and kept in tracks.csv.audio
+        self._audio_info: Dict[str, AudioInfo] = {}  # Track id -> info of its audio file
+        self._audio_info_source: Optional[str] = None  # File _audio_info was loaded from
+        self._audio_dirty = False  # Whether _audio_info has entries not yet saved
+        self._audio_lock = Lock()
+        self._audio_scan_thread: Optional[Thread] = None
+        self._startup_timings: Dict[str, float] = {}  # Seconds spent in each startup step
+        self._startup_source = 'csv'  # Where the tracks were loaded from
+        started = time.perf_counter()
         self._initialize_library()
-        self._setup_file_watcher()
+        self._startup_timings['load'] = time.perf_counter() - started
+        if watch:
+            self.start_watching()  # Only the app needs live reloads of tracks.csv
+        _open_libraries.add(self)
 
     def add_track(self, track_id: str, name: str, artist: str, rating: int = 0, play_count: int = 0) -> bool:
         """Add a new track to the library with proper UTF-8 handling"""
         try:
-            # Ensure track_id is properly padded
-            track_id = str(track_id).zfill(2)
+            # Same key rule as add_tracks, so '1', '01' and '001' are one track
+            track_id, error = self._normalize_track_id(track_id)
+            error = error or self._key_error(track_id)
+            if error:
+                print(error)
+                return False
             
             if track_id in self._library:
                 print(f"Track {track_id} already exists")
@@ -52,19 +180,213 @@ class MusicLibrary:
                 
             # Add track to memory first
             track = Track(name, artist, rating)
-            for _ in range(play_count):
-                track.increment_play_count()
-            self._library[track_id] = track
-            
-            # Save to CSV with UTF-8 encoding
-            self._save_library_to_csv()
-            self.notify_observers()
+            track.set_play_count(play_count)
+            with self._write_lock:
+                self._library[track_id] = track
+                self._mark_dirty(track_id)  # The background flusher writes it out
+            self.notify_observers(LibraryChangeEvent(added={track_id}))
             return True
             
         except Exception as e:
             print(f"Error adding track: {str(e)}")
             return False
 
+    _TRACK_FIELDS = ('track_id', 'name', 'artist', 'rating', 'play_count')
+
+    @classmethod
+    def _as_track_fields(cls, item: Any) -> Dict[str, Any]:
+        """Turn a (track_id, name, artist[, rating[, play_count]]) tuple or a dict into named fields"""
+        if isinstance(item, Mapping):
+            return dict(item)
+        return dict(zip(cls._TRACK_FIELDS, item))
+
+    @staticmethod
+    def _normalize_track_id(value: Any) -> Tuple[Optional[str], Optional[str]]:
+        """Turn a track id such as 1, '01' or '001' into its zero-padded key
+
+        Returns:
+            tuple: (key or None, error message or None)
+        """
+        text = str(value if value is not None else '').strip()
+        if not text:
+            return None, "Track ID is required"
+        try:
+            number = int(text)
+        except ValueError:
+            return None, "Track ID must be a number"
+        if number < 0:
+            return None, "Track ID must not be negative"
+        return str(number).zfill(2), None  # The one key form every library method stores and looks up
+
+    @classmethod
+    def _lookup_key(cls, key: Any) -> Any:
+        """The stored key for a track id given as 1, '1' or '001'; unusable ids come back unchanged and miss"""
+        track_id, error = cls._normalize_track_id(key)
+        return key if error else track_id
+
+    def _key_error(self, track_id: str) -> Optional[str]:
+        """Why the library's store cannot hold track_id, or None if it can"""
+        if isinstance(self._library, CompactTrackStore) and not CompactTrackStore.valid_key(track_id):
+            return f"Track ID {track_id} cannot be stored"
+        return None
+
+    @staticmethod
+    def _validate_fields(fields: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Check and convert the name, artist, rating and play_count in fields
+
+        Returns:
+            tuple: (converted fields, error message or None)
+        """
+        converted: Dict[str, Any] = {}
+        for field in ('name', 'artist'):
+            if field in fields:
+                value = str(fields[field] if fields[field] is not None else '').strip()
+                if not value:
+                    return converted, f"{field.capitalize()} must not be empty"
+                converted[field] = value
+        if 'rating' in fields:
+            try:
+                converted['rating'] = int(fields['rating'])
+            except (TypeError, ValueError):
+                return converted, "Rating must be a number"
+            if not 0 <= converted['rating'] <= 5:
+                return converted, "Rating must be between 0 and 5"
+        if 'play_count' in fields:
+            try:
+                converted['play_count'] = int(fields['play_count'])
+            except (TypeError, ValueError):
+                return converted, "Play count must be a number"
+            if converted['play_count'] < 0:
+                return converted, "Play count must not be negative"
+        return converted, None
+
+    def add_tracks(self, tracks: Iterable[Any], skip_duplicates: bool = False) -> BulkResult:
+        """
+        Add many tracks with a single write and a single change event
+
+        Args:
+            tracks: (track_id, name, artist[, rating[, play_count]]) tuples or dicts with those
+                keys, such as the rows of csv.DictReader over a catalog in the tracks.csv layout
+            skip_duplicates: reject tracks that find_duplicates() matches, in the library or
+                earlier in the same batch
+
+        Returns:
+            BulkResult: what happened to each track; invalid tracks are skipped, valid ones still added
+        """
+        result = BulkResult()
+        new_tracks: Dict[str, Track] = {}
+        batch_keys: Dict[Tuple[str, str], str] = {}  # Duplicate key -> track id added earlier in this batch
+        # Validate everything before touching the library
+        for item in tracks:
+            try:
+                fields = self._as_track_fields(item)
+            except Exception as e:
+                result.record(str(item), False, f"Unreadable track: {e}")
+                continue
+            track_id, error = self._normalize_track_id(fields.get('track_id'))
+            error = error or self._key_error(track_id)
+            if error:
+                result.record(track_id or str(fields.get('track_id') or '').strip(), False, error)
+                continue
+            if track_id in self._library or track_id in new_tracks:
+                result.record(track_id, False, f"Track {track_id} already exists")
+                continue
+            if 'name' not in fields or 'artist' not in fields:
+                result.record(track_id, False, "Name and artist are required")
+                continue
+            converted, error = self._validate_fields(fields)
+            if error:
+                result.record(track_id, False, error)
+                continue
+            if skip_duplicates:
+                keys = duplicate_keys(converted['name'], converted['artist'])
+                existing = self.find_duplicates(converted['name'], converted['artist'])
+                existing += [batch_keys[key] for key in keys if key in batch_keys]
+                if existing:
+                    result.record(track_id, False, f"Likely duplicate of track {existing[0]}")
+                    continue
+                batch_keys.update((key, track_id) for key in keys)
+            track = Track(converted['name'], converted['artist'], converted.get('rating', 0))
+            track.set_play_count(converted.get('play_count', 0))
+            new_tracks[track_id] = track
+            result.record(track_id, True)
+
+        if new_tracks:
+            with self._write_lock:
+                for track_id, track in new_tracks.items():
+                    self._library[track_id] = track
+                    self._mark_dirty(track_id)
+                result.persisted = self.flush()  # One atomic write for the whole batch
+            self.notify_observers(LibraryChangeEvent(added=set(new_tracks)))
+        return result
+
+    def update_tracks(self, updates: Iterable[Any]) -> BulkResult:
+        """
+        Change fields of many tracks with a single write and a single change event
+
+        Args:
+            updates: dicts with a track_id and any of name, artist, rating and play_count,
+                or (track_id, {field: value}) pairs
+
+        Returns:
+            BulkResult: what happened to each update; invalid updates are skipped, valid ones still applied
+        """
+        result = BulkResult()
+        changes: Dict[str, Dict[str, Any]] = {}
+        # Validate everything before touching the library
+        for item in updates:
+            try:
+                if isinstance(item, Mapping):
+                    fields = dict(item)
+                    raw_id = fields.pop('track_id', '')
+                else:
+                    raw_id, fields = item
+                    fields = dict(fields)
+            except Exception as e:
+                result.record(str(item), False, f"Unreadable update: {e}")
+                continue
+            track_id, error = self._normalize_track_id(raw_id)
+            if error:
+                result.record(str(raw_id or '').strip(), False, error)
+                continue
+            if track_id not in self._library:
+                result.record(track_id, False, f"Track {track_id} not found")
+                continue
+            unknown = set(fields) - set(self._TRACK_FIELDS[1:])
+            if unknown:
+                result.record(track_id, False, f"Unknown fields: {', '.join(sorted(unknown))}")
+                continue
+            converted, error = self._validate_fields(fields)
+            if error:
+                result.record(track_id, False, error)
+                continue
+            changes.setdefault(track_id, {}).update(converted)  # Later updates to the same track win
+            result.record(track_id, True)
+
+        updated: Dict[str, Set[str]] = {}
+        with self._write_lock:
+            for track_id, fields in changes.items():
+                track = self._library.get(track_id)
+                if track is None:
+                    continue  # Removed by another thread since validation
+                changed = set()
+                for field, value in fields.items():
+                    current = track.play_count if field == 'play_count' else getattr(track, field)
+                    if current == value:
+                        continue
+                    if field == 'play_count':
+                        track.set_play_count(value)
+                    else:
+                        setattr(track, field, value)
+                    changed.add(field)
+                if changed:
+                    updated[track_id] = changed
+                    self._mark_dirty(track_id)
+            result.persisted = self.flush()  # One atomic write for the whole batch
+        if updated:
+            self.notify_observers(LibraryChangeEvent(updated=updated))
+        return result
+
     def remove_track(self, track_id: str) -> bool:
         """
         Remove a track from the library and its audio file
@@ -76,8 +398,8 @@ class MusicLibrary:
             bool: True if successful, False otherwise
         """
         try:
-            # Pad track_id to 2 digits
-            track_id = str(track_id).zfill(2)
+            # Pad track_id to 2 digits, the same key add_track stores
+            track_id = self._lookup_key(track_id)
             
             # Check if track exists
             if track_id not in self._library:
@@ -97,22 +419,11 @@ class MusicLibrary:
                     os.remove(file_path)  # Remove the audio file
                     audio_removed = True  # Set flag to true if audio was removed
                     
-            # Remove from CSV while preserving header and structure
-            rows = []  # Initialize a list to hold CSV rows
-            with open(self._library_file, 'r', newline='') as file:
-                reader = csv.reader(file)  # Create a CSV reader
-                header = next(reader)  # Save header
-                rows.append(header)  # Add header to rows
-                # Keep all rows except the one we want to remove
-                rows.extend([row for row in reader if row[0] != track_id])  # Filter out the track to be removed
-                        
-            # Write back to CSV
-            with open(self._library_file, 'w', newline='') as file:
-                writer = csv.writer(file)  # Create a CSV writer
-                writer.writerows(rows)  # Write all rows back to the CSV file
-                
-            # Update memory
-            self.reload_library()  # Reload the library to reflect changes
+            # Remove from memory; the background flusher removes it from storage
+            with self._write_lock:
+                del self._library[track_id]
+                self._mark_removed(track_id)
+            self.notify_observers(LibraryChangeEvent(removed={track_id}))  # Notify observers about the change
             
             # Print success message
             print(f"Successfully removed track: {track_id} - {track_name} by {track_artist}")  # Notify success
@@ -127,13 +438,141 @@ class MusicLibrary:
             print(f"Error removing track: {e}")  # Print error message if an exception occurs
             return False  # Return failure
 
+    def _mark_dirty(self, track_id: str) -> None:
+        """Queue an added or modified track for the next flush"""
+        with self._write_lock:
+            self._removed.discard(track_id)
+            self._dirty.add(track_id)
+            if self._dirty_since is None:
+                self._dirty_since = time.time()
+            self._schedule_flush()
+
+    def _mark_removed(self, track_id: str) -> None:
+        """Queue a removed track for the next flush"""
+        with self._write_lock:
+            self._dirty.discard(track_id)
+            self._removed.add(track_id)
+            if self._dirty_since is None:
+                self._dirty_since = time.time()
+            self._schedule_flush()
+
+    def _record_play(self, track_id: str, track: Track) -> None:
+        """Count a play in memory and persist it"""
+        with self._write_lock:  # Keep the count and its journal entry in step with a flush
+            track.increment_play_count()  # Increment the play count
+            if self._append_play_event(track_id):  # Append to the journal instead of rewriting the CSV
+                self._schedule_flush()  # Compact in the background by size or age
+            else:
+                self._mark_dirty(track_id)  # Fall back to a regular write so the play is not lost
+
+    def _has_pending_writes(self) -> bool:
+        """Check whether anything still has to reach storage"""
+        return bool(self._dirty or self._removed or self._journal_entries)
+
+    def _next_flush_deadline(self) -> float:
+        """Time at which the pending changes must be written"""
+        deadlines = []
+        if self._dirty_since is not None:
+            deadlines.append(self._dirty_since + self._flush_interval)
+        if self._journal_since is not None:
+            deadlines.append(self._journal_since + self._JOURNAL_MAX_AGE)
+        return min(deadlines) if deadlines else time.time()
+
+    def _flush_due(self) -> bool:
+        """Check whether a size or time limit has been reached"""
+        return (len(self._dirty) + len(self._removed) >= self._max_dirty
+                or self._journal_entries >= self._JOURNAL_MAX_ENTRIES
+                or time.time() >= self._next_flush_deadline())
+
+    def _schedule_flush(self) -> None:
+        """Start the background flusher, or wake it if a limit is reached"""
+        with self._write_lock:
+            if self._closed:
+                return  # close() has already written everything
+            if self._flush_due():
+                self._flush_event.set()
+            if self._flusher_thread is None:
+                self._flusher_thread = Thread(target=self._flush_worker, daemon=True)
+                self._flusher_thread.start()
+
+    def _flush_worker(self) -> None:
+        """Write pending changes in batches until nothing is left"""
+        while True:
+            with self._write_lock:
+                if self._closed or not self._has_pending_writes():
+                    self._flusher_thread = None  # The next change restarts the worker
+                    return
+                timeout = max(0.0, self._next_flush_deadline() - time.time())
+            self._flush_event.wait(timeout)  # Sleep until a limit or deadline is reached
+            self._flush_event.clear()
+            with self._write_lock:
+                due = self._flush_due()
+            if due:
+                if not self.flush():
+                    time.sleep(self._flush_interval)  # Back off before retrying a failed write
+
+    def flush(self) -> bool:
+        """Write all pending changes to storage as one atomic batch"""
+        with self._write_lock:
+            if not self._has_pending_writes():
+                return True
+            if not self._write_batch(set(self._dirty), set(self._removed)):
+                return False
+            self._dirty.clear()
+            self._removed.clear()
+            self._dirty_since = None
+            return True
+
+    def _write_batch(self, dirty: Set[str], removed: Set[str]) -> bool:
+        """Write a batch of changed and removed tracks with one CSV rewrite"""
+        return self._save_library_to_csv()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the flusher and file watcher"""
+        with self._write_lock:
+            self._closed = True
+            flusher = self._flusher_thread
+        self._flush_event.set()  # Let the flusher see the library is closed
+        if flusher is not None and flusher is not current_thread():
+            flusher.join()
+        if self.flush():
+            self._save_snapshot()  # Lets the next start skip parsing the CSV
+        self._save_audio_info()
+        self.stop_watching()
+        _open_libraries.discard(self)
+
+    def start_watching(self) -> None:
+        """Reload the library whenever tracks.csv is changed by another program"""
+        if hasattr(self, 'observer'):
+            return  # Already watching
+        started = time.perf_counter()
+        self._setup_file_watcher()
+        self._startup_timings['watcher'] = time.perf_counter() - started
+
+    def stop_watching(self) -> None:
+        """Stop the file watcher if it is running"""
+        if hasattr(self, 'observer'):
+            self.observer.stop()  # Stop the observer if it exists
+            self.observer.join()  # Wait for the observer thread to finish
+            del self.observer
+
     def _setup_file_watcher(self):
         """Setup watchdog observer for CSV file changes"""
+        from watchdog.observers import Observer  # Imported here so libraries that never watch skip the cost
         self.event_handler = CSVHandler(self)  # Create an instance of CSVHandler
         self.observer = Observer()  # Create an observer instance
-        self.observer.schedule(self.event_handler, path='.', recursive=False)  # Schedule the event handler
+        watch_dir = os.path.dirname(os.path.abspath(self._library_file))  # The CSV's directory, not the working directory
+        self.observer.schedule(self.event_handler, path=watch_dir, recursive=False)  # Schedule the event handler
         self.observer.start()  # Start the observer
 
+    def startup_report(self) -> str:
+        """Describe how long the library took to start and where it was loaded from"""
+        report = f"Loaded {len(self._library)} tracks from {self._startup_source}"
+        report += f" in {self._startup_timings.get('load', 0.0) * 1000:.1f} ms"
+        if 'watcher' in self._startup_timings:
+            report += f", file watcher started in {self._startup_timings['watcher'] * 1000:.1f} ms"
+        return report
+
     def add_observer(self, observer: LibraryObserver) -> None:
         """Add an observer to the library"""
         self._observers.append(observer)  # Append the observer to the list
@@ -143,27 +582,55 @@ class MusicLibrary:
         if observer in self._observers:
             self._observers.remove(observer)  # Remove the observer if it exists
 
-    def notify_observers(self) -> None:
+    def notify_observers(self, event: Optional[LibraryChangeEvent] = None) -> None:
         """Notify all observers about library changes"""
+        for index in self._indexes:
+            index.apply(event, self._library)  # Indexes first, so observers can already query them
+        if event is None:
+            self._result_cache.invalidate()  # Unknown change: drop every cached result
+        else:
+            fields = event.changed_fields
+            if event.added or event.removed:
+                fields.add('membership')
+            self._result_cache.invalidate(fields)  # Results that read none of these fields stay cached
         for observer in self._observers:
-            observer.on_library_change()  # Call the on_library_change method for each observer
+            if _accepts_change_event(observer):
+                observer.on_library_change(event)  # Pass the details to observers that want them
+            else:
+                observer.on_library_change()  # Observers written for the no-argument hook
 
     def reload_library(self) -> None:
         """Reload library from CSV file"""
         try:
             current_modified = os.path.getmtime(self._library_file)  # Get the last modified time of the library file
             if current_modified > self._last_modified:  # Check if the file has been modified
-                self._load_library_from_csv()  # Load the library from the CSV file
+                with self._write_lock:
+                    added, removed, updated = self._load_library_from_csv()  # Apply only the rows that changed
                 self._last_modified = current_modified  # Update the last modified time
-                self.notify_observers()  # Notify observers about the change
+                event = LibraryChangeEvent(added, removed, updated)
+                if event:
+                    self.notify_observers(event)  # Notify observers about the rows that changed
         except Exception as e:
             print(f"Error reloading library: {e}")  # Print error message if an exception occurs
 
-    def _load_library_from_csv(self) -> None:
-        """Load track data from CSV file with improved error handling"""
+    def _load_library_from_csv(self) -> Tuple[Set[str], Set[str], Dict[str, Set[str]]]:
+        """
+        Stream the CSV and apply it to memory row by row
+
+        Existing Track objects are updated in place, so only rows that were
+        added, removed or modified cost any work. Plays still in the journal
+        are added to the stored counts, and changes that were not flushed yet
+        win over the file.
+
+        Returns:
+            tuple: (added track_ids, removed track_ids, {track_id: changed fields})
+        """
+        added: Set[str] = set()
+        removed: Set[str] = set()
+        updated: Dict[str, Set[str]] = {}
         if not os.path.exists(self._library_file):
             self._create_default_csv()
-            return
+            return added, removed, updated
             
         backup_created = False
         try:
@@ -173,22 +640,61 @@ class MusicLibrary:
                 shutil.copy2(self._library_file, self._library_file + '.bak')
                 backup_created = True
 
+            journaled_plays = self._read_play_journal()  # Plays not compacted into the CSV yet
+            pending = self._dirty | self._removed  # Unflushed changes win over the file
+            seen: Set[str] = set()
             with open(self._library_file, 'r', newline='', encoding='utf-8') as file:
                 reader = csv.DictReader(file)
-                self._library.clear()
                 for row in reader:
+                    track_id, id_error = self._normalize_track_id(row.get('track_id'))
+                    id_error = id_error or self._key_error(track_id)
+                    if id_error:
+                        print(f"Skipping row with track ID {row.get('track_id')!r}: {id_error}")
+                        continue  # One bad id must not fail the whole load
+                    if track_id in pending:
+                        seen.add(track_id)
+                        continue
                     try:
-                        track = Track(
-                            name=row['name'],
-                            artist=row['artist'],
-                            rating=int(row['rating'])
-                        )
-                        for _ in range(int(row['play_count'])):
-                            track.increment_play_count()
-                        self._library[row['track_id']] = track
+                        name = row['name']
+                        artist = row['artist']
+                        rating = int(row['rating'])
+                        play_count = int(row['play_count']) + journaled_plays.get(track_id, 0)
                     except Exception as row_error:
                         print(f"Error loading track {row.get('track_id', 'unknown')}: {str(row_error)}")
+                        if track_id in self._library:
+                            seen.add(track_id)  # Keep the last good version of a malformed row
                         continue
+                    seen.add(track_id)
+
+                    track = self._library.get(track_id)
+                    if track is None:
+                        track = Track(name=name, artist=artist, rating=rating)
+                        track.set_play_count(play_count)  # Set directly instead of incrementing play_count times
+                        self._library[track_id] = track
+                        added.add(track_id)
+                        continue
+
+                    # Update the existing Track in place so its identity stays stable
+                    changed = set()
+                    if track.name != name:
+                        track.name = name
+                        changed.add('name')
+                    if track.artist != artist:
+                        track.artist = artist
+                        changed.add('artist')
+                    if track.rating != rating:
+                        track.rating = rating
+                        changed.add('rating')
+                    if track.play_count != play_count:
+                        track.set_play_count(play_count)
+                        changed.add('play_count')
+                    if changed:
+                        updated[track_id] = changed
+
+            # Tracks whose rows are gone were removed from the file
+            removed = {key for key in self._library if key not in seen and key not in pending}
+            for key in removed:
+                del self._library[key]
 
         except Exception as e:
             print(f"Error loading library file: {str(e)}")
@@ -198,13 +704,18 @@ class MusicLibrary:
                     import shutil
                     shutil.copy2(self._library_file + '.bak', self._library_file)
                     # Retry loading with backup
-                    self._load_library_from_csv()
+                    return self._load_library_from_csv()
                 except Exception as restore_error:
                     print(f"Error restoring from backup: {str(restore_error)}")
-                    self._library.clear()
+        return added, removed, updated
 
-    def _save_library_to_csv(self) -> None:
+    def _save_library_to_csv(self) -> bool:
         """Save current library state to CSV file with UTF-8 encoding and backup"""
+        with self._write_lock:
+            return self._write_library_csv()
+
+    def _write_library_csv(self) -> bool:
+        """Rewrite the CSV from memory and drop the play journal it now contains"""
         try:
             # Make backup before any changes
             if os.path.exists(self._library_file):
@@ -232,17 +743,219 @@ class MusicLibrary:
             # Only replace original file after successful write
             if os.path.exists(temp_file):
                 os.replace(temp_file, self._library_file)
+
+            # The CSV now holds every journaled play, so the journal can go
+            if os.path.exists(self._journal_file):
+                os.remove(self._journal_file)
+            self._journal_entries = 0
+            self._journal_since = None
+            # Our own write should not look like an external edit to the file watcher
+            self._last_modified = os.path.getmtime(self._library_file)
+            return True
                 
         except Exception as e:
             print(f"Error saving library file: {str(e)}")
-            # Restore from backup if save failed
+            # Restore from backup if save failed; memory keeps the pending changes for the next flush
             try:
                 if os.path.exists(self._library_file + '.bak'):
                     import shutil
                     shutil.copy2(self._library_file + '.bak', self._library_file)
-                    self._load_library_from_csv()  # Reload library from backup
             except Exception as restore_error:
                 print(f"Error restoring from backup: {str(restore_error)}")
+            return False
+
+    @property
+    def _snapshot_file(self) -> str:
+        """Path of the binary snapshot of the CSV used for fast startup"""
+        return self._library_file + '.snapshot'
+
+    def _load_library_from_snapshot(self) -> Optional[Set[str]]:
+        """Load the library from the snapshot if it still matches the CSV
+
+        Returns:
+            set: the loaded track_ids, or None when the CSV has to be parsed instead
+        """
+        rows = read_snapshot(self._snapshot_file, self._library_file)
+        if rows is None:
+            return None
+        self._startup_source = 'snapshot'
+        journaled_plays = self._read_play_journal()  # Plays not compacted into the CSV yet
+        added: Set[str] = set()
+        for raw_id, name, artist, rating, play_count in rows:
+            track_id, error = self._normalize_track_id(raw_id)
+            error = error or self._key_error(track_id)
+            if error:
+                print(f"Skipping snapshot row with track ID {raw_id!r}: {error}")
+                continue
+            track = Track(name=name, artist=artist, rating=rating)
+            track.set_play_count(play_count + journaled_plays.get(track_id, 0))
+            self._library[track_id] = track
+            added.add(track_id)
+        return added
+
+    def _save_snapshot(self) -> bool:
+        """Write the snapshot when memory holds exactly what the CSV holds"""
+        with self._write_lock:
+            if self._has_pending_writes():
+                return False  # Memory is ahead of the CSV, so a snapshot would not match it
+            return write_snapshot(self._snapshot_file, self._library_file, self.track_rows())
+
+    @property
+    def _audio_info_file(self) -> str:
+        """Path of the probed audio metadata kept next to the CSV"""
+        return self._library_file + '.audio'
+
+    def _load_audio_info(self) -> None:
+        """Load the saved audio metadata once per library file (call with _audio_lock held)"""
+        if self._audio_info_source == self._audio_info_file:
+            return
+        self._audio_info = {}
+        self._audio_info_source = self._audio_info_file
+        try:
+            if os.path.exists(self._audio_info_file):
+                with open(self._audio_info_file, 'r', newline='', encoding='utf-8') as file:
+                    for row in csv.DictReader(file):
+                        self._audio_info[row['track_id']] = AudioInfo(
+                            float(row['duration']), int(row['sample_rate']), int(row['bitrate']),
+                            int(row['channels']), int(row['file_size']), int(row['mtime_ns'])
+                        )
+        except Exception as e:
+            print(f"Error loading audio metadata: {e}")
+            self._audio_info = {}
+
+    def _save_audio_info(self) -> bool:
+        """Write the audio metadata of the current tracks if anything new was probed"""
+        with self._audio_lock:
+            if not self._audio_dirty:
+                return True
+            rows = [(key, info) for key, info in self._audio_info.items() if key in self._library]
+            self._audio_dirty = False
+        try:
+            temp_file = self._audio_info_file + '.tmp'
+            with open(temp_file, 'w', newline='', encoding='utf-8') as file:
+                writer = csv.writer(file)
+                writer.writerow(['track_id', 'duration', 'sample_rate', 'bitrate', 'channels', 'file_size', 'mtime_ns'])
+                for key, info in sorted(rows, key=lambda row: int(row[0])):
+                    writer.writerow([key, f"{info.duration:.3f}", info.sample_rate, info.bitrate,
+                                     info.channels, info.file_size, info.mtime_ns])
+            os.replace(temp_file, self._audio_info_file)
+            return True
+        except Exception as e:
+            print(f"Error saving audio metadata: {e}")
+            with self._audio_lock:
+                self._audio_dirty = True  # Try again on the next save
+            return False
+
+    def audio_path(self, track_id: str) -> Optional[str]:
+        """Path of a track's audio file in the tracks folder next to the CSV, if there is one"""
+        tracks_dir = os.path.join(os.path.dirname(os.path.abspath(self._library_file)), 'tracks')
+        for ext in ('.mp3', '.wav'):
+            path = os.path.join(tracks_dir, f'track_{track_id}{ext}')
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get_audio_info(self, track_id: str, path: Optional[str] = None,
+                       fallback: Optional[Callable[[str], float]] = None) -> Optional[AudioInfo]:
+        """
+        Duration, sample rate, bitrate and size of a track's audio file
+
+        The file is probed from its headers the first time and again only when its size or
+        modification time changes; otherwise this costs one stat call. fallback(path) is
+        asked for the duration of files whose headers cannot be read.
+        """
+        path = path or self.audio_path(track_id)
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        with self._audio_lock:
+            self._load_audio_info()
+            info = self._audio_info.get(track_id)
+            if info is not None and info.matches(stat):
+                return info
+        info = probe_audio(path)
+        if info is None and fallback is not None:
+            try:
+                info = AudioInfo(fallback(path), file_size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            except Exception as e:
+                print(f"Error timing audio file {path}: {e}")
+        if info is not None:
+            with self._audio_lock:
+                self._audio_info[track_id] = info
+                self._audio_dirty = True
+        return info
+
+    def scan_audio_info(self) -> int:
+        """Probe every track whose audio metadata is missing or stale; returns how many were probed"""
+        probed = 0
+        for track_id in list(self._library.keys()):
+            if self._closed:
+                break
+            path = self.audio_path(track_id)
+            if not path:
+                continue
+            with self._audio_lock:
+                self._load_audio_info()
+                info = self._audio_info.get(track_id)
+            try:
+                if info is not None and info.matches(os.stat(path)):
+                    continue
+            except OSError:
+                continue
+            if self.get_audio_info(track_id, path) is not None:
+                probed += 1
+        if probed:
+            self._save_audio_info()
+        return probed
+
+    def start_audio_scan(self) -> None:
+        """Probe missing audio metadata in a background thread"""
+        if self._audio_scan_thread is None or not self._audio_scan_thread.is_alive():
+            self._audio_scan_thread = Thread(target=self.scan_audio_info, daemon=True, name="audio-scan")
+            self._audio_scan_thread.start()
+
+    @property
+    def _journal_file(self) -> str:
+        """Path of the append-only play event journal kept next to the CSV"""
+        return self._library_file + '.journal'
+
+    def _append_play_event(self, key: str) -> bool:
+        """Append a single play event to the journal"""
+        try:
+            with open(self._journal_file, 'a', encoding='utf-8') as file:
+                file.write(f"{key}\n")
+                file.flush()
+                os.fsync(file.fileno())  # Make the play survive a crash
+            self._journal_entries += 1
+            if self._journal_since is None:
+                self._journal_since = time.time()
+            return True
+        except Exception as e:
+            print(f"Error writing play journal: {str(e)}")
+            return False
+
+    def _read_play_journal(self) -> Dict[str, int]:
+        """Count the play events per track that were not compacted yet"""
+        plays: Dict[str, int] = {}
+        self._journal_entries = 0
+        self._journal_since = None
+        if not os.path.exists(self._journal_file):
+            return plays
+        try:
+            with open(self._journal_file, 'r', encoding='utf-8') as file:
+                for line in file:
+                    key = line.strip()
+                    if key:  # Unknown ids (removed tracks, a torn last line) are ignored on load
+                        plays[key] = plays.get(key, 0) + 1
+                        self._journal_entries += 1
+            if self._journal_entries:
+                self._journal_since = time.time()
+        except Exception as e:
+            print(f"Error reading play journal: {str(e)}")
+        return plays
 
     def _create_default_csv(self) -> None:
         """Create a new CSV file with UTF-8 encoding"""
@@ -258,82 +971,372 @@ class MusicLibrary:
         if not os.path.exists(self._library_file):  # Check if the library file exists
             self._create_default_csv()  # Create a default CSV file if it doesn't exist
         
-        self._load_library_from_csv()  # Load the library from the CSV file
+        added = self._load_library_from_snapshot()  # Skip CSV parsing when the snapshot is still valid
+        if added is None:
+            added, _, _ = self._load_library_from_csv()  # Load the library and recover plays recorded after the last compaction
         self._last_modified = os.path.getmtime(self._library_file)  # Update the last modified time
-        self.notify_observers()  # Notify observers about the initial load
+        if self._journal_entries:
+            self._schedule_flush()  # Fold recovered plays into the CSV in the background
+        self.notify_observers(LibraryChangeEvent(added=added))  # Notify observers about the initial load
 
     def set_rating(self, key: str, rating: int) -> None:
         """Set the rating for a specific track"""
+        key = self._lookup_key(key)
         track = self._library.get(key)  # Get the track by key
         if track:  # Check if the track exists
-            track.rating = rating  # Set the new rating
-            self._save_library_to_csv()  # Save changes to the CSV
-            self.notify_observers()  # Notify observers about the change
+            with self._write_lock:
+                track.rating = rating  # Set the new rating
+                self._mark_dirty(key)  # The background flusher saves the change
+            self.notify_observers(LibraryChangeEvent(updated={key: {'rating'}}))  # Notify observers about the change
 
     def increment_play_count(self, key: str) -> None:
         """Increment the play count for a specific track"""
+        key = self._lookup_key(key)
         track = self._library.get(key)  # Get the track by key
         if track:  # Check if the track exists
-            track.increment_play_count()  # Increment the play count
-            self._save_library_to_csv()  # Save changes to the CSV
-            self.notify_observers()  # Notify observers about the change
+            self._record_play(key, track)  # Count the play and persist it
+            self.notify_observers(LibraryChangeEvent(updated={key: {'play_count'}}))  # Notify observers about the change
 
     def list_all(self) -> str:
         """List all tracks in the library"""
         return "\n".join(item.info() for item in self._library.values())  # Return a string of all track info
 
+    def get_track(self, key: str) -> Optional[Track]:
+        """Get a track by its key"""
+        key = self._lookup_key(key)
+        return self._library.get(key)  # Return the track or None if not found
+
     def get_name(self, key: str) -> Optional[str]:
         """Get the name of a track by its key"""
+        key = self._lookup_key(key)
         track = self._library.get(key)  # Get the track by key
         return track.name if track else None  # Return the track name or None if not found
 
     def get_artist(self, key: str) -> Optional[str]:
         """Get the artist of a track by its key"""
+        key = self._lookup_key(key)
         track = self._library.get(key)  # Get the track by key
         return track.artist if track else None  # Return the artist name or None if not found
 
     def get_rating(self, key: str) -> int:
         """Get the rating of a track by its key"""
+        key = self._lookup_key(key)
         track = self._library.get(key)  # Get the track by key
         return track.rating if track else -1  # Return the rating or -1 if not found
 
     def get_play_count(self, key: str) -> int:
         """Get the play count of a track by its key"""
+        key = self._lookup_key(key)
         track = self._library.get(key)  # Get the track by key
         return track.play_count if track else -1  # Return the play count or -1 if not found
 
+    _SEARCH_FIELDS = {"Track Name": ('name',), "Artist": ('artist',), "Both": ('name', 'artist')}
+
+    @property
+    def version(self) -> int:
+        """Increases by one with every change observers are notified about"""
+        return self._result_cache.version
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit and miss counters of the search and filter result cache"""
+        return self._result_cache.stats()
+
+    def _cached(self, key: tuple, fields: Iterable[str], compute) -> list:
+        """Get a copy of a cached result that depends on fields (and on which tracks exist)"""
+        if self._cache_source is not self._library:
+            self._cache_source = self._library  # The tracks were replaced wholesale
+            self._result_cache.clear()
+        return list(self._result_cache.get(key, ('membership', *fields), compute))
+
+    def _index(self, index: LibraryIndex) -> LibraryIndex:
+        """Get an index, building it first if it does not follow the current tracks"""
+        index.ensure(self._library)
+        return index
+
+    def search_track_ids(self, query: str, search_type: str) -> List[str]:
+        """Get the ids of tracks whose name and/or artist contain the query, ignoring case, in id order"""
+        return self._cached(('search', query, search_type), self._SEARCH_FIELDS.get(search_type, ()),
+                            lambda: self._search_track_ids(query, search_type))
+
+    def _search_track_ids(self, query: str, search_type: str) -> List[str]:
+        matches: Set[str] = set()
+        for field in self._SEARCH_FIELDS.get(search_type, ()):
+            matches |= self._index(self._token_indexes[field]).search(query)
+        return sorted((key for key in matches if key in self._library), key=lambda x: int(x))
+
+    def fuzzy_search(self, query: str, search_type: str = "Both", limit: int = 20) -> List[Tuple[str, float]]:
+        """
+        Get up to limit (track_id, score) pairs that resemble the query, best first
+
+        Accents and diacritics are ignored ("qua tung" finds "QUA TỪNG") and small typos
+        still match. The score (0-1) is the share of the query's trigrams found in the track.
+        """
+        return self._cached(('fuzzy', query, search_type, limit), self._SEARCH_FIELDS.get(search_type, ()),
+                            lambda: self._fuzzy_search(query, search_type, limit))
+
+    def _fuzzy_search(self, query: str, search_type: str, limit: int) -> List[Tuple[str, float]]:
+        scores: Dict[str, float] = {}
+        for field in self._SEARCH_FIELDS.get(search_type, ()):
+            for key, score in self._index(self._trigram_indexes[field]).search(query, limit):
+                if key in self._library and score > scores.get(key, 0.0):
+                    scores[key] = score  # "Both" keeps the better of the name and artist scores
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], int(item[0])))
+        return ranked[:limit]
+
+    def prefix_search(self, query: str, search_type: str = "Both", within: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Get the ids of tracks where every word of the query starts a word of the name and/or artist
+
+        Accents are ignored. Pass the previous results as within when the query only grew,
+        to narrow them instead of searching the whole library again.
+        """
+        if within is None:
+            return self._cached(('prefix', query, search_type), self._SEARCH_FIELDS.get(search_type, ()),
+                                lambda: self._prefix_search(query, search_type, None))
+        return self._prefix_search(query, search_type, within)
+
+    def _prefix_search(self, query: str, search_type: str, within: Optional[Iterable[str]]) -> List[str]:
+        indexes = [self._index(self._prefix_indexes[field]) for field in self._SEARCH_FIELDS.get(search_type, ())]
+        matches = prefix_matches(indexes, query, within)
+        return sorted((key for key in matches if key in self._library), key=lambda x: int(x))
+
     def search_tracks(self, query: str, search_type: str) -> List[Track]:
         """Search for tracks based on a query and search type"""
-        query = query.lower()  # Convert query to lowercase for case-insensitive search
-        results = []  # Initialize a list to hold search results
-        
-        for track in self._library.values():  # Iterate through all tracks in the library
-            if search_type == "Track Name" and query in track.name.lower():
-                results.append(track)  # Add track if name matches the query
-            elif search_type == "Artist" and query in track.artist.lower():
-                results.append(track)  # Add track if artist matches the query
-            elif search_type == "Both" and (
-                query in track.name.lower() or 
-                query in track.artist.lower()
-            ):
-                results.append(track)  # Add track if either name or artist matches the query
-        
-        return results  # Return the list of matching tracks
+        return [self._library[key] for key in self.search_track_ids(query, search_type)]
+
+    def sorted_page(self, field: str, descending: bool = True, offset: int = 0,
+                    limit: Optional[int] = None) -> List[Tuple[str, Track]]:
+        """Get a page of (track_id, track) pairs ordered by 'play_count' or 'rating', ties in id order"""
+        if field not in self._sorted_indexes:
+            raise ValueError(f"Cannot sort by {field}")
+        return self._cached(('sorted', field, descending, offset, limit), (field,),
+                            lambda: self._sorted_page(field, descending, offset, limit))
+
+    def _sorted_page(self, field: str, descending: bool, offset: int, limit: Optional[int]) -> List[Tuple[str, Track]]:
+        """One page of the sort order; storage backends with their own index override this"""
+        keys = self._index(self._sorted_indexes[field]).page(descending, offset, limit)
+        return [(key, self._library[key]) for key in keys if key in self._library]
+
+    def _sorted_keys(self, field: str, descending: bool, position: Optional[Tuple[int, int]]) -> Iterator[str]:
+        """Track ids in sort order after the (value, numeric id) position; overridden along with _sorted_page"""
+        entries = self._index(self._sorted_indexes[field]).iter_entries(descending, position)
+        return (key for _, _, key in entries)
+
+    def query(self, text: str) -> List[Tuple[str, Track]]:
+        """
+        Run a query such as 'artist:adele rating>=4 plays<10 sort:-plays limit:20'
+
+        Text terms and rating/plays bounds are answered by the library's indexes and
+        intersected; the remaining conditions (!=, id ranges) are checked on the
+        narrowed rows, or on one pass over the track columns when nothing narrowed them.
+        See library_query.compile_query for the syntax. Raises QuerySyntaxError.
+        """
+        compiled = compile_query(text)
+        return self._cached(('query', compiled.source), sorted(compiled.fields), lambda: self._run_query(compiled))
+
+    def _run_query(self, compiled: CompiledQuery) -> List[Tuple[str, Track]]:
+        conditions = compiled.text_terms or compiled.ranges or compiled.excluded
+        if not conditions and compiled.sort_field in self._sorted_indexes:
+            # Ordered page of the whole library: read it straight from the sort index
+            return self.sorted_page(compiled.sort_field, compiled.descending, compiled.offset, compiled.limit)
+
+        candidates: Optional[Set[str]] = None
+        for fields, value in compiled.text_terms:
+            matches: Set[str] = set()
+            for field in fields:
+                matches |= self._index(self._token_indexes[field]).search(value)
+            candidates = matches if candidates is None else candidates & matches
+        for field, low, high in compiled.ranges:
+            if field in self._sorted_indexes:
+                matches = self._index(self._sorted_indexes[field]).range(low, high)
+                candidates = matches if candidates is None else candidates & matches
+
+        if candidates is None:
+            rows = self.track_rows(sort_by_id=False)  # Column scan
+        else:
+            rows = [
+                (key, track.name, track.artist, track.rating, track.play_count)
+                for key, track in ((key, self._library.get(key)) for key in candidates) if track is not None
+            ]
+        predicate = compiled.predicate()
+        rows = [row for row in rows if predicate(row)]  # Re-check everything the indexes could not answer
+
+        rows.sort(key=lambda row: int(row[0]))  # Id order, also the tie-break for the sort field
+        if compiled.sort_field and compiled.sort_field != 'track_id':
+            position = ('track_id', 'name', 'artist', 'rating', 'play_count').index(compiled.sort_field)
+            if position in (1, 2):
+                rows.sort(key=lambda row: row[position].lower(), reverse=compiled.descending)
+            else:
+                rows.sort(key=lambda row: row[position], reverse=compiled.descending)
+        elif compiled.descending:
+            rows.reverse()
+        end = None if compiled.limit is None else compiled.offset + compiled.limit
+        return [(row[0], self._library[row[0]]) for row in rows[compiled.offset:end] if row[0] in self._library]
+
+    def _stream(self, keys: Iterable[str], offset: int, limit: Optional[int]) -> Iterator[Tuple[str, Track]]:
+        """Yield (track_id, track) for keys still in the library, skipping offset and stopping after limit"""
+        if limit is not None and limit <= 0:
+            return
+        for key in keys:
+            track = self._library.get(key)
+            if track is None:
+                continue  # Removed since the keys were read
+            if offset:
+                offset -= 1
+                continue
+            yield key, track
+            if limit is not None:
+                limit -= 1
+                if not limit:
+                    return
+
+    def iter_tracks(self, offset: int = 0, limit: Optional[int] = None,
+                    after: Optional[str] = None) -> Iterator[Tuple[str, Track]]:
+        """
+        Yield (track_id, track) pairs in id order without building the whole listing
+
+        after is a cursor from cursor_for(): iteration resumes with the track that follows
+        it, even if tracks were added or removed in between. offset skips further tracks.
+        """
+        keys = self._index(self._id_index).iter_keys(None if after is None else int(after))
+        return self._stream(keys, offset, limit)
+
+    def iter_search(self, query: str, search_type: str, offset: int = 0, limit: Optional[int] = None,
+                    after: Optional[str] = None) -> Iterator[Tuple[str, Track]]:
+        """Yield (track_id, track) pairs matching search_track_ids(query, search_type), resuming after a cursor"""
+        keys = self.search_track_ids(query, search_type)
+        start = 0 if after is None else bisect.bisect_right(keys, int(after), key=int)
+        return self._stream(islice(keys, start, None), offset, limit)
+
+    def iter_sorted(self, field: str, descending: bool = True, offset: int = 0, limit: Optional[int] = None,
+                    after: Optional[str] = None) -> Iterator[Tuple[str, Track]]:
+        """Yield (track_id, track) pairs ordered by 'play_count' or 'rating', resuming after a cursor"""
+        if field not in self._sorted_indexes:
+            raise ValueError(f"Cannot sort by {field}")
+        position = None
+        if after is not None:
+            value, track_id = after.split(':', 1)
+            position = (int(value), int(track_id))
+        return self._stream(self._sorted_keys(field, descending, position), offset, limit)
+
+    def cursor_for(self, track_id: str, field: Optional[str] = None) -> Optional[str]:
+        """
+        Cursor token for resuming an iteration after track_id
+
+        Pass the sort field for iter_sorted cursors; id ordered iterations need none.
+        """
+        if field is None:
+            return track_id
+        track = self._library.get(track_id)
+        if track is None:
+            return None
+        return f"{getattr(track, field)}:{track_id}"
+
+    def top_k(self, field: str, k: int) -> List[Tuple[str, Track]]:
+        """Get the k tracks with the highest 'play_count' or 'rating' without sorting the library"""
+        return self.sorted_page(field, descending=True, limit=k)
+
+    def bottom_k(self, field: str, k: int) -> List[Tuple[str, Track]]:
+        """Get the k tracks with the lowest 'play_count' or 'rating' without sorting the library"""
+        return self.sorted_page(field, descending=False, limit=k)
+
+    def sorted_by(self, field: str, descending: bool = True, limit: Optional[int] = None) -> List[Tuple[str, Track]]:
+        """Get (track_id, track) pairs ordered by 'play_count' or 'rating'"""
+        return self.sorted_page(field, descending, 0, limit)
 
     @property
-    def library(self) -> Dict[str, Track]:
-        """Get a copy of the current library"""
-        return self._library.copy()  # Return a copy of the library dictionary
+    def library(self) -> Mapping[str, Track]:
+        """Get a read-only view of the current library without copying it"""
+        return MappingProxyType(self._library)  # Reflects later changes; use dict(...) for a snapshot
+
+    def track_rows(self, sort_by_id: bool = True) -> List[Tuple[str, str, str, int, int]]:
+        """Get (track_id, name, artist, rating, play_count) rows for every track in one pass"""
+        if isinstance(self._library, CompactTrackStore):
+            rows = self._library.rows()  # Read the columns directly instead of going through proxies
+        else:
+            rows = [
+                (key, track.name, track.artist, track.rating, track.play_count)
+                for key, track in list(self._library.items())  # Snapshot the items in case another thread reloads
+            ]
+        if sort_by_id:
+            rows.sort(key=lambda row: int(row[0]))  # Sort by numeric track ID
+        return rows
+
+    def find_duplicates(self, name: str, artist: str) -> List[str]:
+        """
+        Ids of tracks that are likely the same song as name by artist, in id order
+
+        Titles and artists are normalized first (decorations such as "(Lyrics)" dropped, case,
+        accents and featured artists folded), so a YouTube result can be checked before it is
+        downloaded. Each check is a few hash lookups.
+        """
+        matches = self._index(self._duplicate_index).find(name, artist)
+        return sorted((key for key in matches if key in self._library), key=lambda x: int(x))
 
     def get_unique_artists(self) -> Set[str]:
-        """Get list of unique artists in library"""
-        return {track.artist for track in self._library.values()}  # Return a set of unique artist names
+        """Get the individual artists in the library; featured artists count separately"""
+        return set(self._index(self._artist_index).artists())
+
+    def artist_names(self) -> List[str]:
+        """Get every individual artist, alphabetically"""
+        return self._index(self._artist_index).artists()
+
+    def tracks_by_artist(self, artist: str) -> List[str]:
+        """Get the ids of tracks crediting the artist, as main or featured artist, in id order"""
+        keys = self._index(self._artist_index).track_ids(artist)
+        return sorted((key for key in keys if key in self._library), key=lambda x: int(x))
+
+    def artist_stats(self, artist: str) -> Optional[Tuple[str, int, int, float]]:
+        """Get (name, track count, total plays, average rating) for an artist, or None if unknown"""
+        return self._index(self._artist_index).stats(artist)
 
     def __del__(self):
-        """Clean up the file observer when the library is destroyed"""
-        if hasattr(self, 'observer'):
-            self.observer.stop()  # Stop the observer if it exists
-            self.observer.join()  # Wait for the observer thread to finish
+        """Write pending changes and clean up the file observer when the library is destroyed"""
+        if hasattr(self, '_write_lock') and not self._closed:
+            self.close()
+
+@atexit.register
+def _flush_open_libraries() -> None:
+    """Make sure no pending library writes are lost when the interpreter exits"""
+    for open_library in list(_open_libraries):
+        try:
+            open_library.close()
+        except Exception as e:
+            print(f"Error flushing library on exit: {e}")
+
+def create_library(watch: bool = False) -> MusicLibrary:
+    """Create the library with the storage backend and in-memory layout chosen in .env"""
+    from dotenv import load_dotenv
+    load_dotenv()
+    backend = os.getenv('LIBRARY_BACKEND', 'csv').strip().lower()
+    compact = os.getenv('LIBRARY_STORE', 'dict').strip().lower() == 'compact'
+    if backend == 'sqlite':
+        from sqlite_library import SQLiteMusicLibrary  # Imported here to avoid a circular import
+        return SQLiteMusicLibrary(compact=compact, watch=watch)
+    return MusicLibrary(compact=compact, watch=watch)
+
+# The shared library is created on first use, not when this module is imported
+_shared_library: Optional[MusicLibrary] = None
+_shared_library_lock = Lock()
+
+def get_library() -> MusicLibrary:
+    """Get the shared library, creating it on first use"""
+    global _shared_library
+    if _shared_library is None:
+        with _shared_library_lock:
+            if _shared_library is None:  # Another thread may have created it while we waited
+                _shared_library = create_library()
+    return _shared_library
+
+def __getattr__(name: str):
+    """Create the shared library lazily for code that imports track_library.library"""
+    if name == 'library':
+        return get_library()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Create a single instance of the library
-library = MusicLibrary()  # Instantiate the MusicLibrary class to create a library object
\ No newline at end of file
+if __name__ == "__main__":
+    started = time.perf_counter()
+    shared = get_library()
+    print(f"Library created in {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(shared.startup_report())
+    shared.close()
\ No newline at end of file
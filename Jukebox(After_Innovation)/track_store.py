@@ -0,0 +1,187 @@
+import sys  # Import sys for interning repeated name and artist strings
+from array import array  # Import array for compact numeric columns
+from collections.abc import MutableMapping  # Import MutableMapping so the store can stand in for the library dict
+from typing import Dict, Iterator, List, Optional, Tuple  # Import necessary types for type hinting
+from library_item import Track  # Import the Track class the proxies stand in for
+
+class StoredTrack(Track):
+    """Lightweight Track proxy that reads and writes a row of a CompactTrackStore"""
+    __slots__ = ('_store', '_track_id')
+
+    def __init__(self, store: 'CompactTrackStore', track_id: int):
+        self._store = store  # The store holding this track's columns
+        self._track_id = track_id  # Look the row up by id so proxies survive other rows moving
+
+    @property
+    def name(self) -> str:
+        return self._store._names[self._store._rows[self._track_id]]  # Return the name from the names column
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._store._names[self._store._rows[self._track_id]] = sys.intern(value)  # Store the interned name
+
+    @property
+    def artist(self) -> str:
+        return self._store._artists[self._store._rows[self._track_id]]  # Return the artist from the artists column
+
+    @artist.setter
+    def artist(self, value: str) -> None:
+        self._store._artists[self._store._rows[self._track_id]] = sys.intern(value)  # Store the interned artist
+
+    @property
+    def rating(self) -> int:
+        return self._store._ratings[self._store._rows[self._track_id]]  # Return the rating from the ratings column
+
+    @rating.setter
+    def rating(self, value: int) -> None:
+        if 0 <= value <= 5:  # Ensure the rating is between 0 and 5
+            self._store._ratings[self._store._rows[self._track_id]] = value  # Set the rating
+
+    @property
+    def play_count(self) -> int:
+        return self._store._play_counts[self._store._rows[self._track_id]]  # Return the play count column value
+
+    def increment_play_count(self) -> None:
+        self._store._play_counts[self._store._rows[self._track_id]] += 1  # Increment the play count by 1
+
+    def set_play_count(self, count: int) -> None:
+        if count >= 0:  # Ensure the play count is not negative
+            self._store._play_counts[self._store._rows[self._track_id]] = count  # Set the play count directly
+
+    def set_file_path(self, path: str) -> None:
+        self._store._file_paths[self._track_id] = path  # File paths are rare, so they live in a side table
+
+    def get_file_path(self) -> Optional[str]:
+        return self._store._file_paths.get(self._track_id)  # Return the file path or None
+
+    def __eq__(self, other) -> bool:
+        # Two proxies for the same row are the same track
+        if isinstance(other, StoredTrack):
+            return self._store is other._store and self._track_id == other._track_id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._track_id))
+
+class CompactTrackStore(MutableMapping):
+    """Track table stored as parallel columns instead of one Python object per track
+
+    Keys are the library's zero-padded string ids ("01", "142"), stored as ints.
+    Ratings are kept in a uint8 array, play counts in a uint32 array, and names
+    and artists are interned so repeated artists share one string. Reading a key
+    returns a StoredTrack proxy, so code that mutates tracks in place keeps working.
+    """
+    def __init__(self):
+        self._rows: Dict[int, int] = {}  # Track id -> row index into the columns
+        self._ids = array('I')  # Track id of each row, used when moving the last row into a gap
+        self._names: List[str] = []
+        self._artists: List[str] = []
+        self._ratings = array('B')  # One byte per rating (0-5)
+        self._play_counts = array('I')  # Four bytes per play count
+        self._file_paths: Dict[int, str] = {}  # Only the few tracks with a file path set
+
+    @staticmethod
+    def _to_id(key: str) -> int:
+        """Convert a zero-padded string key to its integer id"""
+        try:
+            track_id = int(key)
+        except (TypeError, ValueError):
+            raise KeyError(key)
+        if track_id < 0 or str(track_id).zfill(2) != key:
+            raise KeyError(key)  # Only keys that round-trip through the int id are storable
+        return track_id
+
+    @classmethod
+    def valid_key(cls, key: str) -> bool:
+        """Whether key is one this store can hold (a zero-padded, non-negative number)"""
+        try:
+            return cls._to_id(key) <= 0xFFFFFFFF  # Ids are kept in an array('I')
+        except KeyError:
+            return False
+
+    @staticmethod
+    def _to_key(track_id: int) -> str:
+        return str(track_id).zfill(2)  # Same padding add_track and the CSV loader use
+
+    def __getitem__(self, key: str) -> StoredTrack:
+        track_id = self._to_id(key)
+        if track_id not in self._rows:
+            raise KeyError(key)
+        return StoredTrack(self, track_id)
+
+    def __setitem__(self, key: str, track: Track) -> None:
+        track_id = self._to_id(key)
+        name = sys.intern(track.name)
+        artist = sys.intern(track.artist)
+        rating = track.rating
+        play_count = track.play_count
+        file_path = track.get_file_path()
+        row = self._rows.get(track_id)
+        if row is None:
+            # Append a new row to every column
+            self._rows[track_id] = len(self._ids)
+            self._ids.append(track_id)
+            self._names.append(name)
+            self._artists.append(artist)
+            self._ratings.append(rating)
+            self._play_counts.append(play_count)
+        else:
+            self._names[row] = name
+            self._artists[row] = artist
+            self._ratings[row] = rating
+            self._play_counts[row] = play_count
+        if file_path is not None:
+            self._file_paths[track_id] = file_path
+        else:
+            self._file_paths.pop(track_id, None)
+
+    def __delitem__(self, key: str) -> None:
+        track_id = self._to_id(key)
+        row = self._rows.pop(track_id)  # Raises KeyError for unknown tracks
+        last = len(self._ids) - 1
+        if row != last:
+            # Move the last row into the gap so the columns stay dense
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._names[row] = self._names[last]
+            self._artists[row] = self._artists[last]
+            self._ratings[row] = self._ratings[last]
+            self._play_counts[row] = self._play_counts[last]
+            self._rows[moved_id] = row
+        self._ids.pop()
+        self._names.pop()
+        self._artists.pop()
+        self._ratings.pop()
+        self._play_counts.pop()
+        self._file_paths.pop(track_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._to_key(track_id) for track_id in list(self._rows))  # Snapshot ids so deletes don't break iteration
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key) -> bool:
+        try:
+            return self._to_id(key) in self._rows
+        except KeyError:
+            return False
+
+    def clear(self) -> None:
+        """Remove every track at once instead of one row at a time"""
+        self._rows.clear()
+        self._ids = array('I')
+        self._names = []
+        self._artists = []
+        self._ratings = array('B')
+        self._play_counts = array('I')
+        self._file_paths.clear()
+
+    def rows(self) -> List[Tuple[str, str, str, int, int]]:
+        """Get (track_id, name, artist, rating, play_count) rows straight from the columns"""
+        return [
+            (self._to_key(track_id), name, artist, rating, play_count)
+            for track_id, name, artist, rating, play_count in zip(
+                self._ids, self._names, self._artists, self._ratings, self._play_counts
+            )
+        ]